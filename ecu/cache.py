@@ -0,0 +1,186 @@
+"""Deterministic result cache for :func:`ecu.ecu_optimizer.optimize`.
+
+Identical request inputs + seed yield identical proposal fields
+(docs/ECU_CONTRACT.md §6), so optimizer results can be reused verbatim.
+Keys are a SHA-256 of the canonical JSON of the baseline curve, constraints,
+cycle_budget, seed, parts and optional ``cycle_limit`` — ``request_id`` is
+excluded.  ``CACHE_VERSION`` is hashed in as well, so a persistent
+``ECU_CACHE_DIR`` never serves results of an older optimizer.
+
+An in-memory LRU is always available; an on-disk store (one JSON file per
+key, least-recently-used files evicted past ``max_disk_bytes``) is optional.
+The directory is scanned on a process's first write and afterwards only when
+its running total (last scan plus its own writes) crosses the limit, so a
+write costs O(1); other processes' writes show up at the next scan.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PROPOSAL_INPUT_FIELDS = (
+    "baseline_curve",
+    "constraints",
+    "cycle_budget",
+    "seed",
+    "parts",
+    "cycle_limit",
+)
+
+# Bump whenever :func:`ecu.ecu_optimizer.optimize` can return a different
+# result for the same inputs, or the cached value's format changes.
+CACHE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024
+
+# A scan over ``max_disk_bytes`` evicts down to this fraction of it, so the
+# next scan is many writes away.
+DISK_LOW_WATER = 0.9
+
+
+def proposal_key(req: dict[str, Any]) -> str:
+    """Return the SHA-256 hex key for the proposal-determining fields."""
+    inputs = {field: req.get(field) for field in PROPOSAL_INPUT_FIELDS}
+    canonical = json.dumps(
+        {"cache_version": CACHE_VERSION, "inputs": inputs},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """LRU cache of optimizer results with an optional on-disk layer.
+
+    Values are copied on the way in and out.  ``max_entries=0`` disables
+    the in-memory layer.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk_dir: str | None = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # Bytes in ``disk_dir`` at the last scan plus our writes since.
+        self._disk_bytes: int | None = None
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return a copy of the cached value, or ``None`` on a miss."""
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+        elif self.disk_dir:
+            value = self._disk_get(key)
+            if value is not None:
+                self._memory_put(key, value)
+
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        value = copy.deepcopy(value)
+        self._memory_put(key, value)
+        if self.disk_dir:
+            self._disk_put(key, value)
+
+    def clear(self) -> None:
+        """Drop in-memory entries and reset counters (disk store is kept)."""
+        self._memory.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _memory_put(self, key: str, value: dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_get(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                value = json.load(fh)
+            os.utime(path)  # refresh recency for eviction
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, exc)
+            return None
+        return value
+
+    def _disk_put(self, key: str, value: dict[str, Any]) -> None:
+        path = self._path(key)
+        data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        try:
+            try:
+                replaced = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(data) - replaced
+            if self._disk_bytes is None or self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+        except OSError as exc:
+            logger.warning("Could not write cache entry %s: %s", key, exc)
+
+    def _evict_disk(self) -> None:
+        """Rescan the store; evict LRU files down to ``DISK_LOW_WATER`` if over."""
+        entries = []
+        total = 0
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        self._disk_bytes = total
+        if total <= self.max_disk_bytes:
+            return
+        target = int(self.max_disk_bytes * DISK_LOW_WATER)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._disk_bytes = total
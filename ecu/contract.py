@@ -6,7 +6,11 @@ Validates request and response JSON structures per docs/ECU_CONTRACT.md.
 from __future__ import annotations
 
 import math
-from typing import Any
+
+# Annotation-only import: contract is loaded on every cold start, typing is not.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
 
 CONTRACT_VERSION = "1.0"
 
@@ -28,6 +32,7 @@ _REQUIRED_REQUEST_KEYS = {
 
 _ASPIRATION_VALUES = {"NA", "Turbo", "Supercharged"}
 _DRIVETRAIN_VALUES = {"FWD", "RWD", "AWD"}
+_DEADLINE_MODES = ("wallclock", "checkpoint")
 
 
 def validate_request(req: dict[str, Any]) -> list[str]:
@@ -51,6 +56,28 @@ def validate_request(req: dict[str, Any]) -> list[str]:
     if not isinstance(req["cycle_budget"], int) or req["cycle_budget"] < 1:
         errors.append("cycle_budget must be a positive integer")
 
+    # Optional anytime controls
+    deadline_ms = req.get("deadline_ms")
+    if deadline_ms is not None and (
+        isinstance(deadline_ms, bool)
+        or not isinstance(deadline_ms, (int, float))
+        or not math.isfinite(deadline_ms)
+        or deadline_ms <= 0
+    ):
+        errors.append("deadline_ms must be a positive number")
+    if req.get("deadline_mode", "wallclock") not in _DEADLINE_MODES:
+        errors.append(
+            f"Invalid deadline_mode: {req.get('deadline_mode')} "
+            f"(expected one of {_DEADLINE_MODES})"
+        )
+    cycle_limit = req.get("cycle_limit")
+    if cycle_limit is not None and (
+        isinstance(cycle_limit, bool)
+        or not isinstance(cycle_limit, int)
+        or cycle_limit < 1
+    ):
+        errors.append("cycle_limit must be a positive integer")
+
     # Vehicle
     v = req.get("vehicle", {})
     if v.get("aspiration") not in _ASPIRATION_VALUES:
@@ -72,6 +99,15 @@ def validate_request(req: dict[str, Any]) -> list[str]:
         errors.append("baseline_curve.rpm_bins is empty")
     if len(rpm_bins) != len(torque_nm):
         errors.append("baseline_curve array length mismatch")
+    for val in rpm_bins:
+        # Integral floats (1500.0) are accepted, as before RPM was stored as int.
+        if (
+            isinstance(val, bool)
+            or not isinstance(val, (int, float))
+            or not float(val).is_integer()
+        ):
+            errors.append(f"Non-integer rpm value: {val}")
+            break
     for val in torque_nm:
         if not isinstance(val, (int, float)) or not math.isfinite(val):
             errors.append(f"Non-finite torque value: {val}")
@@ -106,8 +142,13 @@ def build_ok_response(
     best_score: float,
     notes: list[str] | None = None,
     warnings: list[str] | None = None,
+    extra_metrics: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
-    """Build a well-formed "ok" response dict."""
+    """Build a well-formed "ok" response dict.
+
+    ``extra_metrics`` entries are merged into ``metrics`` after the
+    required fields.
+    """
     return {
         "contract_version": CONTRACT_VERSION,
         "request_id": request_id,
@@ -122,6 +163,7 @@ def build_ok_response(
             "cycles_used": cycles_used,
             "runtime_ms": runtime_ms,
             "best_score": best_score,
+            **(extra_metrics or {}),
         },
         "debug": {
             "notes": notes or [],
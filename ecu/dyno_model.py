@@ -4,11 +4,14 @@ HP = (torque_nm * RPM) / 5252
 
 All curves are represented as parallel arrays of rpm_bins (int) and
 torque_nm (float).  HP is always derived, never stored as source-of-truth.
+``DynoCurve`` packs such a pair into typed arrays and caches what is
+derived from it.
 """
 
 from __future__ import annotations
 
 import math
+from array import array
 from typing import NamedTuple
 
 
@@ -101,3 +104,220 @@ def apply_torque_deltas(
             raise ValueError(f"Non-finite result: {tq} + {d} = {val}")
         result.append(val)
     return result
+
+
+def _as_rpm(value: float) -> int:
+    """Return an integral float such as ``1500.0`` as an int.
+
+    Anything else is returned unchanged, for ``array('i')`` to accept or reject.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class DynoCurve:
+    """An immutable dyno curve backed by ``array('i')`` RPM and ``array('d')`` torque.
+
+    HP, peaks and the second difference of torque are derived on first
+    access and cached.  ``with_deltas`` shares the RPM array with the
+    original, so only the torque array is allocated.  ``rpm`` and
+    ``torque`` must be treated as read-only; ``torque_view()`` and
+    ``rpm_view()`` hand out read-only buffers without copying.
+
+    Raises ``ValueError`` on mismatched arrays, non-integer RPM or
+    non-finite torque.
+    """
+
+    __slots__ = ("_hp", "_peaks", "_second_diff", "rpm", "torque")
+
+    def __init__(self, rpm_bins: list[int], torque_nm: list[float]) -> None:
+        if len(rpm_bins) != len(torque_nm):
+            raise ValueError(
+                f"Array length mismatch: rpm_bins={len(rpm_bins)}, "
+                f"torque_nm={len(torque_nm)}"
+            )
+        try:
+            rpm = array("i", [_as_rpm(r) for r in rpm_bins])
+        except (TypeError, OverflowError) as exc:
+            raise ValueError(f"Invalid rpm_bins: {exc}") from exc
+        torque = array("d", torque_nm)
+        for tq in torque:
+            if not math.isfinite(tq):
+                raise ValueError(f"Non-finite torque value: {tq}")
+        self._init(rpm, torque)
+
+    def _init(self, rpm: array, torque: array) -> None:
+        self.rpm = rpm
+        self.torque = torque
+        self._hp: array | None = None
+        self._peaks: CurvePeaks | None = None
+        self._second_diff: array | None = None
+
+    def __len__(self) -> int:
+        return len(self.torque)
+
+    def __repr__(self) -> str:
+        return f"DynoCurve(bins={len(self)})"
+
+    @property
+    def hp(self) -> array:
+        """HP per bin, as ``compute_hp_curve`` would return it."""
+        if self._hp is None:
+            self._hp = array(
+                "d",
+                [
+                    (tq * rpm) / HP_CONSTANT if rpm != 0 else 0.0
+                    for tq, rpm in zip(self.torque, self.rpm)
+                ],
+            )
+        return self._hp
+
+    @property
+    def peaks(self) -> CurvePeaks:
+        """Peak torque and peak HP, as ``find_peaks`` would return them.
+
+        Raises ``ValueError`` on an empty curve.
+        """
+        if self._peaks is None:
+            if not self.rpm:
+                raise ValueError("Empty curve")
+            tq, hp = self.torque, self.hp
+            max_tq_idx = max_hp_idx = 0
+            for i in range(len(tq)):
+                if tq[i] > tq[max_tq_idx]:
+                    max_tq_idx = i
+                if hp[i] > hp[max_hp_idx]:
+                    max_hp_idx = i
+            self._peaks = CurvePeaks(
+                peak_torque_nm=tq[max_tq_idx],
+                peak_torque_rpm=self.rpm[max_tq_idx],
+                peak_hp=hp[max_hp_idx],
+                peak_hp_rpm=self.rpm[max_hp_idx],
+            )
+        return self._peaks
+
+    @property
+    def second_difference(self) -> array:
+        """``t[i-1] - 2*t[i] + t[i+1]`` for each interior bin ``i``."""
+        if self._second_diff is None:
+            t = self.torque
+            self._second_diff = array(
+                "d", [t[i - 1] - 2 * t[i] + t[i + 1] for i in range(1, len(t) - 1)]
+            )
+        return self._second_diff
+
+    def torque_view(self) -> memoryview:
+        """Read-only, zero-copy view of the torque buffer (format ``'d'``)."""
+        return memoryview(self.torque).toreadonly()
+
+    def rpm_view(self) -> memoryview:
+        """Read-only, zero-copy view of the RPM buffer (format ``'i'``)."""
+        return memoryview(self.rpm).toreadonly()
+
+    def with_deltas(self, deltas: list[float]) -> DynoCurve:
+        """Return a curve with ``deltas`` added to torque, sharing the RPM array.
+
+        Raises ``ValueError`` on length mismatch or non-finite values.
+        """
+        if len(deltas) != len(self.torque):
+            raise ValueError(
+                f"Array length mismatch: torque_nm={len(self.torque)}, "
+                f"deltas={len(deltas)}"
+            )
+        torque = array("d", [tq + d for tq, d in zip(self.torque, deltas)])
+        for tq, d, val in zip(self.torque, deltas, torque):
+            if not math.isfinite(val):
+                raise ValueError(f"Non-finite result: {tq} + {d} = {val}")
+        curve = DynoCurve.__new__(DynoCurve)
+        curve._init(self.rpm, torque)
+        return curve
+
+
+class CurveEvaluator:
+    """Evaluate ``baseline + scale * deltas`` against a fixed baseline curve.
+
+    The baseline's HP curve and peaks come from the ``DynoCurve`` cache.  Candidate
+    evaluations run in a single pass over the bins without building the
+    proposed torque or HP arrays, and a rescaled candidate is evaluated by
+    passing ``scale`` instead of materializing the scaled deltas.  Results
+    are bit-identical to ``find_peaks(rpm_bins, apply_torque_deltas(...))``
+    on the scaled deltas.
+    """
+
+    __slots__ = ("baseline_hp", "baseline_peaks", "baseline_torque", "rpm_bins")
+
+    def __init__(self, baseline: DynoCurve) -> None:
+        self.rpm_bins = baseline.rpm
+        self.baseline_torque = baseline.torque
+        self.baseline_hp = baseline.hp
+        self.baseline_peaks = baseline.peaks
+
+    def _check_length(self, deltas: list[float]) -> None:
+        if len(deltas) != len(self.baseline_torque):
+            raise ValueError(
+                f"Array length mismatch: torque_nm={len(self.baseline_torque)}, "
+                f"deltas={len(deltas)}"
+            )
+
+    def peak_torque(self, deltas: list[float], scale: float = 1.0) -> float:
+        """Return the peak torque of the candidate curve.
+
+        Raises ``ValueError`` on length mismatch or non-finite values.
+        """
+        self._check_length(deltas)
+        peak = -math.inf
+        for tq, d in zip(self.baseline_torque, deltas):
+            val = tq + d * scale
+            if not math.isfinite(val):
+                raise ValueError(f"Non-finite result: {tq} + {d * scale} = {val}")
+            peak = max(peak, val)
+        return peak
+
+    def peaks(self, deltas: list[float], scale: float = 1.0) -> CurvePeaks:
+        """Return peak torque and peak HP of the candidate curve.
+
+        Raises ``ValueError`` on length mismatch or non-finite values.
+        """
+        self._check_length(deltas)
+        max_tq = max_hp = -math.inf
+        max_tq_rpm = max_hp_rpm = 0
+        for tq, d, rpm in zip(self.baseline_torque, deltas, self.rpm_bins):
+            val = tq + d * scale
+            if not math.isfinite(val):
+                raise ValueError(f"Non-finite result: {tq} + {d * scale} = {val}")
+            hp = (val * rpm) / HP_CONSTANT if rpm != 0 else 0.0
+            if val > max_tq:
+                max_tq, max_tq_rpm = val, rpm
+            if hp > max_hp:
+                max_hp, max_hp_rpm = hp, rpm
+        return CurvePeaks(
+            peak_torque_nm=max_tq,
+            peak_torque_rpm=max_tq_rpm,
+            peak_hp=max_hp,
+            peak_hp_rpm=max_hp_rpm,
+        )
+
+    def second_derivative_ok(
+        self,
+        deltas: list[float],
+        max_second_deriv: float,
+        scale: float = 1.0,
+    ) -> bool:
+        """Check smoothness of the candidate via approximate second derivative.
+
+        Each interior bin must satisfy
+        ``abs(t[i-1] - 2*t[i] + t[i+1]) <= max_second_deriv * t[i]``.
+        """
+        self._check_length(deltas)
+        base = self.baseline_torque
+        if len(base) < 3:
+            return True
+        prev = base[0] + deltas[0] * scale
+        cur = base[1] + deltas[1] * scale
+        for i in range(2, len(base)):
+            nxt = base[i] + deltas[i] * scale
+            if abs(prev - 2 * cur + nxt) > max_second_deriv * cur:
+                return False
+            prev, cur = cur, nxt
+        return True
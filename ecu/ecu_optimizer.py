@@ -3,6 +3,12 @@
 Searches within allowed calibration bounds to produce a small torque-curve
 improvement.  All randomness is seeded so that identical inputs + seed yield
 identical outputs.
+
+Candidates are smooth by construction: each cycle draws a sum of 1 to
+``MAX_BUMPS`` raised-cosine bumps and scales it to the largest amplitude the
+per-bin caps, the peak-gain cap and the smoothness headroom of the baseline
+allow.  Nearly every cycle therefore yields a feasible candidate instead of
+being discarded by the smoothness check.
 """
 
 from __future__ import annotations
@@ -10,26 +16,94 @@ from __future__ import annotations
 import logging
 import math
 import random
+import time
 
-from ecu.dyno_model import apply_torque_deltas, find_peaks
+from ecu.dyno_model import CurveEvaluator, DynoCurve
 
 logger = logging.getLogger(__name__)
 
+DEADLINE_MODES = ("wallclock", "checkpoint")
+
+# Checkpoint-mode deadline stops round down to a multiple of this many cycles.
+DEADLINE_CHECKPOINT_CYCLES = 32
+
+# Upper bound on raised-cosine bumps summed into one candidate.
+MAX_BUMPS = 3
+
+# Relative shrink applied to the computed amplitude so float rounding in the
+# exact checks cannot reject a candidate sitting on a constraint boundary.
+_AMPLITUDE_SHRINK = 1.0 - 1e-9
+
+# Returned deltas are rounded toward zero to this many decimals, so a delta on
+# a per-bin or peak cap stays on the allowed side of it.  Each rounded delta
+# moves by less than one step, so a second difference moves by less than two;
+# the smoothness headroom keeps that (plus the smaller right-hand side) spare.
+DELTA_DECIMALS = 4
+_DELTA_STEP = 10.0 ** -DELTA_DECIMALS
+_SMOOTHNESS_ROUNDING_SLACK = 3 * _DELTA_STEP
+
 
 def _clamp(value: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, value))
 
 
-def _second_derivative_ok(
-    torque: list[float],
+def _smoothness_headroom(
+    curve: DynoCurve,
     max_second_deriv: float,
-) -> bool:
-    """Check smoothness via approximate second derivative."""
-    for i in range(1, len(torque) - 1):
-        d2 = abs(torque[i - 1] - 2 * torque[i] + torque[i + 1])
-        if d2 > max_second_deriv * torque[i]:
-            return False
-    return True
+) -> list[float]:
+    """Per-bin slack left by the baseline in the smoothness test.
+
+    Entry ``i`` bounds ``abs(d2(delta)[i])`` for a non-negative delta; the
+    end bins carry no smoothness constraint and get ``math.inf``.  The slack
+    lost to rounding the returned deltas is held back.
+    """
+    torque = curve.torque
+    headroom = [math.inf] * len(torque)
+    for i, d2 in enumerate(curve.second_difference, start=1):
+        headroom[i] = (
+            max_second_deriv * torque[i] - abs(d2) - _SMOOTHNESS_ROUNDING_SLACK
+        )
+    return headroom
+
+
+def _round_toward_zero(value: float) -> float:
+    """Round to ``DELTA_DECIMALS`` decimals without growing ``abs(value)``."""
+    return math.trunc(value * 10**DELTA_DECIMALS) / 10**DELTA_DECIMALS
+
+
+def _raised_cosine_shape(rng: random.Random, n: int) -> list[float]:
+    """Draw a non-negative sum of raised-cosine bumps over ``n`` bins."""
+    shape = [0.0] * n
+    for _ in range(rng.randint(1, MAX_BUMPS)):
+        center = rng.uniform(0.0, n - 1)
+        half_width = rng.uniform(1.5, max(n, 2))
+        weight = rng.uniform(0.25, 1.0)
+        lo = max(0, math.ceil(center - half_width))
+        hi = min(n - 1, math.floor(center + half_width))
+        for i in range(lo, hi + 1):
+            x = (i - center) / half_width
+            if abs(x) < 1.0:
+                shape[i] += weight * 0.5 * (1.0 + math.cos(math.pi * x))
+    return shape
+
+
+def _max_amplitude(
+    shape: list[float],
+    upper: list[float],
+    smooth_headroom: list[float],
+) -> float:
+    """Largest ``a >= 0`` with ``a * shape`` inside every bin and smoothness bound."""
+    amplitude = math.inf
+    for s, u in zip(shape, upper):
+        if s > 0.0:
+            amplitude = min(amplitude, u / s)
+    for i in range(1, len(shape) - 1):
+        d2 = abs(shape[i - 1] - 2 * shape[i] + shape[i + 1])
+        if d2 > 0.0:
+            amplitude = min(amplitude, smooth_headroom[i] / d2)
+    if not math.isfinite(amplitude):
+        return 0.0
+    return max(amplitude, 0.0) * _AMPLITUDE_SHRINK
 
 
 def optimize(
@@ -39,13 +113,39 @@ def optimize(
     cycle_budget: int,
     seed: int,
     parts: list[dict] | None = None,
+    deadline_ms: float | None = None,
+    deadline_mode: str = "wallclock",
+    cycle_limit: int | None = None,
 ) -> dict:
     """Run the deterministic ECU tuning stub.
 
+    When ``deadline_ms`` elapses the search stops and returns the best
+    candidate found so far; ``cycles_used`` reports the cycles actually run
+    and a note flags the early stop.  In ``"checkpoint"`` mode the stop is
+    rounded down to a multiple of ``DEADLINE_CHECKPOINT_CYCLES`` so that
+    re-running with ``cycle_limit=cycles_used`` reproduces the result.
+
+    ``acceptance_rate`` is the fraction of cycles whose candidate passed
+    every check (0.0 when no cycle ran).
+
     Returns a dict with keys:
         torque_delta_nm, calibration, confidence,
-        estimated_peak_gain_ratio, cycles_used, best_score, notes, warnings
+        estimated_peak_gain_ratio, cycles_used, acceptance_rate, best_score,
+        notes, warnings
     """
+    if deadline_mode not in DEADLINE_MODES:
+        raise ValueError(
+            f"deadline_mode must be one of {DEADLINE_MODES}, got {deadline_mode!r}"
+        )
+    deadline = (
+        time.monotonic() + deadline_ms / 1000.0
+        if deadline_ms is not None
+        else None
+    )
+    cycles_to_run = (
+        cycle_budget if cycle_limit is None else min(cycle_budget, cycle_limit)
+    )
+
     rng = random.Random(seed)
     n = len(rpm_bins)
 
@@ -60,8 +160,17 @@ def optimize(
     ign_range = cal_ranges.get("ign_timing_deg", [-2.0, 8.0])
     boost_range = cal_ranges.get("boost_target_psi", [0.0, 22.0])
 
-    baseline_peaks = find_peaks(rpm_bins, baseline_torque)
-    baseline_peak_tq = baseline_peaks.peak_torque_nm
+    baseline = DynoCurve(rpm_bins, baseline_torque)
+    evaluator = CurveEvaluator(baseline)
+    baseline_peak_tq = evaluator.baseline_peaks.peak_torque_nm
+
+    # Upper bound per bin: tightest of the bin caps and the peak-gain cap.
+    peak_ceiling = baseline_peak_tq * (1.0 + max_peak_gain)
+    upper = [
+        min(max_bin_delta, tq * max_bin_ratio, peak_ceiling - tq)
+        for tq in baseline_torque
+    ]
+    smooth_headroom = _smoothness_headroom(baseline, max_second_deriv)
 
     best_deltas = [0.0] * n
     best_score: float = 0.0
@@ -73,45 +182,63 @@ def optimize(
 
     notes: list[str] = []
     warnings: list[str] = []
+    cycles_used = 0
+    accepted = 0
+    checkpoint = None  # set at cycle 0 whenever a deadline is active
+
+    for cycle in range(cycles_to_run):
+        if deadline is not None:
+            if cycle % DEADLINE_CHECKPOINT_CYCLES == 0:
+                checkpoint = (
+                    cycle, accepted, best_deltas, best_score, rng.getstate()
+                )
+            if time.monotonic() >= deadline:
+                if deadline_mode == "checkpoint":
+                    (
+                        cycles_used, accepted, best_deltas, best_score,
+                        rng_state,
+                    ) = checkpoint
+                    rng.setstate(rng_state)
+                    notes.append(
+                        f"Deadline reached: stopped at checkpoint cycle "
+                        f"{cycles_used} of {cycle_budget} "
+                        f"(replay with cycle_limit={cycles_used})"
+                    )
+                else:
+                    notes.append(
+                        f"Deadline reached: stopped after {cycles_used} "
+                        f"of {cycle_budget} cycles"
+                    )
+                break
+        cycles_used += 1
+
+        shape = _raised_cosine_shape(rng, n)
+        amplitude = _max_amplitude(shape, upper, smooth_headroom)
+        candidate = [amplitude * s for s in shape]
+        scale = 1.0
 
-    for cycle in range(cycle_budget):
-        candidate = [0.0] * n
-        for i in range(n):
-            per_bin_cap = min(
-                max_bin_delta,
-                baseline_torque[i] * max_bin_ratio,
-            )
-            candidate[i] = rng.uniform(-per_bin_cap * 0.1, per_bin_cap)
-
-        # Apply and check peak gain
-        proposed = apply_torque_deltas(baseline_torque, candidate)
-        proposed_peaks = find_peaks(rpm_bins, proposed)
+        # Check peak gain
         gain_ratio = (
-            (proposed_peaks.peak_torque_nm - baseline_peak_tq)
+            (evaluator.peak_torque(candidate) - baseline_peak_tq)
             / baseline_peak_tq
             if baseline_peak_tq > 0
             else 0.0
         )
 
         if gain_ratio > max_peak_gain:
-            # Scale deltas down to stay within cap
+            # Scale deltas down to stay within cap; the scaled curve is
+            # evaluated in place and only built once the candidate passes.
             if gain_ratio > 0:
                 scale = max_peak_gain / gain_ratio * 0.95
-                candidate = [d * scale for d in candidate]
-                proposed = apply_torque_deltas(baseline_torque, candidate)
-                proposed_peaks = find_peaks(rpm_bins, proposed)
-                gain_ratio = (
-                    (proposed_peaks.peak_torque_nm - baseline_peak_tq)
-                    / baseline_peak_tq
-                    if baseline_peak_tq > 0
-                    else 0.0
-                )
 
         # Smoothness check
-        if not _second_derivative_ok(proposed, max_second_deriv):
+        if not evaluator.second_derivative_ok(candidate, max_second_deriv, scale):
             continue
+        accepted += 1
 
         # Score: higher torque sum is better (simple heuristic)
+        if scale != 1.0:
+            candidate = [d * scale for d in candidate]
         score = sum(candidate)
         if score > best_score:
             best_score = score
@@ -131,9 +258,16 @@ def optimize(
         ),
     }
 
+    # Validate no NaN/Inf leaked through
+    for i, d in enumerate(best_deltas):
+        if not math.isfinite(d):
+            warnings.append(f"Non-finite delta at bin {i}, zeroed out")
+            best_deltas[i] = 0.0
+
+    best_deltas = [_round_toward_zero(d) for d in best_deltas]
+
     # Final peak-gain ratio
-    final_proposed = apply_torque_deltas(baseline_torque, best_deltas)
-    final_peaks = find_peaks(rpm_bins, final_proposed)
+    final_peaks = evaluator.peaks(best_deltas)
     estimated_peak_gain = (
         (final_peaks.peak_torque_nm - baseline_peak_tq) / baseline_peak_tq
         if baseline_peak_tq > 0
@@ -143,18 +277,13 @@ def optimize(
     # Confidence: fraction of cycle budget that produced improvements
     confidence = _clamp(best_score / max(sum(baseline_torque), 1.0), 0.0, 1.0)
 
-    # Validate no NaN/Inf leaked through
-    for i, d in enumerate(best_deltas):
-        if not math.isfinite(d):
-            warnings.append(f"Non-finite delta at bin {i}, zeroed out")
-            best_deltas[i] = 0.0
-
     return {
-        "torque_delta_nm": [round(d, 4) for d in best_deltas],
+        "torque_delta_nm": best_deltas,
         "calibration": best_calibration,
         "confidence": round(confidence, 4),
         "estimated_peak_gain_ratio": round(estimated_peak_gain, 6),
-        "cycles_used": cycle_budget,
+        "cycles_used": cycles_used,
+        "acceptance_rate": round(accepted / cycles_used, 4) if cycles_used else 0.0,
         "best_score": round(best_score, 4),
         "notes": notes,
         "warnings": warnings,
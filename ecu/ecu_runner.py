@@ -5,12 +5,17 @@ Usage (Phase 0):
 
 Reads one JSON request from stdin, writes one JSON response to stdout.
 All logs go to stderr.
+
+The optimizer and the result cache are imported on the first valid request,
+so malformed input is answered without loading them (cold-start budget:
+ecu/tests/test_import_time.py).
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import os
 import sys
 import time
 
@@ -20,16 +25,33 @@ from ecu.contract import (
     validate_request,
     validate_response,
 )
-from ecu.ecu_optimizer import optimize
 
-# Structured logging → stderr only.
-logging.basicConfig(
-    stream=sys.stderr,
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
+# Structured logging → stderr only (configured in main()).
 logger = logging.getLogger("ecu_runner")
 
+# Same inputs + seed → same proposal, so results are reusable across calls.
+# Created (and ecu.cache imported) by _get_result_cache() on first use.
+_result_cache = None
+
+
+def _get_result_cache():
+    """Return the process-wide result cache, creating it on first use.
+
+    ECU_CACHE_DIR enables the shared on-disk layer.
+    """
+    global _result_cache
+    if _result_cache is None:
+        from ecu.cache import ResultCache
+
+        _result_cache = ResultCache(
+            max_entries=int(os.environ.get("ECU_CACHE_SIZE", "256")),
+            disk_dir=os.environ.get("ECU_CACHE_DIR") or None,
+            max_disk_bytes=int(
+                os.environ.get("ECU_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+            ),
+        )
+    return _result_cache
+
 
 def run(request_json: str) -> str:
     """Process a single ECU request and return the JSON response string."""
@@ -48,15 +70,31 @@ def run(request_json: str) -> str:
             )
             return json.dumps(resp)
 
+        from ecu.cache import proposal_key
+        from ecu.ecu_optimizer import optimize
+
         start = time.monotonic()
-        result = optimize(
-            rpm_bins=req["baseline_curve"]["rpm_bins"],
-            baseline_torque=req["baseline_curve"]["torque_nm"],
-            constraints=req["constraints"],
-            cycle_budget=req["cycle_budget"],
-            seed=req["seed"],
-            parts=req.get("parts"),
-        )
+        cache = _get_result_cache()
+        cache_key = proposal_key(req)
+        result = cache.get(cache_key)
+        cache_hit = result is not None
+        if not cache_hit:
+            cycle_limit = req.get("cycle_limit")
+            result = optimize(
+                rpm_bins=req["baseline_curve"]["rpm_bins"],
+                baseline_torque=req["baseline_curve"]["torque_nm"],
+                constraints=req["constraints"],
+                cycle_budget=req["cycle_budget"],
+                seed=req["seed"],
+                parts=req.get("parts"),
+                deadline_ms=req.get("deadline_ms"),
+                deadline_mode=req.get("deadline_mode", "wallclock"),
+                cycle_limit=cycle_limit,
+            )
+            # A deadline stop depends on wall time, so only full runs are cached.
+            planned = min(req["cycle_budget"], cycle_limit or req["cycle_budget"])
+            if result["cycles_used"] == planned:
+                cache.put(cache_key, result)
         elapsed_ms = (time.monotonic() - start) * 1000
 
         resp = build_ok_response(
@@ -70,6 +108,10 @@ def run(request_json: str) -> str:
             best_score=result["best_score"],
             notes=result["notes"],
             warnings=result["warnings"],
+            extra_metrics={
+                "cache": {"hit": cache_hit, **cache.stats()},
+                "acceptance_rate": result["acceptance_rate"],
+            },
         )
 
         resp_errors = validate_response(resp)
@@ -97,6 +139,11 @@ def run(request_json: str) -> str:
 
 def main() -> None:
     """Read from stdin, write to stdout."""
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
     request_json = sys.stdin.read()
     response_json = run(request_json)
     sys.stdout.write(response_json)
@@ -0,0 +1,107 @@
+"""Tests for ecu.cache — deterministic optimizer result cache."""
+
+import json
+import os
+
+from ecu import cache as cache_module
+from ecu.cache import ResultCache, proposal_key
+from ecu.ecu_runner import _get_result_cache, run
+from ecu.tests.test_contract_smoke import _SAMPLE_REQUEST
+
+
+class TestProposalKey:
+    def test_request_id_is_ignored(self):
+        a = dict(_SAMPLE_REQUEST, request_id="a")
+        b = dict(_SAMPLE_REQUEST, request_id="b")
+        assert proposal_key(a) == proposal_key(b)
+
+    def test_key_order_is_irrelevant(self):
+        reordered = dict(reversed(list(_SAMPLE_REQUEST.items())))
+        assert proposal_key(reordered) == proposal_key(_SAMPLE_REQUEST)
+
+    def test_seed_changes_key(self):
+        other = dict(_SAMPLE_REQUEST, seed=_SAMPLE_REQUEST["seed"] + 1)
+        assert proposal_key(other) != proposal_key(_SAMPLE_REQUEST)
+
+    def test_cache_version_changes_key(self, monkeypatch):
+        before = proposal_key(_SAMPLE_REQUEST)
+        monkeypatch.setattr(
+            cache_module, "CACHE_VERSION", cache_module.CACHE_VERSION + 1
+        )
+        assert proposal_key(_SAMPLE_REQUEST) != before
+
+
+class TestResultCache:
+    def test_hit_and_miss_counters(self):
+        cache = ResultCache()
+        assert cache.get("k") is None
+        cache.put("k", {"v": [1.0]})
+        assert cache.get("k") == {"v": [1.0]}
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_values_are_copied(self):
+        cache = ResultCache()
+        value = {"v": [1.0]}
+        cache.put("k", value)
+        value["v"].append(2.0)
+        cache.get("k")["v"].append(3.0)
+        assert cache.get("k") == {"v": [1.0]}
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")
+        cache.put("c", {})
+        assert cache.get("b") is None
+        assert cache.get("a") == {}
+
+    def test_disk_layer_survives_new_instance(self, tmp_path):
+        ResultCache(disk_dir=str(tmp_path)).put("k", {"v": 1})
+        assert ResultCache(disk_dir=str(tmp_path)).get("k") == {"v": 1}
+
+    def test_disk_size_eviction(self, tmp_path):
+        cache = ResultCache(
+            max_entries=0, disk_dir=str(tmp_path), max_disk_bytes=200
+        )
+        for i in range(10):
+            cache.put(f"k{i}", {"payload": "x" * 40})
+        total = sum(
+            os.path.getsize(os.path.join(tmp_path, f)) for f in os.listdir(tmp_path)
+        )
+        assert total <= 200
+        assert cache.get("k9") == {"payload": "x" * 40}
+
+    def test_disk_writes_scan_only_past_the_limit(self, tmp_path, monkeypatch):
+        cache = ResultCache(
+            max_entries=0, disk_dir=str(tmp_path), max_disk_bytes=5000
+        )
+        scans = []
+        scandir = os.scandir
+        monkeypatch.setattr(
+            os, "scandir", lambda path: scans.append(path) or scandir(path)
+        )
+        for i in range(50):
+            cache.put(f"k{i}", {"payload": "x" * 40})
+        assert len(scans) == 1  # the first write learns the directory size
+
+        for i in range(50, 300):
+            cache.put(f"k{i}", {"payload": "x" * 40})
+        total = sum(
+            os.path.getsize(os.path.join(tmp_path, f)) for f in os.listdir(tmp_path)
+        )
+        assert total <= 5000
+        assert len(scans) < 40
+
+
+class TestRunnerCache:
+    def test_hit_returns_identical_proposal(self):
+        _get_result_cache().clear()
+        first = json.loads(run(json.dumps(_SAMPLE_REQUEST)))
+        second = json.loads(run(json.dumps(dict(_SAMPLE_REQUEST, request_id="r2"))))
+
+        assert first["metrics"]["cache"]["hit"] is False
+        assert second["metrics"]["cache"]["hit"] is True
+        assert second["metrics"]["cache"]["hits"] == 1
+        assert second["request_id"] == "r2"
+        assert first["proposal"] == second["proposal"]
@@ -60,6 +60,7 @@ class TestContractSmoke:
         assert "proposal" in resp
         assert "metrics" in resp
         assert "debug" in resp
+        assert 0.0 <= resp["metrics"]["acceptance_rate"] <= 1.0
 
     def test_proposal_fields(self):
         """Proposal must contain calibration, torque_delta_nm, etc."""
@@ -105,6 +106,25 @@ class TestContractSmoke:
         assert resp["status"] == "error"
         assert resp["error"]["code"] == "INVALID_REQUEST"
 
+    def test_integral_float_rpm_is_accepted(self):
+        """rpm_bins such as 1500.0 behave exactly like 1500."""
+        floats = json.loads(json.dumps(_SAMPLE_REQUEST))
+        floats["baseline_curve"]["rpm_bins"] = [
+            float(r) for r in floats["baseline_curve"]["rpm_bins"]
+        ]
+        resp = json.loads(run(json.dumps(floats)))
+        ints = json.loads(run(json.dumps(_SAMPLE_REQUEST)))
+        assert resp["status"] == "ok"
+        assert resp["proposal"] == ints["proposal"]
+
+    def test_non_integer_rpm_returns_error(self):
+        """Fractional rpm_bins are rejected (they are stored as int arrays)."""
+        bad = json.loads(json.dumps(_SAMPLE_REQUEST))
+        bad["baseline_curve"]["rpm_bins"][0] = 1000.5
+        resp = json.loads(run(json.dumps(bad)))
+        assert resp["status"] == "error"
+        assert resp["error"]["code"] == "INVALID_REQUEST"
+
     def test_garbage_json_returns_error(self):
         """Non-JSON input must return a JSON error response."""
         resp = json.loads(run("not json at all"))
@@ -4,6 +4,8 @@ import pytest
 
 from ecu.dyno_model import (
     HP_CONSTANT,
+    CurveEvaluator,
+    DynoCurve,
     apply_torque_deltas,
     compute_hp,
     compute_hp_curve,
@@ -91,3 +93,105 @@ class TestApplyTorqueDeltas:
     def test_nan_delta_raises(self):
         with pytest.raises(ValueError, match="Non-finite"):
             apply_torque_deltas([100.0], [float("nan")])
+
+
+# ── CurveEvaluator ──────────────────────────────────────────────────────────
+
+_RPM = [1000, 2000, 3000, 4000, 5000]
+_TQ = [150.0, 200.0, 240.0, 230.0, 180.0]
+
+
+class TestDynoCurve:
+    def test_typed_arrays(self):
+        curve = DynoCurve(_RPM, _TQ)
+        assert curve.rpm.typecode == "i"
+        assert curve.torque.typecode == "d"
+        assert list(curve.torque) == _TQ
+        assert len(curve) == 5
+
+    def test_derived_values_match_functions(self):
+        curve = DynoCurve(_RPM, _TQ)
+        assert list(curve.hp) == compute_hp_curve(_RPM, _TQ)
+        assert curve.peaks == find_peaks(_RPM, _TQ)
+        assert list(curve.second_difference) == [-10.0, -50.0, -40.0]
+
+    def test_derived_values_cached(self):
+        curve = DynoCurve(_RPM, _TQ)
+        assert curve.hp is curve.hp
+        assert curve.second_difference is curve.second_difference
+
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            DynoCurve(_RPM, _TQ).extra = 1
+
+    def test_views_are_zero_copy_and_read_only(self):
+        curve = DynoCurve(_RPM, _TQ)
+        view = curve.torque_view()
+        assert view.format == "d"
+        assert view.readonly
+        assert view.tolist() == _TQ
+        assert curve.rpm_view().tolist() == _RPM
+        with pytest.raises(TypeError):
+            view[0] = 1.0
+
+    def test_with_deltas_shares_rpm(self):
+        curve = DynoCurve(_RPM, _TQ)
+        moved = curve.with_deltas([1.0, -2.0, 0.0, 0.0, 3.0])
+        assert moved.rpm is curve.rpm
+        assert list(moved.torque) == [151.0, 198.0, 240.0, 230.0, 183.0]
+        assert list(curve.torque) == _TQ
+
+    def test_with_deltas_nan_raises(self):
+        with pytest.raises(ValueError, match="Non-finite"):
+            DynoCurve(_RPM, _TQ).with_deltas([float("nan")] * 5)
+
+    @pytest.mark.parametrize(
+        "rpm, tq",
+        [
+            ([1000, 2000], [1.0]),
+            ([1000.5], [1.0]),
+            ([1000], [float("inf")]),
+        ],
+    )
+    def test_invalid_input_raises(self, rpm, tq):
+        with pytest.raises(ValueError):
+            DynoCurve(rpm, tq)
+
+    def test_integral_float_rpm_is_stored_as_int(self):
+        curve = DynoCurve([float(r) for r in _RPM], _TQ)
+        assert list(curve.rpm) == list(_RPM)
+        assert curve.hp == DynoCurve(_RPM, _TQ).hp
+
+    def test_empty_peaks_raises(self):
+        with pytest.raises(ValueError, match="Empty"):
+            _ = DynoCurve([], []).peaks
+
+
+class TestCurveEvaluator:
+    def test_baseline_cached(self):
+        ev = CurveEvaluator(DynoCurve(_RPM, _TQ))
+        assert ev.baseline_peaks == find_peaks(_RPM, _TQ)
+        assert list(ev.baseline_hp) == compute_hp_curve(_RPM, _TQ)
+
+    @pytest.mark.parametrize("scale", [1.0, 0.5, 0.37])
+    def test_peaks_match_find_peaks(self, scale):
+        ev = CurveEvaluator(DynoCurve(_RPM, _TQ))
+        deltas = [4.0, -1.0, 0.0, 15.0, 60.0]
+        scaled = [d * scale for d in deltas]
+        expected = find_peaks(_RPM, apply_torque_deltas(_TQ, scaled))
+        assert ev.peaks(deltas, scale) == expected
+        assert ev.peak_torque(deltas, scale) == expected.peak_torque_nm
+
+    def test_second_derivative_ok(self):
+        ev = CurveEvaluator(DynoCurve(_RPM, _TQ))
+        assert ev.second_derivative_ok([0.0] * 5, 0.5)
+        assert not ev.second_derivative_ok([0.0, 0.0, 80.0, 0.0, 0.0], 0.5)
+        assert ev.second_derivative_ok([0.0, 0.0, 80.0, 0.0, 0.0], 0.5, scale=0.01)
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError, match="mismatch"):
+            CurveEvaluator(DynoCurve(_RPM, _TQ)).peaks([1.0])
+
+    def test_nan_delta_raises(self):
+        with pytest.raises(ValueError, match="Non-finite"):
+            CurveEvaluator(DynoCurve(_RPM, _TQ)).peak_torque([float("nan")] * 5)
@@ -1,6 +1,7 @@
 """Tests for ecu.ecu_optimizer — deterministic ECU tuning stub."""
 
 import math
+import random
 
 from ecu.ecu_optimizer import optimize
 
@@ -84,8 +85,81 @@ class TestOptimize:
             "confidence",
             "estimated_peak_gain_ratio",
             "cycles_used",
+            "acceptance_rate",
             "best_score",
             "notes",
             "warnings",
         }
         assert set(result.keys()) == expected
+
+    def test_smooth_candidates_nearly_always_accepted(self):
+        """Raised-cosine candidates pass the smoothness check by construction."""
+        result = optimize(_RPM_BINS, _BASELINE_TQ, _CONSTRAINTS, 200, seed=5)
+        assert result["acceptance_rate"] >= 0.95
+        assert result["best_score"] > 0
+
+    def test_result_is_smooth(self):
+        result = optimize(_RPM_BINS, _BASELINE_TQ, _CONSTRAINTS, 100, seed=11)
+        proposed = [t + d for t, d in zip(_BASELINE_TQ, result["torque_delta_nm"])]
+        max_d2 = _CONSTRAINTS["smoothness"]["max_second_derivative"]
+        for i in range(1, len(proposed) - 1):
+            d2 = abs(proposed[i - 1] - 2 * proposed[i] + proposed[i + 1])
+            assert d2 <= max_d2 * proposed[i] + 1e-6
+
+    def test_rounded_deltas_respect_caps(self):
+        """Returned (rounded) deltas never cross a per-bin, ratio or peak cap."""
+        for seed in range(60):
+            rng = random.Random(seed)
+            n = rng.randint(3, 40)
+            rpm_bins = [1000 + 100 * i for i in range(n)]
+            level, hump = rng.uniform(50.0, 300.0), rng.uniform(20.0, 120.0)
+            torque = [
+                round(level + hump * math.sin(math.pi * (i + 0.5) / n), 3)
+                for i in range(n)
+            ]
+            constraints = {
+                "max_peak_gain_ratio": rng.choice([0.005, 0.02, 0.05]),
+                "max_bin_delta_nm": rng.choice([0.5, 2.0, 8.0]),
+                "max_bin_delta_ratio": rng.choice([0.01, 0.03]),
+                "smoothness": {"max_second_derivative": rng.choice([0.15, 0.5])},
+            }
+            result = optimize(rpm_bins, torque, constraints, 200, seed)
+            deltas = result["torque_delta_nm"]
+
+            for t, d in zip(torque, deltas):
+                assert abs(d) <= constraints["max_bin_delta_nm"], seed
+                assert abs(d) / t <= constraints["max_bin_delta_ratio"], seed
+            peak = max(torque)
+            new_peak = max(t + d for t, d in zip(torque, deltas))
+            assert (new_peak - peak) / peak <= constraints["max_peak_gain_ratio"], seed
+
+
+class TestDeadline:
+    def test_deadline_stops_early_with_real_cycle_count(self):
+        result = optimize(
+            _RPM_BINS, _BASELINE_TQ, _CONSTRAINTS, 10_000_000, seed=3,
+            deadline_ms=5,
+        )
+        assert 0 < result["cycles_used"] < 10_000_000
+        assert any("Deadline reached" in n for n in result["notes"])
+
+    def test_no_deadline_uses_full_budget(self):
+        result = optimize(_RPM_BINS, _BASELINE_TQ, _CONSTRAINTS, 40, seed=3)
+        assert result["cycles_used"] == 40
+        assert result["notes"] == []
+
+    def test_checkpoint_mode_is_replayable(self):
+        stopped = optimize(
+            _RPM_BINS, _BASELINE_TQ, _CONSTRAINTS, 10_000_000, seed=11,
+            deadline_ms=20, deadline_mode="checkpoint",
+        )
+        cycles = stopped["cycles_used"]
+        assert cycles % 32 == 0
+
+        replay = optimize(
+            _RPM_BINS, _BASELINE_TQ, _CONSTRAINTS, 10_000_000, seed=11,
+            cycle_limit=cycles,
+        )
+        assert replay["torque_delta_nm"] == stopped["torque_delta_nm"]
+        assert replay["calibration"] == stopped["calibration"]
+        assert replay["cycles_used"] == cycles
@@ -0,0 +1,64 @@
+"""Cold-start import budget for ``python -m ecu.ecu_runner`` (-X importtime).
+
+Malformed input must be answered without importing the optimizer, the
+result cache or :mod:`typing`; a valid request loads them on demand.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from ecu.tests.test_contract_smoke import _SAMPLE_REQUEST
+
+_REPO_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# Self time of the runner's own imports, best of _RUNS. Generous on purpose:
+# pulling the optimizer back into the error path costs far more.
+_IMPORT_BUDGET_MS = {"error": 60.0, "request": 150.0}
+_RUNS = 3
+
+_LAZY_MODULES = {"ecu.cache", "ecu.ecu_optimizer", "ecu.dyno_model", "typing"}
+
+
+def _importtime(args, stdin_text=""):
+    """Return ``{module: self time in us}`` for one ``python -X importtime`` run."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        input=stdin_text,
+        capture_output=True,
+        text=True,
+        cwd=_REPO_ROOT,
+        timeout=60,
+        check=False,  # malformed input exits non-zero by design
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def _runner_imports(stdin_text):
+    """Modules the runner adds to ``python -m`` start-up, best of ``_RUNS``."""
+    baseline = set(_importtime(["-c", "import runpy"]))
+    runs = [_importtime(["-m", "ecu.ecu_runner"], stdin_text) for _ in range(_RUNS)]
+    best = min(runs, key=lambda m: sum(m.values()))
+    return {name: us for name, us in best.items() if name not in baseline}
+
+
+def test_malformed_input_skips_optimizer():
+    for stdin_text in ("", "{not json"):
+        added = _runner_imports(stdin_text)
+        assert not _LAZY_MODULES & set(added), stdin_text
+        assert sum(added.values()) / 1000 < _IMPORT_BUDGET_MS["error"]
+
+
+def test_valid_request_loads_optimizer():
+    added = _runner_imports(json.dumps(_SAMPLE_REQUEST))
+    assert {"ecu.cache", "ecu.ecu_optimizer"} <= set(added)
+    assert sum(added.values()) / 1000 < _IMPORT_BUDGET_MS["request"]
@@ -0,0 +1,280 @@
+"""
+benchmarks/bench_hotpaths.py
+
+Latency benchmarks for the ECU hot paths over a grid of curve sizes and
+cycle budgets.
+
+Cases ("python" is this tree, "ecu" is the root ecu package):
+    python.run_optimization[bins=N,budget=B]
+    python.validate_proposal[bins=N]
+    python.process_request[bins=N,budget=B]
+    ecu.optimize[bins=N,budget=B]
+    ecu.find_peaks[bins=N]
+    ecu.run[bins=N,budget=B]
+
+Both trees have a top-level package named "ecu", so they cannot be imported
+into one interpreter: --tree all (the default) benchmarks the root tree in a
+child process and merges its results.
+
+Every sample uses a different seed, so the runners' result caches miss and
+each sample times a full optimization. ECU_CACHE_DIR is ignored, and INFO
+logging is disabled so stderr stays readable.
+
+Usage:
+    python benchmarks/bench_hotpaths.py --output baseline.json
+    python benchmarks/bench_hotpaths.py --compare baseline.json --threshold 0.15
+    python benchmarks/bench_hotpaths.py --quick --tree python --filter run_optimization
+
+With --compare the exit status is 1 if any case regressed (see harness.compare).
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Callable
+
+from harness import (
+    DEFAULT_THRESHOLD,
+    MIN_TIME_S,
+    compare,
+    load_report,
+    measure,
+    new_report,
+    write_report,
+)
+
+PYTHON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REPO_ROOT = os.path.dirname(PYTHON_DIR)
+
+TREES = ("python", "ecu", "all")
+
+DEFAULT_BINS = (11, 50, 200, 500)
+DEFAULT_BUDGETS = (10, 100, 1000, 5000)
+QUICK_BINS = (11, 50)
+QUICK_BUDGETS = (10, 100)
+
+CONSTRAINTS = {
+    "max_peak_gain_ratio": 0.02,
+    "max_bin_delta_nm": 8.0,
+    "max_bin_delta_ratio": 0.03,
+    "max_total_variation_ratio": 0.02,
+    "smoothness": {"max_second_derivative": 0.15},
+    "calibration_ranges": {
+        "afr_target": [11.5, 14.7],
+        "ign_timing_deg": [-2.0, 8.0],
+        "boost_target_psi": [0.0, 22.0],
+    },
+}
+
+
+def make_curve(n_bins: int) -> tuple[list[int], list[float]]:
+    """Smooth single-hump torque curve over 1000-7000 rpm with n_bins bins."""
+    step = 6000 / max(n_bins - 1, 1)
+    rpm_bins = [1000 + round(i * step) for i in range(n_bins)]
+    torque_nm = [
+        round(150.0 + 80.0 * math.sin(math.pi * (i + 0.5) / n_bins), 3)
+        for i in range(n_bins)
+    ]
+    return rpm_bins, torque_nm
+
+
+def make_request(n_bins: int, cycle_budget: int, seed: int) -> dict[str, Any]:
+    """A complete contract 1.0 request, valid for both runners."""
+    rpm_bins, torque_nm = make_curve(n_bins)
+    return {
+        "contract_version": "1.0",
+        "request_id": f"bench-{n_bins}-{cycle_budget}-{seed}",
+        "seed": seed,
+        "cycle_budget": cycle_budget,
+        "vehicle": {
+            "vehicle_id": "bench",
+            "engine_family": "I4",
+            "aspiration": "Turbo",
+            "drivetrain": "RWD",
+        },
+        "environment": {"biome_id": "bench", "altitude_m": 0.0, "ambient_temp_c": 25.0},
+        "street_cred": {"level": 1, "modifier": 1.0},
+        "baseline_curve": {"rpm_bins": rpm_bins, "torque_nm": torque_nm},
+        "constraints": CONSTRAINTS,
+        "parts": [],
+    }
+
+
+def _python_cases(bins, budgets) -> dict[str, Callable[[int], Any]]:
+    from ecu.optimizer import run_optimization
+    from ecu.validator import validate_proposal
+    from ecu_runner import process_request
+
+    cases: dict[str, Callable[[int], Any]] = {}
+    for n in bins:
+        rpm_bins, torque_nm = make_curve(n)
+        for budget in budgets:
+            cases[f"python.run_optimization[bins={n},budget={budget}]"] = (
+                lambda i, r=rpm_bins, t=torque_nm, b=budget:
+                    run_optimization(t, r, CONSTRAINTS, b, i)
+            )
+            cases[f"python.process_request[bins={n},budget={budget}]"] = (
+                lambda i, n=n, b=budget: process_request(make_request(n, b, i))
+            )
+        proposal = run_optimization(torque_nm, rpm_bins, CONSTRAINTS, 100, 0)
+        cases[f"python.validate_proposal[bins={n}]"] = (
+            lambda i, r=rpm_bins, t=torque_nm, p=proposal: validate_proposal(
+                p["torque_delta_nm"], p["calibration"], t, r, CONSTRAINTS
+            )
+        )
+    return cases
+
+
+def _ecu_cases(bins, budgets) -> dict[str, Callable[[int], Any]]:
+    from ecu.dyno_model import find_peaks
+    from ecu.ecu_optimizer import optimize
+    from ecu.ecu_runner import run
+
+    cases: dict[str, Callable[[int], Any]] = {}
+    for n in bins:
+        rpm_bins, torque_nm = make_curve(n)
+        for budget in budgets:
+            cases[f"ecu.optimize[bins={n},budget={budget}]"] = (
+                lambda i, r=rpm_bins, t=torque_nm, b=budget:
+                    optimize(r, t, CONSTRAINTS, b, i)
+            )
+            cases[f"ecu.run[bins={n},budget={budget}]"] = (
+                lambda i, n=n, b=budget: run(json.dumps(make_request(n, b, i)))
+            )
+        cases[f"ecu.find_peaks[bins={n}]"] = (
+            lambda i, r=rpm_bins, t=torque_nm: find_peaks(r, t)
+        )
+    return cases
+
+
+def run_tree(
+    tree: str,
+    bins,
+    budgets,
+    case_filter: str = "",
+    min_time_s: float = MIN_TIME_S,
+    min_samples: int | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Benchmark one tree in this process; returns {case_id: stats}."""
+    os.environ.pop("ECU_CACHE_DIR", None)
+    path = PYTHON_DIR if tree == "python" else REPO_ROOT
+    loaded = sys.modules.get("ecu")
+    if loaded is not None and not any(
+        os.path.dirname(os.path.abspath(p)) == path for p in loaded.__path__
+    ):
+        raise RuntimeError(
+            f"another 'ecu' package is already imported; benchmark tree {tree!r} "
+            f"in its own process (--tree {tree})"
+        )
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+    logging.disable(logging.INFO)
+    try:
+        cases = _python_cases(bins, budgets) if tree == "python" else _ecu_cases(bins, budgets)
+        options = {"min_time_s": min_time_s}
+        if min_samples is not None:
+            options["min_samples"] = min_samples
+        return {
+            case_id: measure(fn, **options)
+            for case_id, fn in cases.items()
+            if case_filter in case_id
+        }
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def _run_child(tree: str, args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+    """Benchmark a tree in a child interpreter and return its results."""
+    fd, path = tempfile.mkstemp(prefix="ecu-bench-", suffix=".json")
+    os.close(fd)
+    try:
+        cmd = [
+            sys.executable, os.path.abspath(__file__),
+            "--tree", tree,
+            "--bins", *map(str, args.bins),
+            "--budgets", *map(str, args.budgets),
+            "--min-time", str(args.min_time),
+            "--filter", args.filter,
+            "--output", path,
+        ]
+        if args.min_samples is not None:
+            cmd += ["--min-samples", str(args.min_samples)]
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+        return load_report(path)["results"]
+    finally:
+        os.unlink(path)
+
+
+def print_table(results: dict[str, dict[str, Any]]) -> None:
+    width = max((len(c) for c in results), default=4)
+    print(f"{'case':<{width}}  {'n':>5} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>11}")
+    for case_id, s in results.items():
+        print(
+            f"{case_id:<{width}}  {s['n']:>5} {s['p50_ms']:>10.4f} {s['p95_ms']:>10.4f} "
+            f"{s['p99_ms']:>10.4f} {s['ops_per_sec']:>11.1f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ECU hot paths")
+    parser.add_argument("--tree", choices=TREES, default="all", help="code tree to benchmark")
+    parser.add_argument("--bins", type=int, nargs="+", help="curve sizes (default 11 50 200 500)")
+    parser.add_argument(
+        "--budgets", type=int, nargs="+", help="cycle budgets (default 10 100 1000 5000)"
+    )
+    parser.add_argument("--quick", action="store_true", help="small grid: bins 11 50, budgets 10 100")
+    parser.add_argument("--filter", default="", help="only run cases whose id contains this")
+    parser.add_argument(
+        "--min-time", type=float, default=MIN_TIME_S, help="seconds of timed calls per case"
+    )
+    parser.add_argument("--min-samples", type=int, help="samples per case (at least)")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against this report")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="relative p50 growth counted as a regression (default 0.10)",
+    )
+    args = parser.parse_args(argv)
+    if args.bins is None:
+        args.bins = list(QUICK_BINS if args.quick else DEFAULT_BINS)
+    if args.budgets is None:
+        args.budgets = list(QUICK_BUDGETS if args.quick else DEFAULT_BUDGETS)
+
+    options = dict(case_filter=args.filter, min_time_s=args.min_time, min_samples=args.min_samples)
+    results: dict[str, dict[str, Any]] = {}
+    if args.tree in ("python", "all"):
+        results.update(run_tree("python", args.bins, args.budgets, **options))
+    if args.tree == "ecu":
+        results.update(run_tree("ecu", args.bins, args.budgets, **options))
+    elif args.tree == "all":
+        results.update(_run_child("ecu", args))
+
+    print_table(results)
+    report = new_report(results, tree=args.tree, bins=args.bins, budgets=args.budgets)
+    if args.output:
+        write_report(args.output, report)
+
+    if args.compare:
+        regressions = compare(report, load_report(args.compare), args.threshold)
+        print()
+        if not regressions:
+            print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+            return 0
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.compare}:")
+        for r in regressions:
+            print(
+                f"  {r['case']}: p50 {r['baseline_p50_ms']:.4f} -> {r['p50_ms']:.4f} ms "
+                f"(x{r['ratio']})"
+            )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+benchmarks/bench_samplers.py
+
+Cycles-to-quality comparison of the "gaussian" (pseudo-random) and "halton"
+(quasi-random) candidate samplers.
+
+Quality is the fraction of the achievable improvement a run reaches:
+    (best_score - baseline_score) / (lp_score - baseline_score)
+where lp_score is the exact optimum from strategy "lp". For each cycle budget
+the benchmark runs every seed with both samplers and reports mean, 10th
+percentile and worst quality, then the smallest budget at which each sampler's
+mean reaches a set of quality targets.
+
+Usage:
+    python benchmarks/bench_samplers.py --seeds 200 --budgets 8 16 32 64 128 256
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ecu.optimizer import run_optimization
+
+SAMPLERS = ("gaussian", "halton")
+
+DEFAULT_BUDGETS = (8, 16, 32, 64, 128, 256)
+
+QUALITY_TARGETS = (0.65, 0.70, 0.75)
+
+# The standard 11-bin test curve (tests/test_ecu_runner.make_request).
+RPM_BINS = [1000, 1500, 2000, 2500, 3000, 3500, 4000, 4500, 5000, 5500, 6000]
+TORQUE_NM = [180.0, 195.0, 210.0, 220.0, 225.0, 222.0, 215.0, 205.0, 190.0, 170.0, 145.0]
+CONSTRAINTS = {
+    "max_peak_gain_ratio": 0.02,
+    "max_bin_delta_nm": 8.0,
+    "max_bin_delta_ratio": 0.03,
+    "smoothness": {"max_second_derivative": 0.15},
+}
+
+
+def quality_table(
+    budgets: list[int],
+    seeds: int,
+) -> dict[str, dict[int, list[float]]]:
+    """Return {sampler: {budget: [quality per seed]}}."""
+    baseline_score = sum(TORQUE_NM)
+    optimum = run_optimization(TORQUE_NM, RPM_BINS, CONSTRAINTS, 100, 0, strategy="lp")
+    headroom = optimum["best_score"] - baseline_score
+
+    table: dict[str, dict[int, list[float]]] = {s: {} for s in SAMPLERS}
+    for sampler in SAMPLERS:
+        for budget in budgets:
+            table[sampler][budget] = [
+                (
+                    run_optimization(
+                        TORQUE_NM, RPM_BINS, CONSTRAINTS, budget, seed, strategy=sampler
+                    )["best_score"]
+                    - baseline_score
+                )
+                / headroom
+                for seed in range(seeds)
+            ]
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare gaussian and halton samplers")
+    parser.add_argument("--seeds", type=int, default=200, help="seeds per budget")
+    parser.add_argument(
+        "--budgets", type=int, nargs="+", default=list(DEFAULT_BUDGETS),
+        help="cycle budgets to evaluate",
+    )
+    args = parser.parse_args(argv)
+    logging.getLogger("ecu").setLevel(logging.WARNING)
+
+    budgets = sorted(args.budgets)
+    table = quality_table(budgets, args.seeds)
+
+    print(f"{'budget':>6}  {'sampler':<9} {'mean':>7} {'p10':>7} {'worst':>7}")
+    for budget in budgets:
+        for sampler in SAMPLERS:
+            q = sorted(table[sampler][budget])
+            p10 = q[len(q) // 10]
+            print(
+                f"{budget:>6}  {sampler:<9} {statistics.mean(q):7.4f} {p10:7.4f} {q[0]:7.4f}"
+            )
+
+    print()
+    print("cycles for mean quality to reach target:")
+    for target in QUALITY_TARGETS:
+        reached = []
+        for sampler in SAMPLERS:
+            budget = next(
+                (b for b in budgets if statistics.mean(table[sampler][b]) >= target),
+                None,
+            )
+            reached.append(f"{sampler}={budget if budget is not None else '>' + str(budgets[-1])}")
+        print(f"  {target:.2f}: " + "  ".join(reached))
+
+
+if __name__ == "__main__":
+    main()
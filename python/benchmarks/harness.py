@@ -0,0 +1,144 @@
+"""
+benchmarks/harness.py
+
+Stdlib timing harness for the benchmark scripts (no third-party packages).
+
+measure() calls a function repeatedly with time.perf_counter_ns and returns
+latency percentiles and throughput. A report is a JSON document:
+
+    {
+      "meta":    {"python": ..., "platform": ..., "created": ...},
+      "results": {case_id: {"n", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+                            "min_ms", "max_ms", "ops_per_sec"}}
+    }
+
+compare() checks a report against a stored baseline report and lists the
+cases whose p50 grew by more than a relative threshold. p50 is used because
+it is stable on a noisy machine; p95/p99 are reported alongside.
+"""
+
+import json
+import math
+import platform
+import sys
+import time
+from typing import Any, Callable
+
+# A case is sampled until it has MIN_SAMPLES samples and MIN_TIME_S seconds of
+# timed calls, or MAX_SAMPLES samples, whichever comes first.
+MIN_SAMPLES = 5
+MAX_SAMPLES = 1000
+MIN_TIME_S = 0.5
+
+DEFAULT_THRESHOLD = 0.10
+
+STAT_KEYS = ("n", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "min_ms", "max_ms", "ops_per_sec")
+
+
+def percentile(sorted_ns: list[int], q: float) -> int:
+    """Nearest-rank percentile (q in [0, 100]) of an ascending list."""
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_ns)))
+    return sorted_ns[rank - 1]
+
+
+def summarize(samples_ns: list[int]) -> dict[str, Any]:
+    """Latency statistics for per-call samples in nanoseconds."""
+    ordered = sorted(samples_ns)
+    mean_ns = sum(ordered) / len(ordered)
+
+    def ms(ns: float) -> float:
+        return round(ns / 1e6, 6)
+
+    return {
+        "n": len(ordered),
+        "mean_ms": ms(mean_ns),
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "p99_ms": ms(percentile(ordered, 99)),
+        "min_ms": ms(ordered[0]),
+        "max_ms": ms(ordered[-1]),
+        "ops_per_sec": round(1e9 / max(mean_ns, 1.0), 2),
+    }
+
+
+def measure(
+    fn: Callable[[int], Any],
+    min_samples: int = MIN_SAMPLES,
+    max_samples: int = MAX_SAMPLES,
+    min_time_s: float = MIN_TIME_S,
+    warmup: int = 1,
+) -> dict[str, Any]:
+    """
+    Time fn(i) for i = 0, 1, 2, ... and return summarize() of the samples.
+
+    The sample index lets a case vary its input per call (e.g. the seed), so
+    result caches in the code under test do not turn every call into a hit.
+    Warm-up calls use negative indices and are not recorded.
+    """
+    for i in range(warmup):
+        fn(-1 - i)
+
+    samples: list[int] = []
+    total_ns = 0
+    min_time_ns = int(min_time_s * 1e9)
+    clock = time.perf_counter_ns
+    while len(samples) < max_samples and (
+        len(samples) < min_samples or total_ns < min_time_ns
+    ):
+        t0 = clock()
+        fn(len(samples))
+        elapsed = clock() - t0
+        samples.append(elapsed)
+        total_ns += elapsed
+    return summarize(samples)
+
+
+def new_report(results: dict[str, dict[str, Any]], **meta: Any) -> dict[str, Any]:
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            **meta,
+        },
+        "results": results,
+    }
+
+
+def write_report(path: str, report: dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+        fh.write("\n")
+
+
+def load_report(path: str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """
+    Return one entry per case present in both reports whose p50 grew by more
+    than threshold (0.10 = 10 %), sorted worst first. Cases present in only
+    one report are ignored.
+    """
+    regressions = []
+    for case_id, stats in current["results"].items():
+        base = baseline["results"].get(case_id)
+        if base is None or base["p50_ms"] <= 0:
+            continue
+        ratio = stats["p50_ms"] / base["p50_ms"]
+        if ratio > 1.0 + threshold:
+            regressions.append({
+                "case": case_id,
+                "baseline_p50_ms": base["p50_ms"],
+                "p50_ms": stats["p50_ms"],
+                "ratio": round(ratio, 3),
+            })
+    regressions.sort(key=lambda r: r["ratio"], reverse=True)
+    return regressions
@@ -0,0 +1,288 @@
+"""
+benchmarks/latency_harness.py
+
+End-to-end latency of the ECU runner as Unity invokes it: one fresh
+interpreter per request, the request on stdin, the response on stdout, and a
+hard timeout after which the process is killed and the baseline tune is used
+(docs/20_ARCHITECTURE.md §9.1).
+
+Each run is timed from spawn to process exit, so it includes interpreter
+start-up, imports, the stdin read, the optimization and the stdout flush.
+Every run ends in one of these outcomes:
+
+    applied   exit 0, stdout is a status "ok" response, and the proposal
+              passes the Unity validation rules (ecu/validator.py)
+    rejected  a well-formed "rejected" or "error" response
+    invalid   the process crashed, stdout was not one JSON response, or the
+              proposal failed validation
+    timeout   the process did not exit within --timeout and was killed
+
+Everything but "applied" is a fallback to baseline. --no-validate counts every
+"ok" response as applied. The two trees do not share a validator: the root
+tree measures smoothness relative to the baseline curve, so its proposals can
+fail the Python tree's rules.
+
+Runners ("python" is python/ecu_runner.py, "ecu" is the root
+ecu/ecu_runner.py):
+
+    python   python ecu_runner.py       (cwd python/)
+    ecu      python -m ecu.ecu_runner   (cwd repository root)
+
+The corpus is a list of request JSON files or directories of *.json files.
+Without --corpus, a synthetic corpus over a small grid of curve sizes and
+cycle budgets is used (bench_hotpaths.make_request). The environment is
+passed through unchanged, as Unity would, so set ECU_CACHE_DIR only if the
+deployment does.
+
+Usage:
+    python benchmarks/latency_harness.py --runner both --concurrency 4
+    python benchmarks/latency_harness.py --corpus requests/ --timeout 2 --repeat 5 --output lat.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from harness import new_report, summarize, write_report
+
+PYTHON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REPO_ROOT = os.path.dirname(PYTHON_DIR)
+
+if PYTHON_DIR not in sys.path:
+    sys.path.insert(0, PYTHON_DIR)
+
+from ecu.validator import ValidationError, validate_proposal  # noqa: E402
+
+# Unity's example ECU timeout (docs/20_ARCHITECTURE.md §9.1).
+DEFAULT_TIMEOUT_S = 2.0
+
+RUNNERS = {
+    "python": (["ecu_runner.py"], PYTHON_DIR),
+    "ecu": (["-m", "ecu.ecu_runner"], REPO_ROOT),
+}
+
+OUTCOMES = ("applied", "rejected", "invalid", "timeout")
+
+SYNTHETIC_BINS = (11, 50, 200)
+SYNTHETIC_BUDGETS = (40, 500, 2000)
+
+
+def load_corpus(paths: list[str]) -> list[tuple[str, str]]:
+    """(name, request JSON text) for every file, in path order."""
+    files: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+    corpus = []
+    for path in files:
+        with open(path, encoding="utf-8") as fh:
+            corpus.append((os.path.basename(path), fh.read()))
+    return corpus
+
+
+def synthetic_corpus() -> list[tuple[str, str]]:
+    from bench_hotpaths import make_request
+
+    return [
+        (f"bins={n},budget={budget}", json.dumps(make_request(n, budget, seed=n + budget)))
+        for n in SYNTHETIC_BINS
+        for budget in SYNTHETIC_BUDGETS
+    ]
+
+
+def classify(
+    request_text: str, returncode: int, stdout: str, validate: bool = True
+) -> tuple[str, str]:
+    """(outcome, detail) for a runner that exited; see the module docstring."""
+    if returncode != 0:
+        return "invalid", f"exit code {returncode}"
+    try:
+        response = json.loads(stdout)
+    except json.JSONDecodeError as exc:
+        return "invalid", f"stdout is not JSON: {exc}"
+    if not isinstance(response, dict):
+        return "invalid", "response is not a JSON object"
+
+    status = response.get("status")
+    if status in ("rejected", "error"):
+        error = response.get("error") or {}
+        return "rejected", error.get("code") or status
+    if status != "ok":
+        return "invalid", f"unknown status {status!r}"
+    if not validate:
+        return "applied", ""
+
+    request = json.loads(request_text)
+    proposal = response.get("proposal") or {}
+    try:
+        validate_proposal(
+            proposal.get("torque_delta_nm"),
+            proposal.get("calibration") or {},
+            request["baseline_curve"]["torque_nm"],
+            request["baseline_curve"]["rpm_bins"],
+            request["constraints"],
+        )
+    except ValidationError as exc:
+        return "invalid", f"{exc.code}: {exc}"
+    except (TypeError, KeyError, ValueError) as exc:
+        return "invalid", f"malformed proposal: {exc}"
+    return "applied", ""
+
+
+def run_once(
+    runner: str,
+    request_text: str,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    python: str = sys.executable,
+    validate: bool = True,
+) -> dict[str, Any]:
+    """Spawn the runner for one request and return {outcome, detail, latency_ms}."""
+    args, cwd = RUNNERS[runner]
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [python, *args],
+        cwd=cwd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        stdout, _ = proc.communicate(request_text, timeout=timeout_s)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        return {
+            "outcome": "timeout",
+            "detail": f"no response within {timeout_s:g} s",
+            "latency_ms": round((time.perf_counter() - t0) * 1000, 3),
+        }
+    latency_ms = round((time.perf_counter() - t0) * 1000, 3)
+    outcome, detail = classify(request_text, proc.returncode, stdout, validate)
+    return {"outcome": outcome, "detail": detail, "latency_ms": latency_ms}
+
+
+def run_corpus(
+    runner: str,
+    corpus: list[tuple[str, str]],
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    concurrency: int = 1,
+    repeat: int = 1,
+    python: str = sys.executable,
+    validate: bool = True,
+) -> dict[str, Any]:
+    """
+    Replay the corpus repeat times with up to concurrency runners in flight.
+
+    Returns the latency summary of all runs (a timed-out run counts as the
+    time until it was killed), the outcome counts, the timeout and fallback
+    rates, and the latency summary per corpus entry.
+    """
+    jobs = [(name, text) for _ in range(repeat) for name, text in corpus]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        runs = list(pool.map(
+            lambda job: {"name": job[0], **run_once(runner, job[1], timeout_s, python, validate)},
+            jobs,
+        ))
+
+    counts = {outcome: 0 for outcome in OUTCOMES}
+    for run in runs:
+        counts[run["outcome"]] += 1
+    total = len(runs)
+
+    by_request: dict[str, list[int]] = {}
+    for run in runs:
+        by_request.setdefault(run["name"], []).append(int(run["latency_ms"] * 1e6))
+
+    return {
+        "runner": runner,
+        "runs": total,
+        "timeout_s": timeout_s,
+        "concurrency": concurrency,
+        "latency": summarize([int(run["latency_ms"] * 1e6) for run in runs]),
+        "outcomes": counts,
+        "timeout_rate": round(counts["timeout"] / total, 4),
+        "fallback_rate": round((total - counts["applied"]) / total, 4),
+        "per_request": {name: summarize(samples) for name, samples in by_request.items()},
+        "failures": [
+            {"name": run["name"], "outcome": run["outcome"], "detail": run["detail"]}
+            for run in runs
+            if run["outcome"] in ("invalid", "rejected")
+        ][:20],
+    }
+
+
+def print_summary(results: dict[str, dict[str, Any]]) -> None:
+    print(
+        f"{'runner':<8} {'runs':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'max ms':>9} {'timeout':>8} {'fallback':>9}"
+    )
+    for runner, r in results.items():
+        lat = r["latency"]
+        print(
+            f"{runner:<8} {r['runs']:>5} {lat['p50_ms']:>9.1f} {lat['p95_ms']:>9.1f} "
+            f"{lat['p99_ms']:>9.1f} {lat['max_ms']:>9.1f} {r['timeout_rate']:>8.1%} "
+            f"{r['fallback_rate']:>9.1%}"
+        )
+    for runner, r in results.items():
+        for failure in r["failures"]:
+            print(f"  {runner}: {failure['name']}: {failure['outcome']} ({failure['detail']})")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay requests through fresh ECU runner processes with a Unity-style timeout"
+    )
+    parser.add_argument(
+        "--runner", choices=(*RUNNERS, "both"), default="both", help="runner to spawn"
+    )
+    parser.add_argument(
+        "--corpus", nargs="+", help="request JSON files or directories (default: synthetic grid)"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_TIMEOUT_S,
+        help="seconds before a run is killed (default 2.0)",
+    )
+    parser.add_argument("--concurrency", type=int, default=1, help="runners in flight at once")
+    parser.add_argument("--repeat", type=int, default=1, help="times to replay the corpus")
+    parser.add_argument("--python", default=sys.executable, help="interpreter to spawn")
+    parser.add_argument(
+        "--no-validate", action="store_true",
+        help="count every status ok response as applied (skip the Unity rules)",
+    )
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1 or args.repeat < 1:
+        parser.error("--concurrency and --repeat must be >= 1")
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not corpus:
+        parser.error("the corpus is empty")
+    runners = list(RUNNERS) if args.runner == "both" else [args.runner]
+
+    results = {
+        runner: run_corpus(
+            runner, corpus, args.timeout, args.concurrency, args.repeat, args.python,
+            validate=not args.no_validate,
+        )
+        for runner in runners
+    }
+    print_summary(results)
+    if args.output:
+        write_report(args.output, new_report(
+            results, corpus_size=len(corpus), timeout_s=args.timeout,
+            concurrency=args.concurrency, repeat=args.repeat, validate=not args.no_validate,
+        ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
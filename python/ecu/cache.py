@@ -0,0 +1,267 @@
+"""
+ecu/cache.py
+
+Deterministic result cache for the ECU optimizer.
+
+The contract (ECU_CONTRACT.md §6) guarantees that identical request JSON and
+seed produce identical proposal fields, so an optimizer result can be reused
+verbatim. Entries are keyed by a SHA-256 of the canonical JSON of the proposal
+inputs — baseline curve, constraints, cycle_budget, seed, parts and the
+optional cycle_limit, strategy, patience, warm_start, shards and rng. request_id
+is deliberately excluded (as is the shard worker count, which never changes
+the result). CACHE_VERSION is hashed in too, so entries from an older search
+in a persistent ECU_CACHE_DIR are never served after an upgrade.
+
+Optional fields at their default (strategy "gaussian", rng "sequential",
+shards 1) hash the same as when they are absent.
+
+Layers:
+  - In-memory LRU, bounded by entry count.
+  - Optional on-disk store (one JSON file per key). When the directory grows
+    past max_disk_bytes, the least recently used files are evicted down to
+    DISK_LOW_WATER of it. The directory is scanned on a process's first write
+    and then only when its running total (last scan plus its own writes)
+    crosses the limit, so a write costs O(1). Other processes' writes are
+    only seen at a scan, so a shared directory can briefly exceed the limit.
+    Writes are atomic (temp file + rename), so several ECU processes may
+    share one directory.
+
+ProposalStore keeps the last proposal returned per vehicle_id, so a repeat
+dyno pull can warm-start from it (request field warm_start: true). It is a
+ResultCache keyed by vehicle_id, so with a disk_dir it survives the process
+and is shared by every worker using the directory.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Request fields that determine the proposal.
+PROPOSAL_INPUT_FIELDS = (
+    "baseline_curve",
+    "constraints",
+    "cycle_budget",
+    "seed",
+    "parts",
+    "cycle_limit",
+    "strategy",
+    "patience",
+    "warm_start",
+    "shards",
+    "rng",
+)
+
+# Optional input fields whose default hashes like the field being absent.
+INPUT_DEFAULTS = {"strategy": "gaussian", "rng": "sequential", "shards": 1}
+
+# Bump whenever the proposal for given inputs can change (optimizer, search
+# strategies, feasibility pre-check, rounding) or the cached value's format
+# does. Old entries then miss and age out of the disk layer.
+CACHE_VERSION = 3
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024
+
+# A scan that finds the disk store over max_disk_bytes evicts down to this
+# fraction of it, so the next scan is many writes away.
+DISK_LOW_WATER = 0.9
+
+
+def canonical_inputs(req: dict) -> str:
+    """Canonical JSON of CACHE_VERSION and every request field that determines the proposal."""
+    inputs = {field: req.get(field) for field in PROPOSAL_INPUT_FIELDS}
+    for field, default in INPUT_DEFAULTS.items():
+        if inputs[field] is None:
+            inputs[field] = default
+    return json.dumps(
+        {"cache_version": CACHE_VERSION, "inputs": inputs},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def proposal_key(req: dict) -> str:
+    """SHA-256 hex digest of canonical_inputs(req)."""
+    return hashlib.sha256(canonical_inputs(req).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache of optimizer results with an optional on-disk second level.
+
+    get() and put() copy values, so callers may mutate what they receive.
+    max_entries=0 disables the in-memory layer.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk_dir: str | None = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # Bytes in disk_dir as of the last scan plus this process's writes
+        # since; None until the first scan.
+        self._disk_bytes: int | None = None
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+        elif self.disk_dir:
+            value = self._disk_get(key)
+            if value is not None:
+                self._memory_put(key, value)
+
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        value = copy.deepcopy(value)
+        self._memory_put(key, value)
+        if self.disk_dir:
+            self._disk_put(key, value)
+
+    def clear(self) -> None:
+        """Drop in-memory entries and reset counters. The disk store is kept."""
+        self._memory.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    # ── In-memory LRU ─────────────────────────────────────────────────────────
+
+    def _memory_put(self, key: str, value: dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # ── On-disk store ─────────────────────────────────────────────────────────
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_get(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                value = json.load(fh)
+            os.utime(path)  # mark as recently used for eviction
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, exc)
+            return None
+        return value
+
+    def _disk_put(self, key: str, value: dict[str, Any]) -> None:
+        path = self._path(key)
+        data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        try:
+            try:
+                replaced = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(data) - replaced
+            if self._disk_bytes is None or self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+        except OSError as exc:
+            logger.warning("Could not write cache entry %s: %s", key, exc)
+
+    def _evict_disk(self) -> None:
+        """Rescan disk_dir; if it is over max_disk_bytes, evict LRU files to DISK_LOW_WATER."""
+        entries = []
+        total = 0
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        self._disk_bytes = total
+        if total <= self.max_disk_bytes:
+            return
+
+        target = int(self.max_disk_bytes * DISK_LOW_WATER)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._disk_bytes = total
+        logger.debug("Disk cache evicted down to %d bytes", total)
+
+
+class ProposalStore:
+    """
+    Last torque_delta_nm proposed per vehicle_id, bounded LRU.
+
+    get() and put() copy values. max_entries=0 disables the store. disk_dir,
+    if set, persists entries (one file per vehicle, bounded by max_disk_bytes)
+    so later processes find them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk_dir: str | None = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        self.max_entries = max_entries
+        self._cache = ResultCache(max_entries, disk_dir, max_disk_bytes)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def _key(vehicle_id: str) -> str:
+        return hashlib.sha256(vehicle_id.encode("utf-8")).hexdigest()
+
+    def get(self, vehicle_id: str) -> list[float] | None:
+        if self.max_entries <= 0:
+            return None
+        entry = self._cache.get(self._key(vehicle_id))
+        return entry["torque_delta_nm"] if entry is not None else None
+
+    def put(self, vehicle_id: str, torque_delta_nm: list[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._cache.put(self._key(vehicle_id), {"torque_delta_nm": list(torque_delta_nm)})
+
+    def clear(self) -> None:
+        """Drop in-memory entries. The disk store is kept."""
+        self._cache.clear()
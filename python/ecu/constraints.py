@@ -0,0 +1,134 @@
+"""
+ecu/constraints.py
+
+Compiled constraint set shared by the optimizer and the validator.
+
+A request's constraints dict is parsed once, together with the baseline curve,
+into a ConstraintSet holding everything the hot loops need:
+  - scalar limits (absolute/ratio bin caps, peak-gain cap, smoothness),
+  - per-bin delta ceilings and the baseline peak,
+  - calibration ranges, both as validated and as sampled by the optimizer,
+  - an analytic upper bound on the achievable score.
+
+run_optimization and validate_proposal accept either a raw constraints dict
+(compiled on entry) or a ConstraintSet, so per-cycle work is proportional to
+the candidate only — no dict lookups or re-derivation per call.
+"""
+
+import math
+from typing import Any
+
+# Calibration parameters the optimizer proposes, with the range sampled when
+# the request does not constrain them.
+CALIBRATION_DEFAULTS: dict[str, tuple[float, float]] = {
+    "afr_target": (12.5, 13.5),
+    "ign_timing_deg": (0.0, 4.0),
+    "boost_target_psi": (0.0, 14.0),
+}
+
+# Relative shrink applied to fast_cap, large enough that
+# abs(delta) <= fast_cap[i] implies abs(delta) / baseline <= max_bin_delta_ratio
+# despite float rounding in the division.
+_FAST_CAP_SHRINK = 1.0 - 1e-12
+
+
+class ConstraintSet:
+    """
+    Constraints compiled against one baseline curve.
+
+    Attributes mirror the request's constraints dict; limit values are kept
+    exactly as supplied so validator messages are unchanged.
+    """
+
+    __slots__ = (
+        "source",
+        "baseline_torque_nm",
+        "n_bins",
+        "max_bin_delta_nm",
+        "max_bin_delta_ratio",
+        "max_peak_gain_ratio",
+        "max_second_derivative",
+        "calibration_ranges",
+        "calibration_sample_ranges",
+        "per_bin_limit",
+        "min_bin_limit",
+        "fast_cap",
+        "baseline_peak",
+        "baseline_valid",
+        "score_upper_bound",
+    )
+
+    def __init__(self, constraints: dict[str, Any], baseline_torque_nm: list[float]):
+        self.source = constraints
+        self.baseline_torque_nm = baseline_torque_nm
+        self.n_bins = len(baseline_torque_nm)
+
+        self.max_bin_delta_nm = constraints.get("max_bin_delta_nm", 8.0)
+        self.max_bin_delta_ratio = constraints.get("max_bin_delta_ratio", 0.03)
+        self.max_peak_gain_ratio = constraints.get("max_peak_gain_ratio", 0.02)
+        smoothness_cfg: dict = constraints.get("smoothness", {})
+        self.max_second_derivative = smoothness_cfg.get("max_second_derivative", 0.15)
+
+        raw_ranges: dict = constraints.get("calibration_ranges", {})
+        self.calibration_ranges = {
+            param: tuple(bounds) for param, bounds in raw_ranges.items()
+        }
+        sample_ranges: dict[str, tuple[float, float]] = {}
+        for param, fallback in CALIBRATION_DEFAULTS.items():
+            lo, hi = self.calibration_ranges.get(param, fallback)
+            # Ensure lo <= hi (defensive)
+            sample_ranges[param] = (hi, lo) if lo > hi else (lo, hi)
+        self.calibration_sample_ranges = sample_ranges
+
+        # Per-bin ceiling: tightest of absolute and ratio limits
+        self.per_bin_limit = [
+            min(self.max_bin_delta_nm, b * self.max_bin_delta_ratio)
+            for b in baseline_torque_nm
+        ]
+        self.min_bin_limit = min(self.per_bin_limit) if self.per_bin_limit else 0.0
+
+        # fast_cap[i] >= 0 only when the bin's exact checks can be skipped for
+        # abs(delta) <= fast_cap[i]; -1.0 sends every delta to the exact checks
+        # (invalid baseline, NaN or negative limits).
+        self.fast_cap = []
+        self.baseline_valid = True
+        for b, limit in zip(baseline_torque_nm, self.per_bin_limit):
+            if not math.isfinite(b) or b <= 0:
+                self.baseline_valid = False
+                self.fast_cap.append(-1.0)
+                continue
+            cap = limit * _FAST_CAP_SHRINK
+            self.fast_cap.append(cap if cap >= 0.0 else -1.0)
+
+        self.baseline_peak = max(baseline_torque_nm) if baseline_torque_nm else 0.0
+
+        # Score = sum(baseline + delta). Each delta is capped by its bin limit
+        # and by the peak-gain ceiling; smoothness is ignored, so the true
+        # optimum may lie below this bound but never above it.
+        peak_ceiling = self.baseline_peak * (1.0 + self.max_peak_gain_ratio)
+        self.score_upper_bound = sum(baseline_torque_nm) + sum(
+            max(0.0, min(limit, peak_ceiling - b))
+            for b, limit in zip(baseline_torque_nm, self.per_bin_limit)
+        )
+
+    def matches(self, baseline_torque_nm: list[float]) -> bool:
+        """True if this set was compiled for the given baseline curve."""
+        return (
+            self.baseline_torque_nm is baseline_torque_nm
+            or list(self.baseline_torque_nm) == list(baseline_torque_nm)
+        )
+
+
+def compile_constraints(
+    constraints: "dict[str, Any] | ConstraintSet",
+    baseline_torque_nm: list[float],
+) -> ConstraintSet:
+    """
+    Return a ConstraintSet for baseline_torque_nm.
+    An already-compiled set is reused when it was built for the same baseline.
+    """
+    if isinstance(constraints, ConstraintSet):
+        if constraints.matches(baseline_torque_nm):
+            return constraints
+        constraints = constraints.source
+    return ConstraintSet(constraints, baseline_torque_nm)
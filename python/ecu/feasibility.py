@@ -0,0 +1,84 @@
+"""
+ecu/feasibility.py
+
+O(n) feasibility pre-check, run once the constraints are compiled.
+
+Some constraint sets decide the outcome before a single candidate is drawn:
+  - infeasible: even the zero delta fails validate_proposal (a negative
+    limit) or no calibration value fits a range (lo > hi or a NaN bound).
+    No proposal can pass, so the runner rejects the request at once.
+  - zero delta: every profile a sampling strategy draws is (effectively)
+    all zeros, because max_second_derivative is 0 or some bin caps its delta
+    at no more than MIN_BIN_HEADROOM_NM (profile peaks are bounded by the
+    smallest bin cap). The search cannot meaningfully beat its incumbent, so
+    run_optimization skips it and returns the incumbent.
+
+A baseline that already meets the score upper bound needs no pre-check: the
+search's bound exit stops it before the first cycle.
+
+A short-circuited request gets the proposal the full search would have
+returned, without spending cycle_budget. The one exception is a near-zero
+bin cap: there the search could still accept a candidate with deltas of at
+most MIN_BIN_HEADROOM_NM (and its own calibration), while the pre-check
+returns the incumbent.
+"""
+
+from ecu.constraints import CALIBRATION_DEFAULTS, ConstraintSet
+
+FEASIBLE = "feasible"
+ZERO_DELTA = "zero_delta"
+INFEASIBLE = "infeasible"
+
+# Smallest bin cap (Nm) the sampling strategies are run for.
+MIN_BIN_HEADROOM_NM = 1e-6
+
+# Strategies whose candidates come from _draw_gaussian_params.
+_SAMPLING_STRATEGIES = ("gaussian", "gaussian_numpy", "halton")
+
+
+def analyze_feasibility(
+    cs: ConstraintSet,
+    strategy: str = "gaussian",
+) -> tuple[str, str | None]:
+    """
+    Classify a compiled constraint set.
+
+    Returns (verdict, reason): verdict is FEASIBLE, ZERO_DELTA or INFEASIBLE,
+    and reason is a one-line explanation (None when FEASIBLE).
+    """
+    # ── Infeasible: the zero delta itself fails validation ───────────────────
+    for param in CALIBRATION_DEFAULTS:
+        if param in cs.calibration_ranges:
+            lo, hi = cs.calibration_ranges[param]
+            if not lo <= hi:
+                return INFEASIBLE, (
+                    f"calibration_ranges.{param} [{lo}, {hi}] is empty: "
+                    f"no {param} value can satisfy it"
+                )
+    for name in ("max_bin_delta_nm", "max_bin_delta_ratio", "max_peak_gain_ratio"):
+        limit = getattr(cs, name)
+        if limit < 0:
+            return INFEASIBLE, f"{name}={limit} is negative: even a zero delta violates it"
+    if cs.n_bins >= 3 and cs.max_second_derivative < 0:
+        return INFEASIBLE, (
+            f"max_second_derivative={cs.max_second_derivative} is negative: "
+            f"even a zero delta violates it"
+        )
+
+    # ── Zero delta: nothing the search can draw beats the incumbent ──────────
+    # "lp" solves exactly in a handful of iterations, so it always runs.
+    if strategy in _SAMPLING_STRATEGIES:
+        if cs.max_second_derivative <= 0:
+            return ZERO_DELTA, (
+                f"max_second_derivative={cs.max_second_derivative}: "
+                f"no {strategy} profile can pass the smoothness check"
+            )
+        if cs.min_bin_limit <= MIN_BIN_HEADROOM_NM:
+            bin_index = cs.per_bin_limit.index(cs.min_bin_limit)
+            return ZERO_DELTA, (
+                f"bin {bin_index} caps its delta at {cs.min_bin_limit:.3g} Nm: "
+                f"{strategy} profiles are bounded by it and cannot raise any bin"
+            )
+
+    return FEASIBLE, None
+
@@ -0,0 +1,390 @@
+"""
+ecu/lp_solver.py
+
+Exact torque-delta solver for run_optimization (strategy "lp").
+
+The score (sum of proposed torque) and every hard constraint in
+validate_proposal are linear in the deltas d:
+  - per-bin caps : -cap_i <= d_i <= cap_i,
+                   cap_i = min(max_bin_delta_nm, baseline_i * max_bin_delta_ratio)
+  - peak-gain cap: baseline_i + d_i <= peak * (1 + max_peak_gain_ratio)
+  - smoothness   : |d_{i-1} - 2 d_i + d_{i+1}| <= max_second_derivative
+
+so the best proposal is the optimum of a small linear program:
+    maximize sum(d)  s.t.  l <= d <= u,  -s <= D2 d <= s
+
+It is solved with a Mehrotra predictor-corrector primal-dual interior-point
+method. The normal equations G^T W G have a pentadiagonal matrix (diagonal box
+terms plus D2^T W D2), so each iteration is an O(n) banded LDL^T solve.
+
+Properties:
+  - Deterministic: no randomness; the same inputs give the same iterates.
+  - Always feasible: the primal iterate starts at d = 0 and stays strictly
+    inside a slightly tightened feasible set (SAFETY_MARGIN), so float
+    rounding in validate_proposal cannot reject it. Stopping after any
+    iteration yields a valid proposal.
+  - Boundary starts: a bin whose interval does not strictly contain 0 (a cap
+    of 0, or the peak bin when max_peak_gain_ratio is 0) is pinned at 0 and
+    the rest are solved around it. max_second_derivative = 0 turns the
+    smoothness rows into equalities, so d must be affine; solve_affine
+    handles that case directly.
+  - Converges to the true optimum up to GAP_TOL plus the safety margin
+    (well under 1e-4 Nm of total torque), typically in 5–15 iterations
+    regardless of curve length.
+"""
+
+import math
+
+from ecu.constraints import ConstraintSet
+
+# Relative tightening of every bound, so strict-interior iterates survive the
+# validator's float arithmetic (ratio division, peak-gain ratio).
+SAFETY_MARGIN = 1e-9
+
+# Converged once the complementarity gap (a bound on sum(d*) - sum(d) when
+# the dual is feasible) is below this many Nm.
+GAP_TOL = 1e-6
+
+# Dual residual tolerance for convergence.
+DUAL_TOL = 1e-9
+
+# Fraction of the distance to the boundary taken per step.
+STEP_FRACTION = 0.99
+
+# Pinned bins (see InteriorPointSolver) are boxed to [-w, w] with
+# w = PIN_FRACTION * smoothness while solving, then snapped back to 0.
+PIN_FRACTION = 1e-6
+
+# solve_affine rounds its result to a power-of-two grid this many bits below
+# the largest term, so every delta and second difference is exact in float.
+AFFINE_GRID_BITS = 48
+
+# Relative floor for LDL^T pivots; the normal equations become badly
+# conditioned near the optimum.
+PIVOT_FLOOR = 1e-14
+
+
+def lp_bounds(cs: ConstraintSet) -> tuple[list[float], list[float], float]:
+    """
+    Return (lower, upper, smoothness) for the tightened LP.
+    lower/upper are per-bin delta bounds; smoothness bounds |D2 d|.
+    """
+    peak = cs.baseline_peak
+    margin = SAFETY_MARGIN * max(abs(peak), 1.0)
+    keep = 1.0 - SAFETY_MARGIN
+    peak_headroom = peak * cs.max_peak_gain_ratio
+
+    lower: list[float] = []
+    upper: list[float] = []
+    for b, limit in zip(cs.baseline_torque_nm, cs.per_bin_limit):
+        cap = limit * keep
+        headroom = (peak_headroom + (peak - b)) * keep - margin
+        lower.append(-cap)
+        upper.append(min(cap, headroom))
+    return lower, upper, cs.max_second_derivative * keep
+
+
+def solve_affine(lower: list[float], upper: list[float]) -> list[float]:
+    """
+    Solve the LP when the smoothness bound is 0.
+
+    D2 d = 0 forces d_i = a + b*i, so only two unknowns remain: one with a
+    pinned bin (d = 0 there), none with two or more. Free bins bound (a, b)
+    linearly. The best slope maximizes the concave envelope
+    min_i(upper_i - b*t_i) (t_i centered), clamped to the slopes where that
+    envelope stays above max_i(lower_i - b*t_i).
+    """
+    n = len(lower)
+    free = [lo < 0.0 < hi for lo, hi in zip(lower, upper)]
+    pinned = [i for i in range(n) if not free[i]]
+    if len(pinned) >= 2 or not any(free):
+        return [0.0] * n
+
+    if pinned:
+        # d_i = b * (i - k): each free bin bounds b on one side.
+        k = pinned[0]
+        b_lo, b_hi = -math.inf, math.inf
+        for i in range(n):
+            if i == k:
+                continue
+            t = i - k
+            lo, hi = (lower[i] / t, upper[i] / t) if t > 0 else (upper[i] / t, lower[i] / t)
+            b_lo, b_hi = max(b_lo, lo), min(b_hi, hi)
+        slope = sum(i - k for i in range(n))
+        b = b_hi if slope > 0 else b_lo if slope < 0 else 0.0
+        return _affine(0.0, b, n, origin=k)
+
+    center = (n - 1) / 2
+
+    def top(b: float) -> float:
+        return min(hi - b * (i - center) for i, hi in enumerate(upper))
+
+    def room(b: float) -> float:
+        return top(b) - max(lo - b * (i - center) for i, lo in enumerate(lower))
+
+    # Any feasible slope satisfies |b| * (n - 1) <= max(upper) - min(lower).
+    bound = (max(upper) - min(lower)) / max(n - 1, 1)
+    left, right = -bound, bound
+    for _ in range(100):
+        m1 = left + (right - left) / 3
+        m2 = right - (right - left) / 3
+        if top(m1) < top(m2):
+            left = m1
+        else:
+            right = m2
+    b = (left + right) / 2
+    if room(b) < 0.0:
+        # top is concave with its maximum at b, so the best feasible slope
+        # is the end of the feasible interval (around 0) nearest to b.
+        inside, outside = 0.0, b
+        for _ in range(100):
+            mid = (inside + outside) / 2
+            if room(mid) >= 0.0:
+                inside = mid
+            else:
+                outside = mid
+        b = inside
+    return _affine(top(b) - b * center, b, n)
+
+
+def _affine(a: float, b: float, n: int, origin: int = 0) -> list[float]:
+    """[a + b*(i - origin) for i in range(n)], with a and b truncated to an exact grid."""
+    scale = max(abs(a), abs(b) * n)
+    if not 0.0 < scale < math.inf:
+        return [0.0] * n
+    q = 2.0 ** (math.frexp(scale)[1] - AFFINE_GRID_BITS)
+    a = math.trunc(a / q) * q
+    b = math.trunc(b / q) * q
+    return [a + b * (i - origin) for i in range(n)]
+
+
+def _second_diff(d: list[float]) -> list[float]:
+    return [d[i] - 2 * d[i + 1] + d[i + 2] for i in range(len(d) - 2)]
+
+
+def _second_diff_transpose(v: list[float], n: int) -> list[float]:
+    """D2^T v for v of length n - 2."""
+    out = [0.0] * n
+    for j, x in enumerate(v):
+        out[j] += x
+        out[j + 1] -= 2 * x
+        out[j + 2] += x
+    return out
+
+
+def _factor_pentadiagonal(
+    diag: list[float],
+    off1: list[float],
+    off2: list[float],
+) -> tuple[list[float], list[float], list[float]]:
+    """
+    LDL^T factorization of a symmetric positive-definite pentadiagonal matrix
+    (H[i][i] = diag[i], H[i][i+1] = off1[i], H[i][i+2] = off2[i]).
+    Returns (pivots, L[i][i-1], L[i][i-2]).
+    """
+    n = len(diag)
+    piv = [0.0] * n
+    l1 = [0.0] * n
+    l2 = [0.0] * n
+    for i in range(n):
+        h = diag[i]
+        if i >= 2:
+            l2[i] = off2[i - 2] / piv[i - 2]
+            h -= l2[i] * l2[i] * piv[i - 2]
+        if i >= 1:
+            v = off1[i - 1]
+            if i >= 2:
+                v -= l2[i] * piv[i - 2] * l1[i - 1]
+            l1[i] = v / piv[i - 1]
+            h -= l1[i] * l1[i] * piv[i - 1]
+        piv[i] = max(h, PIVOT_FLOOR * diag[i])
+    return piv, l1, l2
+
+
+def _solve_factored(
+    factors: tuple[list[float], list[float], list[float]],
+    rhs: list[float],
+) -> list[float]:
+    piv, l1, l2 = factors
+    n = len(piv)
+    z = [0.0] * n
+    for i in range(n):
+        v = rhs[i]
+        if i >= 1:
+            v -= l1[i] * z[i - 1]
+        if i >= 2:
+            v -= l2[i] * z[i - 2]
+        z[i] = v
+    x = [0.0] * n
+    for i in range(n - 1, -1, -1):
+        v = z[i] / piv[i]
+        if i + 1 < n:
+            v -= l1[i + 1] * x[i + 1]
+        if i + 2 < n:
+            v -= l2[i + 2] * x[i + 2]
+        x[i] = v
+    return x
+
+
+def _max_step(values: list[float], steps: list[float]) -> float:
+    """Largest alpha <= 1 with values + alpha*steps >= 0."""
+    alpha = 1.0
+    for v, dv in zip(values, steps):
+        if dv < 0.0:
+            alpha = min(alpha, -v / dv)
+    return alpha
+
+
+class InteriorPointSolver:
+    """
+    Primal-dual interior-point solver for the torque-delta LP.
+
+    Inequalities G d <= h are stacked as four blocks of slacks:
+    upper bounds, lower bounds, +smoothness and -smoothness.
+
+    Call step() until done; d is always strictly feasible, so the caller may
+    stop after any iteration (cycle budget, deadline).
+
+    Bins where d = 0 is not strictly inside [lower, upper] are pinned: they
+    are boxed to [-w, w] while solving and d reports them as 0. Snapping
+    moves a second difference by at most 4w, so smooth is tightened by that
+    much. smooth must be positive; see solve_affine otherwise.
+    """
+
+    def __init__(
+        self,
+        lower: list[float],
+        upper: list[float],
+        smooth: float,
+    ):
+        if not smooth > 0.0:
+            raise ValueError(f"smoothness bound must be positive, got {smooth!r}")
+        self.pinned = [not lo < 0.0 < hi for lo, hi in zip(lower, upper)]
+        if any(self.pinned):
+            width = PIN_FRACTION * smooth
+            lower = [-width if p else lo for p, lo in zip(self.pinned, lower)]
+            upper = [width if p else hi for p, hi in zip(self.pinned, upper)]
+            smooth -= 4 * width
+        self.lower = lower
+        self.upper = upper
+        self.smooth = smooth
+        self.n = len(lower)
+        self.x = [0.0] * self.n
+        self.slack = self._slacks(self.x)
+        # Start centered (s * z = 1) so the first gap equals the number of rows.
+        self.dual = [1.0 / s for s in self.slack]
+        self.done = not self.slack or all(self.pinned)
+        self.iterations = 0
+
+    @property
+    def d(self) -> list[float]:
+        """The current iterate with pinned bins at 0: a valid proposal."""
+        return [0.0 if p else x for p, x in zip(self.pinned, self.x)]
+
+    @property
+    def gap(self) -> float:
+        return sum(s * z for s, z in zip(self.slack, self.dual))
+
+    def _slacks(self, d: list[float]) -> list[float]:
+        second = _second_diff(d)
+        return (
+            [hi - x for x, hi in zip(d, self.upper)]
+            + [x - lo for x, lo in zip(d, self.lower)]
+            + [self.smooth - q for q in second]
+            + [self.smooth + q for q in second]
+        )
+
+    def _split(self, v: list[float]) -> tuple[list[float], ...]:
+        n, m = self.n, max(self.n - 2, 0)
+        return v[:n], v[n:2 * n], v[2 * n:2 * n + m], v[2 * n + m:]
+
+    def _g_transpose(self, v: list[float]) -> list[float]:
+        up, lo, sp, sn = self._split(v)
+        smooth_part = _second_diff_transpose([a - b for a, b in zip(sp, sn)], self.n)
+        return [a - b + c for a, b, c in zip(up, lo, smooth_part)]
+
+    def _g(self, dx: list[float]) -> list[float]:
+        second = _second_diff(dx)
+        return dx + [-x for x in dx] + second + [-q for q in second]
+
+    def _dual_residual(self) -> list[float]:
+        # Objective: minimize -sum(d)  =>  c = -1.
+        return [g - 1.0 for g in self._g_transpose(self.dual)]
+
+    def _direction(
+        self,
+        factors: tuple[list[float], list[float], list[float]],
+        r_dual: list[float],
+        r_cent: list[float],
+    ) -> tuple[list[float], list[float], list[float]]:
+        """Solve the reduced Newton system (the primal residual is zero)."""
+        s, z = self.slack, self.dual
+        rhs_rows = [-rc / si for rc, si in zip(r_cent, s)]
+        rhs = [-rd - g for rd, g in zip(r_dual, self._g_transpose(rhs_rows))]
+        dx = _solve_factored(factors, rhs)
+        ds = [-x for x in self._g(dx)]
+        dz = [(-rc - zi * dsi) / si for rc, zi, dsi, si in zip(r_cent, z, ds, s)]
+        return dx, ds, dz
+
+    def step(self) -> None:
+        """One predictor-corrector iteration."""
+        if self.done:
+            return
+        n = self.n
+        s, z = self.slack, self.dual
+        m = len(s)
+
+        # Normal equations G^T W G with W = z / s.
+        w = [zi / si for zi, si in zip(z, s)]
+        w_up, w_lo, w_sp, w_sn = self._split(w)
+        diag = [a + b for a, b in zip(w_up, w_lo)]
+        off1 = [0.0] * n
+        off2 = [0.0] * n
+        for j, (a, b) in enumerate(zip(w_sp, w_sn)):
+            ws = a + b
+            # D2 row j touches bins j, j+1, j+2 with coefficients (1, -2, 1).
+            diag[j] += ws
+            diag[j + 1] += 4 * ws
+            diag[j + 2] += ws
+            off1[j] -= 2 * ws
+            off1[j + 1] -= 2 * ws
+            off2[j] += ws
+        factors = _factor_pentadiagonal(diag, off1, off2)
+
+        r_dual = self._dual_residual()
+        mu = self.gap / m
+
+        # Predictor (affine scaling) direction.
+        r_cent = [si * zi for si, zi in zip(s, z)]
+        dx, ds, dz = self._direction(factors, r_dual, r_cent)
+        alpha_p = _max_step(s, ds)
+        alpha_d = _max_step(z, dz)
+        mu_aff = sum(
+            (si + alpha_p * dsi) * (zi + alpha_d * dzi)
+            for si, dsi, zi, dzi in zip(s, ds, z, dz)
+        ) / m
+        sigma = (mu_aff / mu) ** 3
+
+        # Corrector: centering plus the second-order term.
+        r_cent = [
+            si * zi + dsi * dzi - sigma * mu
+            for si, zi, dsi, dzi in zip(s, z, ds, dz)
+        ]
+        dx, ds, dz = self._direction(factors, r_dual, r_cent)
+        alpha_p = min(1.0, STEP_FRACTION * _max_step(s, ds))
+        alpha_d = min(1.0, STEP_FRACTION * _max_step(z, dz))
+
+        # Slacks are recomputed from d, so feasibility never drifts.
+        while True:
+            d_new = [x + alpha_p * dxi for x, dxi in zip(self.x, dx)]
+            s_new = self._slacks(d_new)
+            if all(si > 0.0 for si in s_new):
+                break
+            alpha_p *= 0.5
+        self.x = d_new
+        self.slack = s_new
+        self.dual = [zi + alpha_d * dzi for zi, dzi in zip(z, dz)]
+        self.iterations += 1
+
+        if self.gap <= GAP_TOL and max(abs(r) for r in self._dual_residual()) <= DUAL_TOL:
+            self.done = True
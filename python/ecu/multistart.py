@@ -0,0 +1,176 @@
+"""
+ecu/multistart.py
+
+Sharded multi-start search for run_optimization (shards > 1).
+
+The cycle budget is split into a fixed number of shards. Each shard is an
+independent run_optimization call with its own slice of the budget and a
+child seed derived from the request seed, so shards explore different
+candidates. Shards may run in a ProcessPoolExecutor; one pool is created
+on first use, grown if a later call asks for more workers, and reused by
+every call until the interpreter exits.
+
+Determinism: the decomposition depends only on (seed, cycle_budget, shards),
+never on the worker count, and results are merged in shard order with a
+fixed tie-break (highest score, then lowest shard index). The merged result
+is therefore bit-identical for any number of workers, including 1.
+
+Deadline: deadline_ms covers the whole sharded search, not each shard. It is
+turned into one absolute time.monotonic() deadline when run_sharded starts,
+and each shard gets only the time left when it begins. On one worker the
+shards run one after another and share the budget; in a pool, queued shards
+start with whatever remains. (time.monotonic() is system-wide, so the
+deadline means the same thing in worker processes.)
+"""
+
+import atexit
+import hashlib
+import logging
+import time
+from typing import Any
+
+from ecu.constraints import ConstraintSet
+
+logger = logging.getLogger(__name__)
+
+# Shared worker pool; see _get_pool().
+_pool = None
+_pool_workers = 0
+
+
+def child_seed(seed: int, index: int) -> int:
+    """Deterministic 63-bit seed for shard index, independent of platform and process."""
+    digest = hashlib.sha256(f"ecu-shard:{seed}:{index}".encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "big") >> 1
+
+
+def shard_budgets(cycle_budget: int, shards: int) -> list[int]:
+    """Split cycle_budget into at most `shards` non-empty, near-equal parts."""
+    shards = max(1, min(shards, cycle_budget))
+    base, extra = divmod(cycle_budget, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+def _run_shard(kwargs: dict[str, Any]) -> dict[str, Any]:
+    # Module-level so ProcessPoolExecutor can pickle it.
+    from ecu.optimizer import run_optimization
+
+    kwargs = dict(kwargs)
+    deadline_at = kwargs.pop("deadline_at", None)
+    if deadline_at is not None:
+        kwargs["deadline_ms"] = max((deadline_at - time.monotonic()) * 1000.0, 0.0)
+    return run_optimization(**kwargs)
+
+
+def _get_pool(workers: int):
+    """Return the shared process pool, with at least `workers` workers."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers < workers:
+        from concurrent.futures import ProcessPoolExecutor  # lazy: only for workers > 1
+
+        if _pool is None:
+            atexit.register(shutdown_pool)
+        else:
+            _pool.shutdown(wait=True)
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Shut down the shared pool, if any. The next sharded call starts a new one."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        atexit.unregister(shutdown_pool)
+        _pool.shutdown(wait=True)
+        _pool, _pool_workers = None, 0
+
+
+def _shard_score(result: dict[str, Any], baseline_torque_nm: list[float]) -> float:
+    """Exact score of a shard result (best_score is rounded)."""
+    return sum(b + d for b, d in zip(baseline_torque_nm, result["torque_delta_nm"]))
+
+
+def _merge_stats(per_shard: list[dict[str, Any]]) -> dict[str, Any]:
+    merged = {"candidates": 0, "rejected": {}, "improvements": 0}
+    for stats in per_shard:
+        merged["candidates"] += stats["candidates"]
+        merged["improvements"] += stats["improvements"]
+        for code, count in stats["rejected"].items():
+            merged["rejected"][code] = merged["rejected"].get(code, 0) + count
+    return merged
+
+
+def run_sharded(
+    baseline_torque_nm: list[float],
+    rpm_bins: list[int],
+    constraints: "dict[str, Any] | ConstraintSet",
+    cycle_budget: int,
+    seed: int,
+    shards: int,
+    workers: int = 1,
+    **options: Any,
+) -> dict[str, Any]:
+    """
+    Run one search per shard and merge them.
+
+    options are forwarded to every shard's run_optimization call (strategy,
+    patience, warm_start, rng_mode, collect_stats). deadline_ms bounds the
+    whole call: each shard gets the time remaining when it starts. workers > 1
+    runs shards in a process pool; without a deadline the result does not
+    depend on it.
+
+    Returns run_optimization's dict, taken from the winning shard, with
+    cycles_used summed over all shards, stopped_early set if any shard hit
+    the deadline, "shards" giving the number of shards run and, with
+    collect_stats, search_stats summed over all shards.
+    """
+    deadline_ms = options.pop("deadline_ms", None)
+    if deadline_ms is not None:
+        options["deadline_at"] = time.monotonic() + deadline_ms / 1000.0
+
+    budgets = shard_budgets(cycle_budget, shards)
+    jobs = [
+        dict(
+            baseline_torque_nm=baseline_torque_nm,
+            rpm_bins=rpm_bins,
+            constraints=constraints,
+            cycle_budget=budget,
+            seed=child_seed(seed, index),
+            **options,
+        )
+        for index, budget in enumerate(budgets)
+    ]
+
+    workers = max(1, min(workers, len(jobs)))
+    if workers == 1:
+        results = [_run_shard(job) for job in jobs]
+    else:
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            # map() yields in submission order, whatever order workers finish in.
+            results = list(_get_pool(workers).map(_run_shard, jobs))
+        except BrokenProcessPool:
+            shutdown_pool()  # a worker died; start afresh next time
+            raise
+
+    # Highest exact score wins; ties go to the lowest shard index.
+    winner_index = 0
+    winner_score = _shard_score(results[0], baseline_torque_nm)
+    for index in range(1, len(results)):
+        score = _shard_score(results[index], baseline_torque_nm)
+        if score > winner_score:
+            winner_index, winner_score = index, score
+
+    merged = dict(results[winner_index])
+    merged["cycles_used"] = sum(r["cycles_used"] for r in results)
+    merged["stopped_early"] = any(r["stopped_early"] for r in results)
+    merged["shards"] = len(results)
+    if "search_stats" in merged:
+        merged["search_stats"] = _merge_stats([r["search_stats"] for r in results])
+    logger.info(
+        "Sharded search: %d shard(s) on %d worker(s), winner shard %d",
+        len(results), workers, winner_index,
+    )
+    return merged
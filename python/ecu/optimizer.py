@@ -9,6 +9,21 @@ Strategy:
   - Gaussian sigma is computed to guarantee the smoothness constraint is met.
   - Score = sum of proposed torque (higher is better), subject to all constraints.
   - Deterministic: identical seed + inputs → identical output.
+  - Anytime: an optional deadline stops the search early with the best valid
+    proposal so far (see run_optimization).
+  - Early exit: the search stops once it reaches the analytic score bound, or
+    optionally after a patience window without improvement. Both depend only
+    on cycle counts, so they are as deterministic as the search itself.
+    Constraint sets that rule out any improvement up front skip the search
+    entirely (ecu/feasibility.py).
+  - Alternative strategies: a NumPy engine for the same search
+    (ecu/vectorized.py), quasi-random Halton candidates (ecu/sampling.py)
+    and an exact LP solve (ecu/lp_solver.py).
+  - Counter-based RNG (ecu/rng.py, rng_mode="counter"): each cycle's draws are
+    addressed by cycle number instead of consumed from one stream, so blocks
+    of cycles can be generated in any order or all at once.
+  - Multi-start: the budget can be split into shards searched in parallel
+    processes (ecu/multistart.py), bit-identical for any worker count.
 
 Why Gaussian profiles?
   The smoothness constraint (max_second_derivative on the delta curve) requires
@@ -22,9 +37,21 @@ Why Gaussian profiles?
 import math
 import random
 import logging
+import time
 from typing import Any
 
-from ecu.validator import validate_proposal, ValidationError
+from ecu.constraints import ConstraintSet, compile_constraints
+from ecu.feasibility import analyze_feasibility
+from ecu.validator import (
+    ValidationError,
+    check_proposal,
+    describe_violation,
+    proposal_warnings,
+    validate_proposal,
+)
+from ecu.lp_solver import InteriorPointSolver, lp_bounds, solve_affine
+from ecu.rng import CounterRNG
+from ecu.sampling import ScrambledHalton
 
 logger = logging.getLogger(__name__)
 
@@ -38,42 +65,32 @@ def _clamp(value: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, value))
 
 
-def _gaussian_delta_profile(
+def _draw_gaussian_params(
     rng: random.Random,
-    baseline_torque_nm: list[float],
-    constraints: dict[str, Any],
-    scale: float = 1.0,
-) -> list[float]:
+    cs: ConstraintSet,
+    scale: float,
+) -> tuple[float, float, float] | None:
     """
-    Generate a smooth Gaussian-shaped delta profile within all constraint bounds.
-
-    The Gaussian shape guarantees the smoothness constraint is satisfied:
-        sigma >= sqrt(peak_amplitude / max_second_derivative)
+    Draw (peak, sigma, center) for one Gaussian profile.
+    Returns None when the profile is all zeros (no further draws are made).
 
-    scale: exploration scale factor (0.0–1.0). Lower = more conservative peak.
+    Every search backend must consume the RNG through this function so that
+    the same seed yields the same candidate parameters. rng may also be a
+    sampling.PointSource, which supplies the three draws from one
+    quasi-random point.
     """
-    n = len(baseline_torque_nm)
-
-    max_bin_delta_nm: float = constraints.get("max_bin_delta_nm", 8.0)
-    max_bin_delta_ratio: float = constraints.get("max_bin_delta_ratio", 0.03)
-    smoothness_cfg: dict = constraints.get("smoothness", {})
-    max_second_deriv: float = smoothness_cfg.get("max_second_derivative", 0.15)
-
-    # Per-bin ceiling: tightest of absolute and ratio limits
-    per_bin_limit = [
-        min(max_bin_delta_nm, b * max_bin_delta_ratio)
-        for b in baseline_torque_nm
-    ]
-    global_limit = min(per_bin_limit) * scale
+    n = cs.n_bins
+    max_second_deriv = cs.max_second_derivative
+    global_limit = cs.min_bin_limit * scale
 
     if global_limit <= 0.0 or max_second_deriv <= 0.0:
-        return [0.0] * n
+        return None
 
     # Peak amplitude: random within [0, global_limit]
     peak = rng.uniform(0.0, global_limit)
 
     if peak <= 0.0:
-        return [0.0] * n
+        return None
 
     # Sigma must satisfy: peak / sigma^2 <= max_second_deriv
     # => sigma >= sqrt(peak / max_second_deriv)
@@ -87,6 +104,30 @@ def _gaussian_delta_profile(
     # Center of the Gaussian (can be anywhere along the bins)
     center = rng.uniform(0.0, float(n - 1))
 
+    return peak, sigma, center
+
+
+def _gaussian_delta_profile(
+    rng: random.Random,
+    cs: ConstraintSet,
+    scale: float = 1.0,
+) -> list[float]:
+    """
+    Generate a smooth Gaussian-shaped delta profile within all constraint bounds.
+
+    The Gaussian shape guarantees the smoothness constraint is satisfied:
+        sigma >= sqrt(peak_amplitude / max_second_derivative)
+
+    scale: exploration scale factor (0.0–1.0). Lower = more conservative peak.
+    """
+    n = cs.n_bins
+    per_bin_limit = cs.per_bin_limit
+
+    params = _draw_gaussian_params(rng, cs, scale)
+    if params is None:
+        return [0.0] * n
+    peak, sigma, center = params
+
     # Generate Gaussian profile, clamped to per-bin limits
     deltas: list[float] = []
     for i in range(n):
@@ -100,83 +141,157 @@ def _gaussian_delta_profile(
 
 def _pick_calibration(
     rng: random.Random,
-    constraints: dict[str, Any],
+    cs: ConstraintSet,
 ) -> dict[str, float]:
     """
     Pick calibration values uniformly within allowed ranges.
     Falls back to a safe midpoint range if a parameter is not in constraints.
     """
-    calibration_ranges: dict = constraints.get("calibration_ranges", {})
-
-    defaults = {
-        "afr_target": [12.5, 13.5],
-        "ign_timing_deg": [0.0, 4.0],
-        "boost_target_psi": [0.0, 14.0],
+    return {
+        param: rng.uniform(lo, hi)
+        for param, (lo, hi) in cs.calibration_sample_ranges.items()
     }
 
-    calibration: dict[str, float] = {}
-    for param, fallback_range in defaults.items():
-        if param in calibration_ranges:
-            lo, hi = calibration_ranges[param]
-        else:
-            lo, hi = fallback_range
-        # Ensure lo <= hi (defensive)
-        if lo > hi:
-            lo, hi = hi, lo
-        calibration[param] = rng.uniform(lo, hi)
 
-    return calibration
+STRATEGIES = ("gaussian", "gaussian_numpy", "halton", "lp")
 
+# (peak, sigma, center): the draws _draw_gaussian_params makes per candidate.
+GAUSSIAN_PARAM_DIMS = 3
 
-def run_optimization(
+RNG_MODES = ("sequential", "counter")
+
+# rng="counter" layout: cycle k reads counter k + 1 (counter 0 is the initial
+# calibration). Profile draws start at index 0 and calibration draws at
+# CALIBRATION_DRAW_OFFSET, so each draw's address is fixed even when the
+# profile makes fewer than GAUSSIAN_PARAM_DIMS draws.
+CALIBRATION_DRAW_OFFSET = 8
+
+DEADLINE_MODES = ("wallclock", "checkpoint")
+
+# In checkpoint mode a deadline stop rounds down to a multiple of this many cycles.
+DEADLINE_CHECKPOINT_CYCLES = 32
+
+# The search stops once best_score is within this many Nm of the score bound.
+BOUND_TOLERANCE_NM = 1e-6
+
+EARLY_EXIT_REASONS = ("bound", "patience", "pre_check")
+
+# patience applied to a warm-started search that sets none: a good incumbent
+# rarely improves, so without it the whole cycle_budget would still run.
+WARM_START_PATIENCE = 64
+
+
+def new_search_stats() -> dict[str, Any]:
+    """
+    Empty per-search counters: candidates generated, candidates rejected per
+    validator code (ecu/validator.py VIOLATION_CODES) and improvements of
+    the best score.
+    """
+    return {"candidates": 0, "rejected": {}, "improvements": 0}
+
+
+def _early_exit(
+    best_score: float,
+    bound_stop: float,
+    stale_cycles: int,
+    patience: int | None,
+) -> str | None:
+    """Return the early-exit reason that applies now, if any."""
+    if best_score >= bound_stop:
+        return "bound"
+    if patience is not None and stale_cycles >= patience:
+        return "patience"
+    return None
+
+
+def _search_gaussian(
+    rng: random.Random,
     baseline_torque_nm: list[float],
     rpm_bins: list[int],
-    constraints: dict[str, Any],
+    cs: ConstraintSet,
     cycle_budget: int,
-    seed: int,
+    cycles_to_run: int,
+    deadline: float | None,
+    deadline_mode: str,
+    incumbent: dict[str, Any],
+    sampler: ScrambledHalton | None = None,
+    patience: int | None = None,
+    counter_rng: CounterRNG | None = None,
+    stats: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     """
-    Run a seeded hill-climbing search for the best valid torque delta.
+    Pure-Python Gaussian random search, one candidate per cycle.
 
-    Returns a dict with:
-      - torque_delta_nm: list[float]
-      - calibration: dict[str, float]
-      - confidence: float (0.0–1.0)
-      - estimated_peak_gain_ratio: float
-      - cycles_used: int
-      - best_score: float
-      - warnings: list[str]
-    """
-    rng = random.Random(seed)
+    incumbent holds the starting best ("delta", "calibration", "score",
+    "warnings"). Returns the final best in the same shape plus
+    "cycles_used", "stopped_early" and "early_exit" (None or one of
+    EARLY_EXIT_REASONS).
 
-    n_bins = len(baseline_torque_nm)
-    baseline_peak = max(baseline_torque_nm)
+    With a sampler, cycle k takes its profile parameters from point k of the
+    sequence instead of rng; calibration is still drawn from rng. With
+    counter_rng, cycle k draws from counter k + 1 instead of rng.
 
-    # Start from zero delta (baseline is always valid)
-    best_delta: list[float] = [0.0] * n_bins
-    best_calibration = _pick_calibration(rng, constraints)
-    best_score = _compute_score(baseline_torque_nm)
-    best_warnings: list[str] = []
+    stats, if given, is a new_search_stats() dict that receives the counts.
+    """
+    best_delta = incumbent["delta"]
+    best_calibration = incumbent["calibration"]
+    best_score = incumbent["score"]
+    best_warnings = incumbent["warnings"]
     cycles_used = 0
+    stopped_early = False
+    early_exit = None
+    stale_cycles = 0
+    bound_stop = cs.score_upper_bound - BOUND_TOLERANCE_NM
+    checkpoint = (0, best_delta, best_calibration, best_score, best_warnings)
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    rejected = stats["rejected"] if stats is not None else None
+    generated = improvements = 0
+
+    for cycle in range(cycles_to_run):
+        early_exit = _early_exit(best_score, bound_stop, stale_cycles, patience)
+        if early_exit is not None:
+            logger.info("Early exit (%s) after %d cycles", early_exit, cycles_used)
+            break
+        if deadline is not None:
+            if cycle % DEADLINE_CHECKPOINT_CYCLES == 0:
+                checkpoint = (cycle, best_delta, best_calibration, best_score, best_warnings)
+            if time.monotonic() >= deadline:
+                stopped_early = True
+                if deadline_mode == "checkpoint":
+                    cycles_used, best_delta, best_calibration, best_score, best_warnings = checkpoint
+                logger.info("Deadline reached after %d cycles; stopping early", cycles_used)
+                break
 
-    for cycle in range(cycle_budget):
         cycles_used += 1
+        generated += 1
         # Exploration scale: start broad, tighten toward end (annealing-lite)
         scale = 1.0 - (cycle / max(cycle_budget, 1)) * 0.5  # 1.0 → 0.5
 
-        candidate_delta = _gaussian_delta_profile(rng, baseline_torque_nm, constraints, scale)
-        candidate_calibration = _pick_calibration(rng, constraints)
-
-        try:
-            warnings = validate_proposal(
-                torque_delta_nm=candidate_delta,
-                calibration=candidate_calibration,
-                baseline_torque_nm=baseline_torque_nm,
-                rpm_bins=rpm_bins,
-                constraints=constraints,
-            )
-        except ValidationError as exc:
-            logger.debug("Cycle %d: candidate rejected by validator: %s", cycle, exc)
+        if counter_rng is None:
+            profile_rng = calibration_rng = rng
+        else:
+            profile_rng = counter_rng.stream(cycle + 1)
+            calibration_rng = counter_rng.stream(cycle + 1, CALIBRATION_DRAW_OFFSET)
+        source = profile_rng if sampler is None else sampler.source(cycle)
+        candidate_delta = _gaussian_delta_profile(source, cs, scale)
+        candidate_calibration = _pick_calibration(calibration_rng, cs)
+
+        stale_cycles += 1
+        violation = check_proposal(
+            candidate_delta, candidate_calibration, baseline_torque_nm, rpm_bins, cs
+        )
+        if violation is not None:
+            if rejected is not None:
+                rejected[violation[0]] = rejected.get(violation[0], 0) + 1
+            if debug_enabled:
+                logger.debug(
+                    "Cycle %d: candidate rejected by validator: %s",
+                    cycle,
+                    describe_violation(
+                        violation, candidate_delta, candidate_calibration,
+                        baseline_torque_nm, rpm_bins, cs,
+                    ),
+                )
             continue
 
         proposed = [b + d for b, d in zip(baseline_torque_nm, candidate_delta)]
@@ -186,9 +301,361 @@ def run_optimization(
             best_delta = candidate_delta
             best_calibration = candidate_calibration
             best_score = score
-            best_warnings = warnings
+            best_warnings = proposal_warnings(candidate_delta, baseline_torque_nm, cs)
+            stale_cycles = 0
+            improvements += 1
             logger.debug("Cycle %d: new best score=%.4f", cycle, best_score)
 
+    if stats is not None:
+        stats["candidates"] += generated
+        stats["improvements"] += improvements
+    return {
+        "delta": best_delta,
+        "calibration": best_calibration,
+        "score": best_score,
+        "warnings": best_warnings,
+        "cycles_used": cycles_used,
+        "stopped_early": stopped_early,
+        "early_exit": early_exit,
+    }
+
+
+def _search_lp(
+    baseline_torque_nm: list[float],
+    rpm_bins: list[int],
+    cs: ConstraintSet,
+    cycles_to_run: int,
+    deadline: float | None,
+    deadline_mode: str,
+    incumbent: dict[str, Any],
+    stats: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Exact LP solve (see ecu/lp_solver.py), one interior-point iteration per
+    cycle. Every iterate is feasible, so running out of cycles or hitting the
+    deadline still yields a valid (partially converged) proposal.
+
+    Same in/out shape as _search_gaussian; the calibration is the incumbent's
+    since it does not affect the score. The final iterate is the only
+    candidate counted in stats.
+    """
+    if len(rpm_bins) != len(baseline_torque_nm):
+        logger.info("rpm_bins and baseline lengths differ; keeping the baseline")
+        return {**incumbent, "cycles_used": 0, "stopped_early": False, "early_exit": None}
+
+    lower, upper, smooth = lp_bounds(cs)
+    cycles_used = 0
+    stopped_early = False
+    if smooth <= 0.0:
+        # Smoothness is an equality, so the LP is two-dimensional: one cycle.
+        candidate_delta = solve_affine(lower, upper)
+        cycles_used = 1
+    else:
+        solver = InteriorPointSolver(lower, upper, smooth)
+        checkpoint = (0, solver.d)
+        for cycle in range(cycles_to_run):
+            if solver.done:
+                break
+            if deadline is not None:
+                if cycle % DEADLINE_CHECKPOINT_CYCLES == 0:
+                    checkpoint = (cycle, solver.d)
+                if time.monotonic() >= deadline:
+                    stopped_early = True
+                    logger.info("Deadline reached after %d cycles; stopping early", cycles_used)
+                    break
+            solver.step()
+            cycles_used += 1
+
+        logger.debug(
+            "LP: %d iterations, converged=%s, gap=%.3g", solver.iterations, solver.done, solver.gap
+        )
+        candidate_delta = solver.d
+        if stopped_early and deadline_mode == "checkpoint":
+            cycles_used, candidate_delta = checkpoint
+
+    result = {
+        **incumbent,
+        "cycles_used": cycles_used,
+        "stopped_early": stopped_early,
+        "early_exit": None,
+    }
+    if stats is not None:
+        stats["candidates"] += 1
+    try:
+        warnings = validate_proposal(
+            torque_delta_nm=candidate_delta,
+            calibration=incumbent["calibration"],
+            baseline_torque_nm=baseline_torque_nm,
+            rpm_bins=rpm_bins,
+            constraints=cs,
+        )
+    except ValidationError as exc:
+        logger.warning("LP solution rejected by validator: %s", exc)
+        if stats is not None:
+            stats["rejected"][exc.code] = stats["rejected"].get(exc.code, 0) + 1
+        return result
+
+    score = _compute_score([b + d for b, d in zip(baseline_torque_nm, candidate_delta)])
+    if score > incumbent["score"]:
+        result.update(delta=candidate_delta, score=score, warnings=warnings)
+        if stats is not None:
+            stats["improvements"] += 1
+    return result
+
+
+def _seed_incumbent(
+    incumbent: dict[str, Any],
+    warm_start: list[float],
+    baseline_torque_nm: list[float],
+    rpm_bins: list[int],
+    cs: ConstraintSet,
+    warnings: list[str],
+) -> bool:
+    """
+    Replace the incumbent's delta with warm_start if it is still valid under
+    the current constraints and beats the incumbent. Returns True if it did.
+    """
+    warm_start = [float(d) for d in warm_start]
+    violation = check_proposal(
+        warm_start, incumbent["calibration"], baseline_torque_nm, rpm_bins, cs
+    )
+    if violation is not None:
+        reason = describe_violation(
+            violation, warm_start, incumbent["calibration"],
+            baseline_torque_nm, rpm_bins, cs,
+        )
+        logger.info("Warm start rejected: %s", reason)
+        warnings.append(f"warm_start ignored: {reason}")
+        return False
+
+    score = _compute_score([b + d for b, d in zip(baseline_torque_nm, warm_start)])
+    if score <= incumbent["score"]:
+        return False
+    incumbent.update(
+        delta=warm_start,
+        score=score,
+        warnings=proposal_warnings(warm_start, baseline_torque_nm, cs),
+    )
+    logger.debug("Warm start accepted: score=%.4f", score)
+    return True
+
+
+def run_optimization(
+    baseline_torque_nm: list[float],
+    rpm_bins: list[int],
+    constraints: "dict[str, Any] | ConstraintSet",
+    cycle_budget: int,
+    seed: int,
+    deadline_ms: float | None = None,
+    deadline_mode: str = "wallclock",
+    cycle_limit: int | None = None,
+    strategy: str = "gaussian",
+    patience: int | None = None,
+    warm_start: list[float] | None = None,
+    shards: int | None = None,
+    workers: int = 1,
+    rng_mode: str = "sequential",
+    collect_stats: bool = False,
+) -> dict[str, Any]:
+    """
+    Run a seeded hill-climbing search for the best valid torque delta.
+
+    Strategies:
+      "gaussian"       — pure-Python search, one candidate per cycle (default).
+      "gaussian_numpy" — NumPy engine that builds candidates as a matrix and
+                         screens them with array operations. It draws the same
+                         candidate parameters from the seed, but float results
+                         may differ in the last bits, so it is a separate
+                         strategy ID. Falls back to "gaussian" if NumPy is not
+                         installed.
+      "halton"         — the "gaussian" search with profile parameters taken
+                         from a scrambled Halton sequence seeded by seed
+                         (ecu/sampling.py). Low-discrepancy points cover the
+                         parameter space evenly, so small budgets reach a
+                         given score in fewer cycles.
+      "lp"             — exact linear-programming solve (ecu/lp_solver.py):
+                         the score and all constraints are linear in the
+                         deltas, so the optimum is found directly. Each cycle
+                         is one solver iteration (convergence typically takes
+                         5–15), so cycle_budget acts as a quality cap. The
+                         seed only picks the calibration.
+
+    Anytime behaviour:
+      deadline_ms   : stop once this much wall time has elapsed and return the
+                      best valid proposal found so far.
+      deadline_mode : "wallclock"  — return the incumbent at the moment of the stop.
+                      "checkpoint" — round the stop down to the last multiple of
+                      DEADLINE_CHECKPOINT_CYCLES and return the incumbent as of
+                      that cycle, so the result can be replayed exactly.
+      cycle_limit   : stop after this many cycles without changing the
+                      exploration schedule (which depends on cycle_budget).
+                      Replaying with cycle_limit=cycles_used reproduces a
+                      checkpoint-mode result bit for bit.
+
+    Early exit (sampling strategies; "lp" stops when its solver converges):
+      The score is bounded by sum(baseline) plus each bin's delta cap (the
+      tighter of the bin limit and the peak-gain ceiling); the search stops
+      once it is within BOUND_TOLERANCE_NM of that bound.
+      patience      : also stop after this many consecutive cycles without
+                      a new best. Off by default, except that a warm-started
+                      search uses WARM_START_PATIENCE.
+      Both rules depend only on cycle counts, so a given seed always stops at
+      the same cycle; cycles_used reports the cycles actually run.
+
+    Warm start:
+      warm_start    : torque deltas of an earlier proposal (e.g. the one last
+                      applied to this vehicle). It is re-checked against the
+                      current constraints; if it passes and beats the
+                      baseline it becomes the starting incumbent, otherwise it
+                      is ignored with a warning. Every strategy only replaces
+                      the incumbent with something strictly better.
+
+    Random numbers:
+      rng_mode      : "sequential" (default) — one random.Random(seed) stream.
+                      "counter" — ecu/rng.py: draw j of cycle k is a pure
+                      function of (seed, k, j). Gives different candidates
+                      than "sequential" for the same seed, but lets
+                      gaussian_numpy generate whole blocks without a
+                      per-cycle Python loop.
+
+    Diagnostics:
+      collect_stats : add "search_stats" (new_search_stats() counters) to the
+                      result. Off by default; the counters never change the
+                      search.
+
+    Multi-start (sampling strategies; "lp" ignores it):
+      shards        : split cycle_budget into this many independent searches,
+                      each with a child seed derived from seed
+                      (ecu/multistart.py). The best shard wins; ties go to the
+                      lowest shard index. None or 1 runs a single search.
+      workers       : processes to run shards on. The result is bit-identical
+                      for any value, so this is purely a deployment choice.
+      Not combinable with cycle_limit or deadline_mode="checkpoint", whose
+      replay guarantees assume a single search.
+
+    Returns a dict with:
+      - torque_delta_nm: list[float]
+      - calibration: dict[str, float]
+      - confidence: float (0.0–1.0)
+      - estimated_peak_gain_ratio: float
+      - cycles_used: int
+      - best_score: float
+      - warnings: list[str]
+      - stopped_early: bool (deadline reached before the budget was spent)
+      - early_exit: None, "bound", "patience" or "pre_check" (the
+        feasibility pre-check showed no candidate can beat the incumbent,
+        so no cycles ran)
+      - pre_check: str or None (the pre-check's reason)
+      - warm_started: bool (the warm_start delta seeded the search)
+      - bound_gap: float (score upper bound minus best_score, >= 0)
+      - strategy: str (the strategy that actually ran)
+      - shards: int (only when the search was sharded)
+      - search_stats: dict (only with collect_stats; summed over shards)
+    """
+    if deadline_mode not in DEADLINE_MODES:
+        raise ValueError(f"deadline_mode must be one of {DEADLINE_MODES}, got {deadline_mode!r}")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r}")
+    if patience is not None and patience < 1:
+        raise ValueError(f"patience must be a positive integer, got {patience!r}")
+    if rng_mode not in RNG_MODES:
+        raise ValueError(f"rng_mode must be one of {RNG_MODES}, got {rng_mode!r}")
+    if shards is not None and shards < 1:
+        raise ValueError(f"shards must be a positive integer, got {shards!r}")
+
+    if shards is not None and shards > 1 and strategy != "lp":
+        if cycle_limit is not None or deadline_mode != "wallclock":
+            raise ValueError(
+                "shards cannot be combined with cycle_limit or checkpoint deadlines"
+            )
+        from ecu.multistart import run_sharded  # lazy: pulls in concurrent.futures
+
+        return run_sharded(
+            baseline_torque_nm, rpm_bins, constraints, cycle_budget, seed, shards,
+            workers,
+            deadline_ms=deadline_ms,
+            strategy=strategy,
+            patience=patience,
+            warm_start=warm_start,
+            rng_mode=rng_mode,
+            collect_stats=collect_stats,
+        )
+
+    deadline = (
+        time.monotonic() + deadline_ms / 1000.0 if deadline_ms is not None else None
+    )
+    cycles_to_run = cycle_budget if cycle_limit is None else min(cycle_budget, cycle_limit)
+
+    strategy_warnings: list[str] = []
+    if strategy == "gaussian_numpy":
+        from ecu import vectorized  # lazy: NumPy is optional and slow to import
+
+        if not vectorized.NUMPY_AVAILABLE:
+            logger.warning("NumPy is not installed; falling back to strategy 'gaussian'")
+            strategy_warnings.append(
+                "strategy gaussian_numpy unavailable (NumPy not installed); used gaussian"
+            )
+            strategy = "gaussian"
+
+    cs = compile_constraints(constraints, baseline_torque_nm)
+    counter_rng = CounterRNG(seed) if rng_mode == "counter" else None
+    rng = random.Random(seed) if counter_rng is None else counter_rng.stream(0)
+
+    n_bins = len(baseline_torque_nm)
+    baseline_peak = cs.baseline_peak
+
+    # Start from zero delta (baseline is always valid)
+    incumbent = {
+        "delta": [0.0] * n_bins,
+        "calibration": _pick_calibration(rng, cs),
+        "score": _compute_score(baseline_torque_nm),
+        "warnings": [],
+    }
+    warm_started = False
+    if warm_start is not None:
+        warm_started = _seed_incumbent(
+            incumbent, warm_start, baseline_torque_nm, rpm_bins, cs, strategy_warnings
+        )
+    if warm_started and patience is None:
+        patience = WARM_START_PATIENCE
+
+    stats = new_search_stats() if collect_stats else None
+    verdict, pre_check = analyze_feasibility(cs, strategy)
+    if incumbent["score"] >= cs.score_upper_bound - BOUND_TOLERANCE_NM:
+        pre_check = None  # the search's bound exit stops it before any cycle
+    if pre_check is not None:
+        # Every candidate would be rejected or tie the incumbent, so the full
+        # search would return the incumbent unchanged.
+        logger.info("Feasibility pre-check (%s): %s; skipping the search", verdict, pre_check)
+        search = {**incumbent, "cycles_used": 0, "stopped_early": False, "early_exit": "pre_check"}
+    elif strategy == "lp":
+        search = _search_lp(
+            baseline_torque_nm, rpm_bins, cs,
+            cycles_to_run, deadline, deadline_mode, incumbent, stats,
+        )
+    elif strategy == "gaussian_numpy":
+        search = vectorized.search_gaussian(
+            rng, baseline_torque_nm, rpm_bins, cs,
+            cycle_budget, cycles_to_run, deadline, incumbent, patience,
+            counter_rng, stats,
+        )
+    else:
+        sampler = (
+            ScrambledHalton(GAUSSIAN_PARAM_DIMS, seed) if strategy == "halton" else None
+        )
+        search = _search_gaussian(
+            rng, baseline_torque_nm, rpm_bins, cs,
+            cycle_budget, cycles_to_run, deadline, deadline_mode, incumbent,
+            sampler, patience, counter_rng, stats,
+        )
+
+    best_delta: list[float] = search["delta"]
+    best_calibration: dict[str, float] = search["calibration"]
+    best_score: float = search["score"]
+    best_warnings: list[str] = search["warnings"] + strategy_warnings
+    cycles_used: int = search["cycles_used"]
+    stopped_early: bool = search["stopped_early"]
+
     # Compute final metrics
     proposed_peak = max(b + d for b, d in zip(baseline_torque_nm, best_delta))
     estimated_peak_gain_ratio = (
@@ -198,7 +665,7 @@ def run_optimization(
     )
 
     # Confidence: how close are we to the gain cap?
-    max_peak_gain_ratio: float = constraints.get("max_peak_gain_ratio", 0.02)
+    max_peak_gain_ratio: float = cs.max_peak_gain_ratio
     confidence = _clamp(
         estimated_peak_gain_ratio / max_peak_gain_ratio
         if max_peak_gain_ratio > 0
@@ -215,7 +682,7 @@ def run_optimization(
         confidence,
     )
 
-    return {
+    result = {
         "torque_delta_nm": best_delta,
         "calibration": best_calibration,
         "confidence": round(confidence, 4),
@@ -223,4 +690,13 @@ def run_optimization(
         "cycles_used": cycles_used,
         "best_score": round(best_score, 4),
         "warnings": best_warnings,
+        "stopped_early": stopped_early,
+        "early_exit": search["early_exit"],
+        "pre_check": pre_check,
+        "warm_started": warm_started,
+        "bound_gap": round(max(cs.score_upper_bound - best_score, 0.0), 4),
+        "strategy": strategy,
     }
+    if stats is not None:
+        result["search_stats"] = stats
+    return result
@@ -0,0 +1,206 @@
+"""
+ecu/profiling.py
+
+On-demand profiling of single requests (cProfile and/or tracemalloc).
+
+A request is profiled when it asks for it (request field debug.profile) or
+when the process-wide sampler picks it:
+
+    ECU_PROFILE        "cpu", "memory" or "all": profile sampled requests.
+    ECU_PROFILE_EVERY  profile 1 in N requests (default 1, i.e. every one).
+    ECU_PROFILE_DIR    write reports here instead of to stderr.
+
+"cpu" runs cProfile; "memory" runs tracemalloc; "all" runs both. Reports never
+go to stdout, which is reserved for the JSON response:
+  - With ECU_PROFILE_DIR, cProfile stats are dumped in pstats format to
+    <prefix>.prof (open with pstats or snakeviz), and the top allocation sites
+    are written to <prefix>.alloc.txt.
+  - Otherwise, the top functions by cumulative time and the top allocation
+    sites are printed to stderr.
+
+The sampling counter is per process, so with several worker processes (the
+HTTP server pool) each one samples 1 in N of the requests it handles. A
+sampled request is profiled from before its JSON is parsed; debug.profile is
+only known once it is, so it covers schema validation onward.
+
+Runs do not nest: inside an active run, run() is a no-op, so the outermost
+scope decides the mode and collects the whole report.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Iterator, TextIO
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cpu", "memory", "all")
+
+# Rows printed per report.
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 15
+
+
+def resolve_mode(flag: bool | str | None) -> str | None:
+    """Profile mode for a debug.profile value: true means "cpu"."""
+    if flag is True:
+        return "cpu"
+    if flag in PROFILE_MODES:
+        return flag
+    return None
+
+
+class Profiler:
+    """
+    Decides which requests are profiled and runs them under the profilers.
+
+    mode is the mode for sampled requests (None disables sampling); every
+    profiles 1 in every requests. out_dir, if set, receives report files;
+    otherwise reports go to stream (default sys.stderr).
+    """
+
+    def __init__(
+        self,
+        mode: str | None = None,
+        every: int = 1,
+        out_dir: str | None = None,
+        stream: TextIO | None = None,
+    ):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"profile mode must be one of {PROFILE_MODES}, got {mode!r}")
+        if every < 1:
+            raise ValueError(f"profile sampling interval must be >= 1, got {every}")
+        self.mode = mode
+        self.every = every
+        self.out_dir = out_dir
+        self.stream = stream
+        self._seen = 0
+        self._written = 0
+        self._active = False
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        mode = os.environ.get("ECU_PROFILE") or None
+        if mode is not None and mode not in PROFILE_MODES:
+            logger.warning("Ignoring ECU_PROFILE=%r; expected one of %s", mode, PROFILE_MODES)
+            mode = None
+        return cls(
+            mode=mode,
+            every=int(os.environ.get("ECU_PROFILE_EVERY", "1")),
+            out_dir=os.environ.get("ECU_PROFILE_DIR") or None,
+        )
+
+    def select(self, requested: str | None = None) -> str | None:
+        """
+        Profile mode for the next request, or None to run it unprofiled.
+
+        Call once per request. An explicit request mode always wins; otherwise
+        the sampler picks the 1st, (N+1)th, (2N+1)th ... request.
+        """
+        sampled = self._seen % self.every == 0
+        self._seen += 1
+        if requested is not None:
+            return requested
+        return self.mode if sampled else None
+
+    @contextmanager
+    def run(self, mode: str | None, label: str) -> Iterator[dict[str, Any]]:
+        """
+        Run the body under the profilers for mode (no-op for None, or inside
+        another run).
+
+        Yields a dict; setting its "label" renames the report, e.g. once the
+        request_id has been parsed.
+        """
+        run = {"label": label}
+        if mode is None or self._active:
+            yield run
+            return
+
+        profile = None
+        if mode in ("cpu", "all"):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as exc:
+                # Another profiler (e.g. a debugger) is already active.
+                logger.warning("cProfile unavailable for %s: %s", label, exc)
+                profile = None
+        trace = mode in ("memory", "all")
+        started_trace = trace and not tracemalloc.is_tracing()
+        if started_trace:
+            tracemalloc.start()
+        if trace:
+            tracemalloc.reset_peak()
+
+        self._active = True
+        try:
+            yield run
+        finally:
+            self._active = False
+            if profile is not None:
+                profile.disable()
+            snapshot = peak = None
+            if trace:
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+            if started_trace:
+                tracemalloc.stop()
+            self._report(run["label"], profile, snapshot, peak)
+
+    def _report(
+        self,
+        label: str,
+        profile: cProfile.Profile | None,
+        snapshot: tracemalloc.Snapshot | None,
+        peak: int | None,
+    ) -> None:
+        if self.out_dir is None:
+            stream = self.stream or sys.stderr
+            stream.write(f"=== ECU profile: {label} ===\n")
+            if profile is not None:
+                stats = pstats.Stats(profile, stream=stream)
+                stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            if snapshot is not None:
+                stream.write(_format_allocations(snapshot, peak))
+            stream.flush()
+            return
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._written += 1
+        safe_label = re.sub(r"[^A-Za-z0-9_.-]", "_", label)[:64]
+        prefix = os.path.join(self.out_dir, f"ecu-{os.getpid()}-{self._written}-{safe_label}")
+        if profile is not None:
+            profile.dump_stats(prefix + ".prof")
+        if snapshot is not None:
+            with open(prefix + ".alloc.txt", "w", encoding="utf-8") as fh:
+                fh.write(_format_allocations(snapshot, peak))
+        logger.info("Wrote profile for %s to %s.*", label, prefix)
+
+
+def _format_allocations(snapshot: tracemalloc.Snapshot, peak: int) -> str:
+    """Peak traced memory, then the top sites of memory still live at the end."""
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    stats = snapshot.statistics("lineno")
+    out = io.StringIO()
+    total_kib = sum(stat.size for stat in stats) / 1024
+    out.write(
+        f"Peak traced memory {peak / 1024:.1f} KiB. Top {TOP_ALLOCATIONS} allocation "
+        f"sites ({total_kib:.1f} KiB live):\n"
+    )
+    for stat in stats[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        out.write(
+            f"  {frame.filename}:{frame.lineno}: {stat.size / 1024:.1f} KiB "
+            f"in {stat.count} block(s)\n"
+        )
+    return out.getvalue()
@@ -0,0 +1,110 @@
+"""
+ecu/rng.py
+
+Counter-based random numbers for run_optimization (rng="counter").
+
+random.Random(seed) is a stream: the draws for cycle k are only reachable by
+generating cycles 0..k-1 first, so work cannot be reordered or split without
+changing the output. A counter-based generator instead computes draw j of
+stream k directly as a hash of (seed, k, j):
+
+    key   = splitmix64(seed)
+    draw  = splitmix64(splitmix64(key ^ k * GOLDEN) ^ j * GOLDEN')
+
+splitmix64 is the finalizer of Vigna's SplitMix64 generator, a bijective
+64-bit mixer with full avalanche. Floats use the top 53 bits, as
+random.random() does.
+
+Streams are independent of evaluation order, so a search can start at any
+cycle, run blocks in parallel or vectorize them and still produce the same
+candidates. random_array() is the NumPy path; it uses wrapping uint64
+arithmetic and returns exactly the same values as random(). NumPy is imported
+only there (callers are the NumPy strategies, see ecu/vectorized.py), so the
+scalar generator never pays for it.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_INDEX_GOLDEN = 0xD1B54A32D192ED03
+_MUL1 = 0xBF58476D1CE4E5B9
+_MUL2 = 0x94D049BB133111EB
+_FLOAT_SCALE = 2.0 ** -53
+
+
+def splitmix64(z: int) -> int:
+    """SplitMix64 output function for a 64-bit integer."""
+    z = (z + _GOLDEN) & _MASK
+    z = ((z ^ (z >> 30)) * _MUL1) & _MASK
+    z = ((z ^ (z >> 27)) * _MUL2) & _MASK
+    return z ^ (z >> 31)
+
+
+def _splitmix64_array(z: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    z = z + np.uint64(_GOLDEN)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MUL1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MUL2)
+    return z ^ (z >> np.uint64(31))
+
+
+class CounterRNG:
+    """
+    Random access to draw `index` of stream `counter` for one seed.
+
+    random(counter, index) is a pure function; stream(counter) wraps it in a
+    random.Random-like object for code that draws sequentially.
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, seed: int):
+        self.key = splitmix64(seed & _MASK)
+
+    def random(self, counter: int, index: int) -> float:
+        """Float in [0, 1) for draw index of stream counter."""
+        z = splitmix64(self.key ^ ((counter * _GOLDEN) & _MASK))
+        z = splitmix64(z ^ ((index * _INDEX_GOLDEN) & _MASK))
+        return (z >> 11) * _FLOAT_SCALE
+
+    def random_array(self, counters: "np.ndarray", index: int) -> "np.ndarray":
+        """NumPy equivalent of random() over an array of counters (same bits)."""
+        import numpy as np  # lazy: optional extra, slow to import
+
+        counters = np.asarray(counters, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            z = _splitmix64_array(np.uint64(self.key) ^ (counters * np.uint64(_GOLDEN)))
+            z = _splitmix64_array(z ^ np.uint64((index * _INDEX_GOLDEN) & _MASK))
+        return (z >> np.uint64(11)).astype(np.float64) * _FLOAT_SCALE
+
+    def stream(self, counter: int, start: int = 0) -> "CounterStream":
+        """Sequential view of stream counter, beginning at draw start."""
+        return CounterStream(self, counter, start)
+
+
+class CounterStream:
+    """
+    Sequential view of one counter: the n-th random()/uniform() call returns
+    draw start + n. Drop-in for random.Random in the optimizer's draw helpers.
+    """
+
+    __slots__ = ("_rng", "_counter", "_index")
+
+    def __init__(self, rng: CounterRNG, counter: int, start: int = 0):
+        self._rng = rng
+        self._counter = counter
+        self._index = start
+
+    def random(self) -> float:
+        value = self._rng.random(self._counter, self._index)
+        self._index += 1
+        return value
+
+    def uniform(self, a: float, b: float) -> float:
+        # Same formula as random.Random.uniform.
+        return a + (b - a) * self.random()
@@ -0,0 +1,105 @@
+"""
+ecu/sampling.py
+
+Scrambled Halton sequence for run_optimization (strategy "halton").
+
+The Gaussian search draws (peak, sigma, center) for each cycle. Independent
+uniform draws cluster and leave gaps, which matters most for small cycle
+budgets. A Halton sequence fills the unit cube evenly: point k takes the
+radical inverse of k in base 2, 3, 5, ... per dimension.
+
+Plain Halton points are strongly correlated across dimensions for small k,
+so each digit position of each base gets its own random digit permutation,
+drawn once from random.Random(seed). This keeps the sequence deterministic
+for a given request seed while decorrelating different seeds.
+"""
+
+import random
+
+# One prime base per dimension.
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29)
+
+# Digit positions are permuted up to this index range; points beyond it
+# repeat the sequence.
+MAX_INDEX = 2 ** 32
+
+
+def _digit_count(base: int) -> int:
+    """Digits needed to represent every index below MAX_INDEX in base."""
+    count, reach = 0, 1
+    while reach < MAX_INDEX:
+        reach *= base
+        count += 1
+    return count
+
+
+class ScrambledHalton:
+    """
+    Deterministic low-discrepancy points in [0, 1)^dims.
+
+    point(k) returns the k-th point. Digit permutations are generated up
+    front from random.Random(seed), so points can be read in any order.
+    """
+
+    __slots__ = ("dims", "_bases", "_perms", "_tails")
+
+    def __init__(self, dims: int, seed: int):
+        if not 1 <= dims <= len(_PRIMES):
+            raise ValueError(f"dims must be between 1 and {len(_PRIMES)}, got {dims}")
+        rng = random.Random(seed)
+        self.dims = dims
+        self._bases = _PRIMES[:dims]
+        self._perms: list[list[list[int]]] = []
+        # _tails[d][j]: contribution of digit positions >= j when all of them
+        # are zero, so point() can stop once the index runs out of digits.
+        self._tails: list[list[float]] = []
+        for base in self._bases:
+            per_digit = []
+            for _ in range(_digit_count(base)):
+                perm = list(range(base))
+                rng.shuffle(perm)
+                per_digit.append(perm)
+            self._perms.append(per_digit)
+            tail = [0.0] * (len(per_digit) + 1)
+            for j in range(len(per_digit) - 1, -1, -1):
+                tail[j] = tail[j + 1] + per_digit[j][0] * base ** -(j + 1)
+            self._tails.append(tail)
+
+    def point(self, index: int) -> list[float]:
+        """Return the index-th point of the sequence."""
+        index %= MAX_INDEX
+        coords = []
+        for base, perms, tail in zip(self._bases, self._perms, self._tails):
+            value = 0.0
+            weight = 1.0 / base
+            k = index
+            pos = 0
+            while k:
+                value += perms[pos][k % base] * weight
+                k //= base
+                weight /= base
+                pos += 1
+            coords.append(value + tail[pos])
+        return coords
+
+    def source(self, index: int) -> "PointSource":
+        """Return a uniform() source that walks the index-th point's coordinates."""
+        return PointSource(self.point(index))
+
+
+class PointSource:
+    """
+    Stand-in for random.Random in the candidate draws: each uniform(lo, hi)
+    call maps the next coordinate of one fixed point into [lo, hi].
+    """
+
+    __slots__ = ("_coords", "_next")
+
+    def __init__(self, coords: list[float]):
+        self._coords = coords
+        self._next = 0
+
+    def uniform(self, a: float, b: float) -> float:
+        u = self._coords[self._next]
+        self._next += 1
+        return a + (b - a) * u
@@ -5,6 +5,12 @@ Validates an ECU proposal against the constraints provided by Unity.
 Unity is authoritative — this mirrors the same rules Unity enforces,
 so Python can self-reject before returning a bad proposal.
 
+check_proposal() is the non-raising core: it returns a (code, index) pair for
+the first violation and builds no strings. validate_proposal() wraps it,
+rendering the message only when a proposal is actually rejected.
+validate_many() screens a whole block of candidates (flat array('d') or a
+2-D NumPy array) and reports the same codes per candidate.
+
 Rules enforced (must match ECU_CONTRACT.md §5):
   - torque_delta length matches rpm_bins length
   - no NaN or infinity in torque_delta
@@ -17,126 +23,352 @@ Rules enforced (must match ECU_CONTRACT.md §5):
 
 import math
 import logging
-from typing import Any
+import operator
+from array import array
+from typing import TYPE_CHECKING, Any
+
+from ecu.constraints import ConstraintSet, compile_constraints
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+# Violation codes returned by check_proposal (and set on ValidationError.code).
+LENGTH_MISMATCH = "LENGTH_MISMATCH"
+BASELINE_LENGTH_MISMATCH = "BASELINE_LENGTH_MISMATCH"
+NON_FINITE_DELTA = "NON_FINITE_DELTA"
+INVALID_BASELINE = "INVALID_BASELINE"
+BIN_DELTA_NM = "BIN_DELTA_NM"
+BIN_DELTA_RATIO = "BIN_DELTA_RATIO"
+PEAK_GAIN = "PEAK_GAIN"
+SMOOTHNESS = "SMOOTHNESS"
+CALIBRATION_NON_FINITE = "CALIBRATION_NON_FINITE"
+CALIBRATION_RANGE = "CALIBRATION_RANGE"
+
+VIOLATION_CODES = (
+    LENGTH_MISMATCH,
+    BASELINE_LENGTH_MISMATCH,
+    NON_FINITE_DELTA,
+    INVALID_BASELINE,
+    BIN_DELTA_NM,
+    BIN_DELTA_RATIO,
+    PEAK_GAIN,
+    SMOOTHNESS,
+    CALIBRATION_NON_FINITE,
+    CALIBRATION_RANGE,
+)
+
+
 class ValidationError(Exception):
-    """Raised when a proposal violates a constraint."""
-    pass
+    """
+    Raised when a proposal violates a constraint.
+    code/index carry the structured violation from check_proposal, if known.
+    """
+
+    def __init__(self, message: str, code: str | None = None, index: int = -1):
+        super().__init__(message)
+        self.code = code
+        self.index = index
 
 
 def _is_finite(value: float) -> bool:
     return math.isfinite(value)
 
 
-def validate_proposal(
+def check_proposal(
     torque_delta_nm: list[float],
     calibration: dict[str, float],
     baseline_torque_nm: list[float],
     rpm_bins: list[int],
-    constraints: dict[str, Any],
-) -> list[str]:
+    constraints: "dict[str, Any] | ConstraintSet",
+) -> tuple[str, int] | None:
     """
-    Validate a proposed torque delta and calibration against constraints.
-
-    Returns a list of warning strings (empty = fully valid).
-    Raises ValidationError on hard violations.
+    Non-raising validation: return None if the proposal passes every hard
+    check, else (code, index) for the first violation in validate_proposal's
+    order. index is the bin for per-bin codes, the position in calibration for
+    calibration codes, and -1 otherwise.
 
-    Parameters
-    ----------
-    torque_delta_nm      : proposed per-bin torque deltas
-    calibration          : proposed calibration dict (afr_target, ign_timing_deg, etc.)
-    baseline_torque_nm   : baseline torque values from Unity
-    rpm_bins             : RPM bin array from Unity
-    constraints          : constraints dict from the request JSON
+    No messages are built; use describe_violation() when text is needed.
     """
-    warnings: list[str] = []
-
     # ── 1. Length match ──────────────────────────────────────────────────────
     if len(torque_delta_nm) != len(rpm_bins):
-        raise ValidationError(
-            f"torque_delta length {len(torque_delta_nm)} != rpm_bins length {len(rpm_bins)}"
-        )
+        return LENGTH_MISMATCH, -1
     if len(baseline_torque_nm) != len(rpm_bins):
-        raise ValidationError(
-            f"baseline_torque length {len(baseline_torque_nm)} != rpm_bins length {len(rpm_bins)}"
-        )
+        return BASELINE_LENGTH_MISMATCH, -1
 
-    max_bin_delta_nm: float = constraints.get("max_bin_delta_nm", 8.0)
-    max_bin_delta_ratio: float = constraints.get("max_bin_delta_ratio", 0.03)
-    max_peak_gain_ratio: float = constraints.get("max_peak_gain_ratio", 0.02)
-    smoothness_cfg: dict = constraints.get("smoothness", {})
-    max_second_derivative: float = smoothness_cfg.get("max_second_derivative", 0.15)
-    calibration_ranges: dict = constraints.get("calibration_ranges", {})
+    cs = compile_constraints(constraints, baseline_torque_nm)
+    violation = _check_deltas(torque_delta_nm, baseline_torque_nm, cs)
+    if violation is None:
+        violation = _check_calibration(calibration, cs)
+    return violation
 
+
+def _check_deltas(
+    torque_delta_nm: "list[float] | array",
+    baseline_torque_nm: list[float],
+    cs: ConstraintSet,
+) -> tuple[str, int] | None:
+    """check_proposal steps 2–5 (lengths already match)."""
     # ── 2. NaN / infinity check ───────────────────────────────────────────────
-    for i, delta in enumerate(torque_delta_nm):
-        if not _is_finite(delta):
-            raise ValidationError(f"torque_delta[{i}] is not finite: {delta}")
+    # A finite sum means every delta is finite; only scan when it is not.
+    if not _is_finite(sum(torque_delta_nm)):
+        for i, delta in enumerate(torque_delta_nm):
+            if not _is_finite(delta):
+                return NON_FINITE_DELTA, i
 
     # ── 3. Per-bin delta limits ───────────────────────────────────────────────
-    for i, (delta, baseline) in enumerate(zip(torque_delta_nm, baseline_torque_nm)):
-        if not _is_finite(baseline) or baseline <= 0:
-            raise ValidationError(
-                f"baseline_torque_nm[{i}] is invalid: {baseline}"
-            )
+    # Deltas within the precomputed fast cap pass both limits; the rest (and
+    # invalid baseline bins) get the exact checks.
+    for i, (delta, cap) in enumerate(zip(torque_delta_nm, cs.fast_cap)):
         abs_delta = abs(delta)
-        if abs_delta > max_bin_delta_nm:
-            raise ValidationError(
-                f"bin {i} delta {delta:.4f} Nm exceeds max_bin_delta_nm {max_bin_delta_nm}"
-            )
-        ratio = abs_delta / baseline
-        if ratio > max_bin_delta_ratio:
-            raise ValidationError(
-                f"bin {i} delta ratio {ratio:.4f} exceeds max_bin_delta_ratio {max_bin_delta_ratio}"
-            )
+        if abs_delta <= cap:
+            continue
+        baseline = baseline_torque_nm[i]
+        if not _is_finite(baseline) or baseline <= 0:
+            return INVALID_BASELINE, i
+        if abs_delta > cs.max_bin_delta_nm:
+            return BIN_DELTA_NM, i
+        if abs_delta / baseline > cs.max_bin_delta_ratio:
+            return BIN_DELTA_RATIO, i
 
     # ── 4. Peak gain cap ─────────────────────────────────────────────────────
-    baseline_peak = max(baseline_torque_nm)
-    proposed = [b + d for b, d in zip(baseline_torque_nm, torque_delta_nm)]
-    proposed_peak = max(proposed)
-
+    baseline_peak = cs.baseline_peak
     if baseline_peak > 0:
-        peak_gain_ratio = (proposed_peak - baseline_peak) / baseline_peak
-        if peak_gain_ratio > max_peak_gain_ratio:
-            raise ValidationError(
-                f"peak gain ratio {peak_gain_ratio:.4f} exceeds cap {max_peak_gain_ratio}"
-            )
-        if peak_gain_ratio < 0:
-            warnings.append(
-                f"proposal reduces peak torque by {abs(peak_gain_ratio)*100:.2f}%"
-            )
+        proposed_peak = max(map(operator.add, baseline_torque_nm, torque_delta_nm))
+        if (proposed_peak - baseline_peak) / baseline_peak > cs.max_peak_gain_ratio:
+            return PEAK_GAIN, -1
 
     # ── 5. Smoothness — second derivative check on the delta curve ────────────
     # The baseline curve is Unity's and is already valid.
     # Python only controls the deltas, so smoothness is enforced on torque_delta_nm.
     # max_second_derivative is an absolute Nm threshold on the delta curve.
     if len(torque_delta_nm) >= 3:
-        for i in range(1, len(torque_delta_nm) - 1):
-            second_deriv = abs(
-                torque_delta_nm[i + 1]
-                - 2 * torque_delta_nm[i]
-                + torque_delta_nm[i - 1]
-            )
-            if second_deriv > max_second_derivative:
-                raise ValidationError(
-                    f"smoothness violation at bin {i}: "
-                    f"delta second_derivative={second_deriv:.4f} "
-                    f"> max {max_second_derivative}"
-                )
+        max_second_derivative = cs.max_second_derivative
+        for i, (prev, cur, nxt) in enumerate(
+            zip(torque_delta_nm, torque_delta_nm[1:], torque_delta_nm[2:]), start=1
+        ):
+            if abs(nxt - 2 * cur + prev) > max_second_derivative:
+                return SMOOTHNESS, i
 
+    return None
+
+
+def _check_calibration(
+    calibration: dict[str, float],
+    cs: ConstraintSet,
+) -> tuple[str, int] | None:
+    """check_proposal step 6."""
     # ── 6. Calibration ranges ─────────────────────────────────────────────────
-    for param, value in calibration.items():
+    calibration_ranges = cs.calibration_ranges
+    for k, (param, value) in enumerate(calibration.items()):
         if not _is_finite(value):
-            raise ValidationError(f"calibration.{param} is not finite: {value}")
+            return CALIBRATION_NON_FINITE, k
         if param in calibration_ranges:
             lo, hi = calibration_ranges[param]
             if not (lo <= value <= hi):
-                raise ValidationError(
-                    f"calibration.{param}={value} outside allowed range [{lo}, {hi}]"
-                )
+                return CALIBRATION_RANGE, k
+
+    return None
+
+
+def validate_many(
+    candidates: "array | np.ndarray",
+    baseline_torque_nm: list[float],
+    constraints: "dict[str, Any] | ConstraintSet",
+) -> tuple["list[bool] | np.ndarray", list[tuple[str, int] | None]]:
+    """
+    Screen a block of torque-delta candidates in one call.
+
+    candidates is either a flat array('d') (or any flat float sequence) of
+    rows * len(baseline_torque_nm) values in row-major order, or a 2-D NumPy
+    array of shape (rows, bins). Only the torque-delta checks (check_proposal
+    steps 2–5) apply; calibration is validated separately.
+
+    Returns (feasible, violations): feasible[r] is True when row r passes,
+    violations[r] is None or the (code, index) check_proposal would report.
+    feasible is a NumPy bool array for NumPy input, else a list.
+    Results are identical to calling check_proposal row by row.
+    """
+    cs = compile_constraints(constraints, baseline_torque_nm)
+    n = cs.n_bins
+
+    if hasattr(candidates, "ndim"):
+        return _validate_many_numpy(candidates, baseline_torque_nm, cs)
+
+    if n == 0 or len(candidates) % n:
+        raise ValueError(
+            f"candidate block of {len(candidates)} values is not a multiple of {n} bins"
+        )
+    violations = [
+        _check_deltas(candidates[start:start + n], baseline_torque_nm, cs)
+        for start in range(0, len(candidates), n)
+    ]
+    return [v is None for v in violations], violations
+
+
+def _validate_many_numpy(
+    deltas: "np.ndarray",
+    baseline_torque_nm: list[float],
+    cs: ConstraintSet,
+) -> tuple["np.ndarray", list[tuple[str, int] | None]]:
+    """
+    Array form of _check_deltas. Only correctly rounded operations (+, -, *,
+    /, abs, max) are used, so every comparison matches the scalar path.
+    """
+    import numpy as np  # optional; only reached with NumPy input
+
+    if deltas.ndim != 2 or deltas.shape[1] != cs.n_bins:
+        raise ValueError(f"expected a (rows, {cs.n_bins}) array, got shape {deltas.shape}")
+    rows = deltas.shape[0]
+    baseline = np.asarray(baseline_torque_nm, dtype=np.float64)
+    codes = np.zeros(rows, dtype=np.int8)  # 0 = feasible, else 1 + VIOLATION_CODES index
+    index = np.full(rows, -1, dtype=np.int64)
+    open_rows = np.ones(rows, dtype=bool)
+
+    def record(failed: "np.ndarray", code: str, where: "np.ndarray | int") -> None:
+        failed &= open_rows
+        codes[failed] = VIOLATION_CODES.index(code) + 1
+        index[failed] = where[failed] if isinstance(where, np.ndarray) else where
+        open_rows[failed] = False
+
+    # 2. NaN / infinity
+    bad = ~np.isfinite(deltas)
+    record(bad.any(axis=1), NON_FINITE_DELTA, bad.argmax(axis=1))
+
+    # 3. Per-bin limits: first offending bin, then the code that bin fails first
+    with np.errstate(invalid="ignore", divide="ignore"):
+        abs_delta = np.abs(deltas)
+        bad_baseline = np.broadcast_to(~(np.isfinite(baseline) & (baseline > 0)), deltas.shape)
+        over_nm = abs_delta > cs.max_bin_delta_nm
+        over_ratio = abs_delta / baseline > cs.max_bin_delta_ratio
+    bad = bad_baseline | over_nm | over_ratio
+    first = bad.argmax(axis=1)
+    failed = bad.any(axis=1) & open_rows
+    at = np.arange(rows)
+    for code, check in ((INVALID_BASELINE, bad_baseline), (BIN_DELTA_NM, over_nm), (BIN_DELTA_RATIO, over_ratio)):
+        record(failed & check[at, first], code, first)
+
+    # 4. Peak gain
+    baseline_peak = cs.baseline_peak
+    if baseline_peak > 0 and open_rows.any():
+        proposed_peak = (baseline + deltas).max(axis=1)
+        record((proposed_peak - baseline_peak) / baseline_peak > cs.max_peak_gain_ratio, PEAK_GAIN, -1)
+
+    # 5. Smoothness
+    if cs.n_bins >= 3 and open_rows.any():
+        second = np.abs(deltas[:, 2:] - 2 * deltas[:, 1:-1] + deltas[:, :-2])
+        bad = second > cs.max_second_derivative
+        record(bad.any(axis=1), SMOOTHNESS, bad.argmax(axis=1) + 1)
+
+    violations: list[tuple[str, int] | None] = [
+        None if c == 0 else (VIOLATION_CODES[c - 1], int(i))
+        for c, i in zip(codes.tolist(), index.tolist())
+    ]
+    return codes == 0, violations
+
+
+def describe_violation(
+    violation: tuple[str, int],
+    torque_delta_nm: list[float],
+    calibration: dict[str, float],
+    baseline_torque_nm: list[float],
+    rpm_bins: list[int],
+    constraints: "dict[str, Any] | ConstraintSet",
+) -> str:
+    """Render the human-readable message for a check_proposal() violation."""
+    code, i = violation
+    if code == LENGTH_MISMATCH:
+        return f"torque_delta length {len(torque_delta_nm)} != rpm_bins length {len(rpm_bins)}"
+    if code == BASELINE_LENGTH_MISMATCH:
+        return f"baseline_torque length {len(baseline_torque_nm)} != rpm_bins length {len(rpm_bins)}"
+    if code == NON_FINITE_DELTA:
+        return f"torque_delta[{i}] is not finite: {torque_delta_nm[i]}"
+    if code == INVALID_BASELINE:
+        return f"baseline_torque_nm[{i}] is invalid: {baseline_torque_nm[i]}"
+
+    cs = compile_constraints(constraints, baseline_torque_nm)
+    if code == BIN_DELTA_NM:
+        return f"bin {i} delta {torque_delta_nm[i]:.4f} Nm exceeds max_bin_delta_nm {cs.max_bin_delta_nm}"
+    if code == BIN_DELTA_RATIO:
+        ratio = abs(torque_delta_nm[i]) / baseline_torque_nm[i]
+        return f"bin {i} delta ratio {ratio:.4f} exceeds max_bin_delta_ratio {cs.max_bin_delta_ratio}"
+    if code == PEAK_GAIN:
+        return f"peak gain ratio {_peak_gain_ratio(torque_delta_nm, cs):.4f} exceeds cap {cs.max_peak_gain_ratio}"
+    if code == SMOOTHNESS:
+        second_deriv = abs(
+            torque_delta_nm[i + 1] - 2 * torque_delta_nm[i] + torque_delta_nm[i - 1]
+        )
+        return (
+            f"smoothness violation at bin {i}: "
+            f"delta second_derivative={second_deriv:.4f} "
+            f"> max {cs.max_second_derivative}"
+        )
+    if code == CALIBRATION_NON_FINITE:
+        param, value = list(calibration.items())[i]
+        return f"calibration.{param} is not finite: {value}"
+    if code == CALIBRATION_RANGE:
+        param, value = list(calibration.items())[i]
+        lo, hi = cs.calibration_ranges[param]
+        return f"calibration.{param}={value} outside allowed range [{lo}, {hi}]"
+    raise ValueError(f"unknown violation code {code!r}")
+
+
+def _peak_gain_ratio(torque_delta_nm: list[float], cs: ConstraintSet) -> float:
+    proposed_peak = max(map(operator.add, cs.baseline_torque_nm, torque_delta_nm))
+    return (proposed_peak - cs.baseline_peak) / cs.baseline_peak
+
+
+def proposal_warnings(
+    torque_delta_nm: list[float],
+    baseline_torque_nm: list[float],
+    constraints: "dict[str, Any] | ConstraintSet",
+) -> list[str]:
+    """Soft warnings for a proposal that already passed check_proposal()."""
+    cs = compile_constraints(constraints, baseline_torque_nm)
+    warnings: list[str] = []
+    if cs.baseline_peak > 0:
+        peak_gain_ratio = _peak_gain_ratio(torque_delta_nm, cs)
+        if peak_gain_ratio < 0:
+            warnings.append(
+                f"proposal reduces peak torque by {abs(peak_gain_ratio)*100:.2f}%"
+            )
+    return warnings
+
+
+def validate_proposal(
+    torque_delta_nm: list[float],
+    calibration: dict[str, float],
+    baseline_torque_nm: list[float],
+    rpm_bins: list[int],
+    constraints: "dict[str, Any] | ConstraintSet",
+) -> list[str]:
+    """
+    Validate a proposed torque delta and calibration against constraints.
+
+    Returns a list of warning strings (empty = fully valid).
+    Raises ValidationError on hard violations.
+
+    Thin wrapper over check_proposal(); search loops that reject many
+    candidates should call check_proposal() directly.
+
+    Parameters
+    ----------
+    torque_delta_nm      : proposed per-bin torque deltas
+    calibration          : proposed calibration dict (afr_target, ign_timing_deg, etc.)
+    baseline_torque_nm   : baseline torque values from Unity
+    rpm_bins             : RPM bin array from Unity
+    constraints          : constraints dict from the request JSON, or a
+                           ConstraintSet compiled for baseline_torque_nm
+    """
+    cs = compile_constraints(constraints, baseline_torque_nm)
+    args = (torque_delta_nm, calibration, baseline_torque_nm, rpm_bins, cs)
+    violation = check_proposal(*args)
+    if violation is not None:
+        code, index = violation
+        raise ValidationError(describe_violation(violation, *args), code=code, index=index)
 
+    warnings = proposal_warnings(torque_delta_nm, baseline_torque_nm, cs)
     logger.debug("Proposal passed all validation checks. Warnings: %s", warnings)
     return warnings
@@ -0,0 +1,322 @@
+"""
+ecu/vectorized.py
+
+Optional NumPy candidate engine for run_optimization (strategy "gaussian_numpy").
+
+The pure-Python search builds one Gaussian profile per cycle with math.exp per
+bin and calls validate_proposal once per candidate. This engine instead:
+  - draws every cycle's (peak, sigma, center) and calibration from the seeded
+    RNG in exactly the same order as the pure-Python path; with a counter RNG
+    (ecu/rng.py) the whole block's parameters are computed as arrays, bit
+    for bit equal to the pure-Python draws,
+  - builds a block of candidates as a (cycles x bins) matrix,
+  - screens all constraints with array operations (validator.validate_many),
+  - selects the best feasible candidate per block (earliest cycle wins ties,
+    matching the serial "strictly better" rule) and re-checks it with
+    validate_proposal,
+  - replays the serial early-exit rule (score bound, patience) over the
+    block's running best, so it stops at the same cycle as "gaussian".
+
+np.exp and NumPy's pairwise summation can differ from math.exp / sum() in the
+last bits, so results are not guaranteed bit-identical to "gaussian"; this is
+why the engine has its own strategy ID. It is still fully deterministic.
+
+NumPy is an optional extra. NUMPY_AVAILABLE is False when it is not installed
+and run_optimization falls back to the pure-Python path.
+"""
+
+import logging
+import time
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # optional extra
+    np = None
+
+from ecu.constraints import ConstraintSet
+from ecu.rng import CounterRNG
+from ecu.optimizer import (
+    BOUND_TOLERANCE_NM,
+    CALIBRATION_DRAW_OFFSET,
+    _draw_gaussian_params,
+    _early_exit,
+    _pick_calibration,
+)
+from ecu.validator import (
+    CALIBRATION_NON_FINITE,
+    CALIBRATION_RANGE,
+    validate_many,
+    validate_proposal,
+    ValidationError,
+)
+
+logger = logging.getLogger(__name__)
+
+NUMPY_AVAILABLE = np is not None
+
+# Candidates evaluated per block. A multiple of DEADLINE_CHECKPOINT_CYCLES, so
+# deadline stops (checked between blocks) always land on a replayable checkpoint.
+CHUNK_CYCLES = 1024
+
+# Column order of the calibration matrix; matches _pick_calibration's defaults.
+CALIBRATION_PARAMS = ("afr_target", "ign_timing_deg", "boost_target_psi")
+
+
+def _feasible_mask(
+    deltas: "np.ndarray",
+    calibration: "np.ndarray",
+    baseline_torque_nm: list[float],
+    cs: ConstraintSet,
+    with_codes: bool = False,
+) -> tuple["np.ndarray", list[str | None] | None]:
+    """
+    Row-wise equivalent of validate_proposal's hard checks. Returns
+    (feasible, codes). With with_codes, codes[r] is the violation code
+    check_proposal would report first for row r, or None; otherwise codes
+    is None.
+    """
+    delta_ok, violations = validate_many(deltas, baseline_torque_nm, cs)
+
+    finite = np.isfinite(calibration).all(axis=1)
+    in_range = np.ones(len(calibration), dtype=bool)
+    for col, param in enumerate(CALIBRATION_PARAMS):
+        if param in cs.calibration_ranges:
+            lo, hi = cs.calibration_ranges[param]
+            in_range &= (calibration[:, col] >= lo) & (calibration[:, col] <= hi)
+
+    ok = delta_ok & finite & in_range
+    if not with_codes:
+        return ok, None
+    codes = [v[0] if v is not None else None for v in violations]
+    for row in np.flatnonzero(delta_ok & ~ok).tolist():
+        codes[row] = CALIBRATION_RANGE if finite[row] else CALIBRATION_NON_FINITE
+    return ok, codes
+
+
+def _block_early_exit(
+    scores: "np.ndarray",
+    best_score: float,
+    stale_cycles: int,
+    bound_stop: float,
+    patience: int | None,
+    last_block: bool,
+) -> tuple[int, str | None, int]:
+    """
+    Replay the serial early-exit check over one block.
+
+    Returns (rows, reason, stale_cycles): the number of rows the serial loop
+    would run before stopping, the stop reason (None if it runs them all) and
+    the stale-cycle count after the last of those rows. last_block marks the
+    block that ends the run.
+    """
+    rows = len(scores)
+    idx = np.arange(rows)
+    running = np.maximum(np.maximum.accumulate(scores), best_score)
+    before = np.concatenate(([best_score], running[:-1]))
+    last_improved = np.maximum.accumulate(np.where(scores > before, idx, -1))
+    stale = np.where(last_improved >= 0, idx - last_improved, stale_cycles + idx + 1)
+
+    stop = running >= bound_stop
+    if patience is not None:
+        stop |= stale >= patience
+    # The serial loop checks before each cycle, so a hit on the final cycle
+    # of the run never triggers an exit.
+    stop[-1] &= not last_block
+    hits = np.flatnonzero(stop)
+    if hits.size == 0:
+        return rows, None, int(stale[-1])
+    row = int(hits[0])
+    reason = _early_exit(float(running[row]), bound_stop, int(stale[row]), patience)
+    return row + 1, reason, int(stale[row])
+
+
+def _count_block(
+    stats: dict[str, Any],
+    codes: list[str | None],
+    scores: "np.ndarray",
+    best_score: float,
+) -> None:
+    """Add one block's candidates, rejections and serial-order improvements to stats."""
+    stats["candidates"] += len(codes)
+    rejected = stats["rejected"]
+    for code in codes:
+        if code is not None:
+            rejected[code] = rejected.get(code, 0) + 1
+    running = np.maximum(np.maximum.accumulate(scores), best_score)
+    before = np.concatenate(([best_score], running[:-1]))
+    stats["improvements"] += int(np.count_nonzero(scores > before))
+
+
+def _counter_block_params(
+    counter_rng: CounterRNG,
+    cs: ConstraintSet,
+    cycles: "np.ndarray",
+    cycle_budget: int,
+) -> tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Array form of _draw_gaussian_params and _pick_calibration for the cycles
+    in `cycles`, reading the same counter addresses as the serial search.
+    Returns (peak, sigma, center, calibration).
+    """
+    n = cs.n_bins
+    counters = cycles + 1
+    max_second_deriv = cs.max_second_derivative
+
+    scale = 1.0 - (cycles.astype(np.float64) / max(cycle_budget, 1)) * 0.5
+    global_limit = cs.min_bin_limit * scale
+    peak = global_limit * counter_rng.random_array(counters, 0)
+    valid = (global_limit > 0.0) & (peak > 0.0) & (max_second_deriv > 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        min_sigma = np.sqrt(np.where(valid, peak / max_second_deriv, 0.0))
+    max_sigma = np.maximum(float(n), min_sigma + 0.1)
+    sigma = min_sigma + (max_sigma - min_sigma) * counter_rng.random_array(counters, 1)
+    center = float(n - 1) * counter_rng.random_array(counters, 2)
+
+    peak = np.where(valid, peak, 0.0)
+    sigma = np.where(valid, sigma, 1.0)
+    center = np.where(valid, center, 0.0)
+
+    calibration = np.empty((len(cycles), len(CALIBRATION_PARAMS)))
+    for j, (lo, hi) in enumerate(cs.calibration_sample_ranges.values()):
+        u = counter_rng.random_array(counters, CALIBRATION_DRAW_OFFSET + j)
+        calibration[:, j] = lo + (hi - lo) * u
+    return peak, sigma, center, calibration
+
+
+def search_gaussian(
+    rng,
+    baseline_torque_nm: list[float],
+    rpm_bins: list[int],
+    cs: ConstraintSet,
+    cycle_budget: int,
+    cycles_to_run: int,
+    deadline: float | None,
+    incumbent: dict[str, Any],
+    patience: int | None = None,
+    counter_rng: CounterRNG | None = None,
+    stats: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Vectorized counterpart of optimizer._search_gaussian (same in/out shape).
+    The deadline is checked between blocks of CHUNK_CYCLES candidates.
+    stats counts candidates, rejections and improvements as the serial
+    search would.
+    """
+    n = cs.n_bins
+    baseline = np.asarray(baseline_torque_nm, dtype=np.float64)
+    limit = np.asarray(cs.per_bin_limit, dtype=np.float64)
+    bins = np.arange(n, dtype=np.float64)
+
+    best = dict(incumbent)
+    cycles_used = 0
+    stopped_early = False
+    early_exit = None
+    stale_cycles = 0
+    bound_stop = cs.score_upper_bound - BOUND_TOLERANCE_NM
+
+    # validate_proposal rejects everything when these hold; mirror that cheaply.
+    hopeless = len(rpm_bins) != n or not cs.baseline_valid
+
+    for start in range(0, cycles_to_run, CHUNK_CYCLES):
+        early_exit = _early_exit(best["score"], bound_stop, stale_cycles, patience)
+        if early_exit is not None:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            stopped_early = True
+            logger.info("Deadline reached after %d cycles; stopping early", cycles_used)
+            break
+
+        stop = min(start + CHUNK_CYCLES, cycles_to_run)
+        rows = stop - start
+        if counter_rng is not None:
+            peak, sigma, center, calibration = _counter_block_params(
+                counter_rng, cs, np.arange(start, stop, dtype=np.int64), cycle_budget
+            )
+        else:
+            peak = np.zeros(rows)
+            sigma = np.ones(rows)
+            center = np.zeros(rows)
+            calibration = np.empty((rows, len(CALIBRATION_PARAMS)))
+
+            # RNG draws stay serial so the seed maps to the same candidates as "gaussian".
+            for row, cycle in enumerate(range(start, stop)):
+                scale = 1.0 - (cycle / max(cycle_budget, 1)) * 0.5
+                params = _draw_gaussian_params(rng, cs, scale)
+                if params is not None:
+                    peak[row], sigma[row], center[row] = params
+                picked = _pick_calibration(rng, cs)
+                calibration[row] = [picked[p] for p in CALIBRATION_PARAMS]
+        cycles_used = stop
+
+        if hopeless:
+            rows, early_exit, stale_cycles = _block_early_exit(
+                np.full(rows, -np.inf), best["score"], stale_cycles, bound_stop, patience,
+                stop == cycles_to_run,
+            )
+            cycles_used = start + rows
+            if stats is not None:
+                stats["candidates"] += rows
+            if early_exit is not None:
+                break
+            continue
+
+        offsets = (bins[None, :] - center[:, None]) / sigma[:, None]
+        deltas = peak[:, None] * np.exp(-0.5 * offsets ** 2)
+        deltas = np.maximum(np.minimum(deltas, limit), 0.0)
+
+        feasible, codes = _feasible_mask(
+            deltas, calibration, baseline_torque_nm, cs, with_codes=stats is not None
+        )
+        scores = np.where(feasible, (baseline + deltas).sum(axis=1), -np.inf)
+
+        rows, early_exit, stale_cycles = _block_early_exit(
+            scores, best["score"], stale_cycles, bound_stop, patience,
+            stop == cycles_to_run,
+        )
+        cycles_used = start + rows
+        scores = scores[:rows]
+        if stats is not None:
+            _count_block(stats, codes[:rows], scores, best["score"])
+
+        # Best first; a stable sort keeps the earliest cycle on ties.
+        for row in np.argsort(-scores, kind="stable"):
+            row = int(row)
+            if not feasible[row] or scores[row] <= best["score"]:
+                break
+            candidate_delta = deltas[row].tolist()
+            candidate_calibration = {
+                p: float(calibration[row, col]) for col, p in enumerate(CALIBRATION_PARAMS)
+            }
+            # Exact scalar re-check of the winner; also yields its warnings.
+            try:
+                warnings = validate_proposal(
+                    torque_delta_nm=candidate_delta,
+                    calibration=candidate_calibration,
+                    baseline_torque_nm=baseline_torque_nm,
+                    rpm_bins=rpm_bins,
+                    constraints=cs,
+                )
+            except ValidationError as exc:
+                logger.debug("Cycle %d: vectorized winner rejected by validator: %s", start + row, exc)
+                continue
+
+            best = {
+                "delta": candidate_delta,
+                "calibration": candidate_calibration,
+                "score": float(scores[row]),
+                "warnings": warnings,
+            }
+            logger.debug("Cycle %d: new best score=%.4f", start + row, best["score"])
+            break
+
+        if early_exit is not None:
+            break
+
+    if early_exit is not None:
+        logger.info("Early exit (%s) after %d cycles", early_exit, cycles_used)
+    best["cycles_used"] = cycles_used
+    best["stopped_early"] = stopped_early
+    best["early_exit"] = early_exit
+    return best
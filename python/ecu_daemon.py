@@ -0,0 +1,281 @@
+"""
+ecu_daemon.py
+
+Pre-forked ECU worker pool served over a Unix domain socket.
+
+Transport: clients connect to the socket and write newline-delimited
+           contract-v1.0 requests. Each request gets exactly one response
+           line, the same framing as `ecu_runner.py --session`.
+           A connection may carry any number of requests.
+           All logs go to stderr.
+
+Lifecycle:
+  1. The parent imports the ECU modules once and runs a warm-up request.
+  2. gc.freeze() moves everything allocated so far out of the collector's
+     reach, so forked workers keep sharing those copy-on-write pages.
+  3. N workers are forked. They all accept() on the same listening socket.
+  4. A worker exits after serving K requests; the parent forks a replacement.
+  5. SIGTERM / SIGINT drains: workers stop accepting, finish the request in
+     flight, and exit. The parent reaps them and removes the socket file.
+
+Usage:
+    python ecu_daemon.py --socket /tmp/dynomonsters-ecu.sock --workers 4 --max-requests 500
+
+POSIX only (requires os.fork and AF_UNIX).
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import signal
+import socket
+import time
+
+from ecu_runner import CONTRACT_VERSION, encode_response, handle_payload
+
+logger = logging.getLogger("ecu_daemon")
+
+DEFAULT_SOCKET_PATH = "/tmp/dynomonsters-ecu.sock"
+DEFAULT_MAX_REQUESTS = 1000
+DEFAULT_DRAIN_TIMEOUT_S = 10.0
+
+# How often blocked workers and the parent re-check the drain flag.
+_POLL_INTERVAL_S = 0.2
+_RECV_CHUNK = 65536
+
+# Small but complete request used to exercise every import and code path
+# before forking, so workers inherit warm modules instead of loading them.
+_WARMUP_REQUEST = {
+    "contract_version": CONTRACT_VERSION,
+    "request_id": "daemon-warmup",
+    "seed": 0,
+    "cycle_budget": 4,
+    "baseline_curve": {
+        "rpm_bins": [1000, 2000, 3000, 4000, 5000],
+        "torque_nm": [180.0, 200.0, 220.0, 210.0, 190.0],
+    },
+    "constraints": {
+        "max_peak_gain_ratio": 0.02,
+        "max_bin_delta_nm": 8.0,
+        "max_bin_delta_ratio": 0.03,
+        "smoothness": {"max_second_derivative": 0.15},
+        "calibration_ranges": {},
+    },
+}
+
+_draining = False
+
+
+def _request_drain(signum, frame) -> None:
+    global _draining
+    _draining = True
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+def _serve_connection(conn: socket.socket, budget: int) -> int:
+    """
+    Answer newline-delimited requests on one connection.
+
+    Stops after `budget` requests, when the peer closes, or when a drain is
+    requested between requests. Returns the number of requests served.
+    """
+    conn.settimeout(_POLL_INTERVAL_S)
+    buffer = bytearray()
+    served = 0
+
+    while served < budget and not _draining:
+        newline = buffer.find(b"\n")
+        if newline < 0:
+            try:
+                chunk = conn.recv(_RECV_CHUNK)
+            except socket.timeout:
+                continue
+            if not chunk:
+                break
+            buffer += chunk
+            continue
+
+        line = bytes(buffer[:newline]).decode("utf-8", errors="replace")
+        del buffer[: newline + 1]
+        if not line.strip():
+            continue
+
+        response, _ = handle_payload(line)
+        conn.sendall(encode_response(response).encode("utf-8") + b"\n")
+        served += 1
+
+    return served
+
+
+def _worker_loop(listener: socket.socket, max_requests: int) -> None:
+    """Accept and serve connections until recycled or drained. Never returns."""
+    signal.signal(signal.SIGTERM, _request_drain)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    pid = os.getpid()
+    served = 0
+    logger.info("Worker %d ready (max_requests=%d)", pid, max_requests)
+
+    while served < max_requests and not _draining:
+        try:
+            conn, _ = listener.accept()
+        except socket.timeout:
+            continue
+        except OSError as exc:
+            logger.error("Worker %d accept failed: %s", pid, exc)
+            break
+        with conn:
+            try:
+                served += _serve_connection(conn, max_requests - served)
+            except OSError as exc:
+                logger.warning("Worker %d connection error: %s", pid, exc)
+
+    reason = "draining" if _draining else "recycling"
+    logger.info("Worker %d exiting (%s) after %d request(s)", pid, reason, served)
+    os._exit(0)
+
+
+def _spawn_worker(listener: socket.socket, max_requests: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _worker_loop(listener, max_requests)
+        finally:
+            os._exit(1)
+    return pid
+
+
+# ── Parent ────────────────────────────────────────────────────────────────────
+
+def _warm_up() -> None:
+    t_start = time.monotonic()
+    response, _ = handle_payload(json.dumps(_WARMUP_REQUEST))
+    if response["status"] != "ok":
+        logger.warning("Warm-up request returned status=%s", response["status"])
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        "Warm-up complete in %.2f ms; %d objects frozen for copy-on-write sharing",
+        (time.monotonic() - t_start) * 1000,
+        gc.get_freeze_count(),
+    )
+
+
+def _bind(socket_path: str, backlog: int) -> socket.socket:
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(backlog)
+    # Workers block in accept() with a timeout so they can notice a drain.
+    listener.settimeout(_POLL_INTERVAL_S)
+    return listener
+
+
+def _drain(workers: set[int], timeout_s: float) -> None:
+    for pid in workers:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    deadline = time.monotonic() + timeout_s
+    while workers and time.monotonic() < deadline:
+        pid, _ = os.waitpid(-1, os.WNOHANG)
+        if pid == 0:
+            time.sleep(_POLL_INTERVAL_S / 4)
+            continue
+        workers.discard(pid)
+
+    for pid in workers:
+        logger.warning("Worker %d did not drain in %.1fs; killing", pid, timeout_s)
+        try:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+
+
+def serve(
+    socket_path: str = DEFAULT_SOCKET_PATH,
+    workers: int | None = None,
+    max_requests: int = DEFAULT_MAX_REQUESTS,
+    drain_timeout_s: float = DEFAULT_DRAIN_TIMEOUT_S,
+) -> None:
+    """Run the pre-forked daemon until SIGTERM / SIGINT."""
+    global _draining
+
+    n_workers = workers or os.cpu_count() or 1
+    if n_workers < 1:
+        raise ValueError(f"workers must be >= 1, got {n_workers}")
+    if max_requests < 1:
+        raise ValueError(f"max_requests must be >= 1, got {max_requests}")
+
+    _draining = False
+    signal.signal(signal.SIGTERM, _request_drain)
+    signal.signal(signal.SIGINT, _request_drain)
+
+    _warm_up()
+    listener = _bind(socket_path, backlog=max(16, n_workers * 4))
+    logger.info(
+        "ECU daemon listening on %s with %d worker(s), recycling after %d request(s)",
+        socket_path, n_workers, max_requests,
+    )
+
+    live: set[int] = set()
+    try:
+        for _ in range(n_workers):
+            live.add(_spawn_worker(listener, max_requests))
+
+        while not _draining:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                time.sleep(_POLL_INTERVAL_S / 4)
+                continue
+            live.discard(pid)
+            if os.waitstatus_to_exitcode(status) != 0:
+                logger.error("Worker %d exited abnormally (status=%d)", pid, status)
+            if not _draining:
+                live.add(_spawn_worker(listener, max_requests))
+
+        logger.info("Drain requested; stopping %d worker(s)", len(live))
+        _drain(live, drain_timeout_s)
+    finally:
+        listener.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        logger.info("ECU daemon stopped")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Pre-forked ECU worker pool (Unix socket)")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket path")
+    parser.add_argument("--workers", type=int, default=None, help="worker count (default: CPU count)")
+    parser.add_argument(
+        "--max-requests", type=int, default=DEFAULT_MAX_REQUESTS,
+        help="recycle a worker after this many requests",
+    )
+    parser.add_argument(
+        "--drain-timeout", type=float, default=DEFAULT_DRAIN_TIMEOUT_S,
+        help="seconds to wait for workers on SIGTERM before killing them",
+    )
+    args = parser.parse_args(argv)
+
+    # Lifecycle logs (warm-up, listening, recycling, drain) go to stderr.
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    serve(
+        socket_path=args.socket,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        drain_timeout_s=args.drain_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+ecu_http.py
+
+Phase 1 local HTTP transport for the ECU (docs/20_ARCHITECTURE.md §9.2).
+
+Transport: HTTP/1.1, stdlib asyncio only.
+           POST /ecu with a contract-v1.0 request body.
+           The response body is the contract-v1.0 response JSON.
+           Connections are kept alive unless the client asks otherwise.
+           Each request (line, headers and body) must arrive within the
+           keep-alive timeout, or the connection is closed.
+           All logs go to stderr.
+
+Concurrency:
+  - process_request runs in a process pool, never on the event loop.
+  - A semaphore caps in-flight work at max_in_flight.
+  - At most max_queue further requests may wait for a slot. Anything beyond
+    that is answered immediately with status=error, code=OVERLOADED
+    (HTTP 503), so latency stays bounded instead of growing with the backlog.
+
+Usage:
+    python ecu_http.py --port 8765 --max-in-flight 4 --max-queue 8
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable
+
+from ecu_runner import _error_response, encode_response, handle_payload
+
+logger = logging.getLogger("ecu_http")
+
+ECU_PATH = "/ecu"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_KEEPALIVE_TIMEOUT_S = 15.0
+MAX_BODY_BYTES = 4 * 1024 * 1024
+MAX_HEADER_LINES = 100
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    503: "Service Unavailable",
+}
+
+
+class _HttpError(Exception):
+    """Malformed HTTP; answered with an error response and the connection closed."""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def _peek_request_id(body: bytes) -> str:
+    """Best-effort request_id for responses produced without running the ECU."""
+    try:
+        req = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return "unknown"
+    if isinstance(req, dict) and isinstance(req.get("request_id"), str):
+        return req["request_id"]
+    return "unknown"
+
+
+class EcuHttpServer:
+    """
+    Minimal HTTP/1.1 front end for handle_payload with bounded concurrency.
+
+    handler must be a picklable callable taking the raw body text and
+    returning (response, exit_code), i.e. ecu_runner.handle_payload.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        executor: Executor | None = None,
+        handler: Callable[[str], tuple[dict[str, Any], int]] = handle_payload,
+        keepalive_timeout_s: float = DEFAULT_KEEPALIVE_TIMEOUT_S,
+    ):
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be >= 1, got {max_in_flight}")
+        if max_queue < 0:
+            raise ValueError(f"max_queue must be >= 0, got {max_queue}")
+
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.keepalive_timeout_s = keepalive_timeout_s
+        self._handler = handler
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(max_workers=max_in_flight)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Requests currently running or waiting for a slot."""
+        return self._pending
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        sockname = server.sockets[0].getsockname()
+        logger.info(
+            "ECU HTTP server listening on http://%s:%d%s (max_in_flight=%d, max_queue=%d)",
+            sockname[0], sockname[1], ECU_PATH, self.max_in_flight, self.max_queue,
+        )
+        return server
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    # ── Request execution ─────────────────────────────────────────────────────
+
+    async def _dispatch(self, body: bytes) -> tuple[int, dict[str, Any]]:
+        if self._pending >= self.max_in_flight + self.max_queue:
+            logger.warning("Overloaded: %d request(s) pending; rejecting", self._pending)
+            return 503, _error_response(
+                _peek_request_id(body),
+                "OVERLOADED",
+                f"ECU queue full ({self._pending} pending); retry later",
+            )
+
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                response, _ = await loop.run_in_executor(
+                    self._executor, self._handler, body.decode("utf-8", errors="replace")
+                )
+        except Exception as exc:
+            logger.error("ECU worker failed: %s", exc, exc_info=True)
+            response = _error_response(_peek_request_id(body), "UNHANDLED_ERROR", str(exc))
+        finally:
+            self._pending -= 1
+        return 200, response
+
+    # ── HTTP framing ──────────────────────────────────────────────────────────
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[str, str, str, dict[str, str], bytes] | None:
+        """
+        Read one request. Returns None when the client closed the connection
+        or did not send a whole request within the keep-alive timeout.
+        """
+        try:
+            return await asyncio.wait_for(
+                self._read_request_unbounded(reader), timeout=self.keepalive_timeout_s
+            )
+        except asyncio.TimeoutError:
+            return None
+
+    @staticmethod
+    async def _readline(reader: asyncio.StreamReader, status: int, code: str) -> bytes:
+        # readline() raises ValueError when a line exceeds the reader's limit.
+        try:
+            return await reader.readline()
+        except ValueError:
+            raise _HttpError(status, code, "Line too long")
+
+    async def _read_request_unbounded(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[str, str, str, dict[str, str], bytes] | None:
+        request_line = await self._readline(reader, 400, "HTTP_BAD_REQUEST")
+        if not request_line:
+            return None
+
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise _HttpError(400, "HTTP_BAD_REQUEST", "Malformed request line")
+        method, target, version = parts
+
+        headers: dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await self._readline(reader, 431, "HTTP_HEADER_TOO_LARGE")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, sep, value = line.decode("latin-1").partition(":")
+            if not sep:
+                raise _HttpError(400, "HTTP_BAD_REQUEST", "Malformed header line")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise _HttpError(400, "HTTP_BAD_REQUEST", "Too many header lines")
+
+        # Bodies of other methods are read too (and later ignored), so the
+        # next request on the connection starts at the right byte.
+        if "transfer-encoding" in headers:
+            raise _HttpError(411, "HTTP_LENGTH_REQUIRED", "Chunked bodies are not supported")
+        if "content-length" not in headers:
+            if method == "POST":
+                raise _HttpError(411, "HTTP_LENGTH_REQUIRED", "Content-Length is required")
+            return method, target, version, headers, b""
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            raise _HttpError(400, "HTTP_BAD_REQUEST", "Invalid Content-Length")
+        if length < 0 or length > MAX_BODY_BYTES:
+            raise _HttpError(413, "HTTP_BODY_TOO_LARGE", f"Body exceeds {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length)
+
+        return method, target, version, headers, body
+
+    @staticmethod
+    def _keep_alive(version: str, headers: dict[str, str]) -> bool:
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    @staticmethod
+    async def _write_response(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: dict[str, Any],
+        keep_alive: bool,
+    ) -> None:
+        body = encode_response(payload).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except _HttpError as exc:
+                    await self._write_response(
+                        writer, exc.status, _error_response("unknown", exc.code, str(exc)), False
+                    )
+                    break
+                except asyncio.IncompleteReadError:
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers, body = request
+                keep_alive = self._keep_alive(version, headers)
+
+                if target.split("?", 1)[0] != ECU_PATH:
+                    status, payload = 404, _error_response(
+                        "unknown", "HTTP_NOT_FOUND", f"POST requests to {ECU_PATH}"
+                    )
+                elif method != "POST":
+                    status, payload = 405, _error_response(
+                        "unknown", "HTTP_METHOD_NOT_ALLOWED", "Only POST is supported"
+                    )
+                else:
+                    status, payload = await self._dispatch(body)
+
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def _serve_forever(server: EcuHttpServer, host: str, port: int) -> None:
+    listener = await server.start(host, port)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="ECU contract v1.0 over local HTTP")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--max-in-flight", type=int, default=os.cpu_count() or 1,
+        help="concurrent process_request calls (process pool size)",
+    )
+    parser.add_argument(
+        "--max-queue", type=int, default=None,
+        help="requests allowed to wait for a slot before OVERLOADED (default: 2x max-in-flight)",
+    )
+    args = parser.parse_args(argv)
+
+    max_queue = args.max_queue if args.max_queue is not None else 2 * args.max_in_flight
+    server = EcuHttpServer(max_in_flight=args.max_in_flight, max_queue=max_queue)
+    try:
+        asyncio.run(_serve_forever(server, args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("ECU HTTP server stopped")
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
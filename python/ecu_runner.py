@@ -7,34 +7,105 @@ Transport: Unity writes one JSON request to stdin.
            Python writes one JSON response to stdout.
            All logs go to stderr.
 
+Session mode (--session): the process stays alive and reads newline-delimited
+JSON requests from stdin, writing one response line per request and flushing
+after each, so the client can keep one warm ECU process per game session.
+
+Batch envelope: a payload of the form {"batch": [request, ...]} is answered
+with {"contract_version": "1.0", "batch": [response, ...]} in input order.
+
 Contract version: 1.0  (see docs/ECU_CONTRACT.md)
 
 Unity is authoritative. This service proposes only.
+
+Cold start: every subprocess request pays for the imports below, so the
+optimizer, validator, caches and profiler are imported where they are first
+used. Input errors such as EMPTY_INPUT and JSON_PARSE_ERROR are answered
+without importing them. tests/test_import_time.py checks the budget.
 """
 
+from __future__ import annotations
+
+import copy
 import json
 import logging
 import math
+import os
 import sys
 import time
-import traceback
-from typing import Any
+from typing import Any, TextIO
 
-# ── Logging setup ─────────────────────────────────────────────────────────────
 # All logs MUST go to stderr. stdout is reserved for the JSON response only.
-logging.basicConfig(
-    stream=sys.stderr,
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
+# Logging is configured in main(), so importing this module configures nothing.
 logger = logging.getLogger("ecu_runner")
 
-# ── Import ECU modules ────────────────────────────────────────────────────────
-from ecu.optimizer import run_optimization
-from ecu.validator import validate_proposal, ValidationError
-
 CONTRACT_VERSION = "1.0"
 
+# Processes a sharded request ("shards" > 1) may use; results do not depend on it.
+_shard_workers = int(os.environ.get("ECU_SHARD_WORKERS", "1"))
+
+# ── Per-process state (created lazily) ────────────────────────────────────────
+# The ECU modules are imported inside the functions that use them, so input
+# errors never load them. These are created, and their modules imported, by the
+# _get_* accessors on first use.
+
+_result_cache = None
+_proposal_store = None
+_profiler = None
+
+
+def _get_result_cache():
+    """
+    Return the process-wide result cache, creating it on first use.
+
+    Proposals are a pure function of the request inputs (ECU_CONTRACT.md §6),
+    so optimizer results are cached across requests in session/daemon/HTTP
+    modes. ECU_CACHE_DIR enables the on-disk layer, shared across processes.
+    """
+    global _result_cache
+    if _result_cache is None:
+        from ecu.cache import ResultCache
+
+        _result_cache = ResultCache(
+            max_entries=int(os.environ.get("ECU_CACHE_SIZE", "256")),
+            disk_dir=os.environ.get("ECU_CACHE_DIR") or None,
+            max_disk_bytes=int(os.environ.get("ECU_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        )
+    return _result_cache
+
+
+def _get_proposal_store():
+    """
+    Return the last-proposal-per-vehicle_id store, for "warm_start": true.
+
+    With ECU_CACHE_DIR it persists in its proposals/ subdirectory, so repeat
+    pulls warm-start across subprocesses and daemon or HTTP workers.
+    """
+    global _proposal_store
+    if _proposal_store is None:
+        from ecu.cache import ProposalStore
+
+        cache_dir = os.environ.get("ECU_CACHE_DIR") or None
+        _proposal_store = ProposalStore(
+            max_entries=int(os.environ.get("ECU_PROPOSAL_STORE_SIZE", "256")),
+            disk_dir=os.path.join(cache_dir, "proposals") if cache_dir else None,
+        )
+    return _proposal_store
+
+
+def _get_profiler():
+    """
+    Return the request profiler: it profiles requests that set debug.profile,
+    and 1 in ECU_PROFILE_EVERY payloads (a batch counts once) when ECU_PROFILE
+    is set. Reports go to ECU_PROFILE_DIR or stderr.
+    """
+    global _profiler
+    if _profiler is None:
+        from ecu.profiling import Profiler
+
+        _profiler = Profiler.from_env()
+    return _profiler
+
 
 # ── Response builders ─────────────────────────────────────────────────────────
 
@@ -97,6 +168,9 @@ def _validate_request_schema(req: dict) -> None:
     Validate the top-level structure of the incoming request.
     Raises ValueError with a descriptive message on any violation.
     """
+    from ecu.optimizer import DEADLINE_MODES, RNG_MODES, STRATEGIES
+    from ecu.profiling import PROFILE_MODES
+
     version = _require_key(req, "contract_version", "request")
     if version != CONTRACT_VERSION:
         raise ValueError(
@@ -145,16 +219,178 @@ def _validate_request_schema(req: dict) -> None:
     if not isinstance(seed, int):
         raise ValueError(f"seed must be an integer, got {seed!r}")
 
+    # Optional anytime controls
+    deadline_ms = req.get("deadline_ms")
+    if deadline_ms is not None and (
+        isinstance(deadline_ms, bool)
+        or not isinstance(deadline_ms, (int, float))
+        or not math.isfinite(deadline_ms)
+        or deadline_ms <= 0
+    ):
+        raise ValueError(f"deadline_ms must be a positive number, got {deadline_ms!r}")
+
+    deadline_mode = req.get("deadline_mode", "wallclock")
+    if deadline_mode not in DEADLINE_MODES:
+        raise ValueError(
+            f"deadline_mode must be one of {list(DEADLINE_MODES)}, got {deadline_mode!r}"
+        )
+
+    cycle_limit = req.get("cycle_limit")
+    if cycle_limit is not None and (
+        isinstance(cycle_limit, bool) or not isinstance(cycle_limit, int) or cycle_limit < 1
+    ):
+        raise ValueError(f"cycle_limit must be a positive integer, got {cycle_limit!r}")
+
+    strategy = req.get("strategy", "gaussian")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {list(STRATEGIES)}, got {strategy!r}")
+
+    rng_mode = req.get("rng", "sequential")
+    if rng_mode not in RNG_MODES:
+        raise ValueError(f"rng must be one of {list(RNG_MODES)}, got {rng_mode!r}")
+
+    patience = req.get("patience")
+    if patience is not None and (
+        isinstance(patience, bool) or not isinstance(patience, int) or patience < 1
+    ):
+        raise ValueError(f"patience must be a positive integer, got {patience!r}")
+
+    shards = req.get("shards")
+    if shards is not None and (
+        isinstance(shards, bool) or not isinstance(shards, int) or shards < 1
+    ):
+        raise ValueError(f"shards must be a positive integer, got {shards!r}")
+    if shards is not None and shards > 1 and (
+        cycle_limit is not None or deadline_mode == "checkpoint"
+    ):
+        raise ValueError("shards cannot be combined with cycle_limit or deadline_mode 'checkpoint'")
+
+    debug = req.get("debug")
+    if debug is not None:
+        if not isinstance(debug, dict):
+            raise ValueError(f"debug must be an object, got {type(debug).__name__}")
+        if not isinstance(debug.get("timings", False), bool):
+            raise ValueError(f"debug.timings must be a boolean, got {debug['timings']!r}")
+        profile = debug.get("profile", False)
+        if not isinstance(profile, bool) and profile not in PROFILE_MODES:
+            raise ValueError(
+                f"debug.profile must be a boolean or one of {PROFILE_MODES}, got {profile!r}"
+            )
+
+    warm_start = req.get("warm_start")
+    if warm_start is not None and not isinstance(warm_start, bool):
+        if not isinstance(warm_start, dict):
+            raise ValueError(
+                f"warm_start must be a boolean or an object, got {type(warm_start).__name__}"
+            )
+        deltas = _require_key(warm_start, "torque_delta_nm", "warm_start")
+        if not isinstance(deltas, list) or any(
+            isinstance(d, bool) or not isinstance(d, (int, float)) or not math.isfinite(d)
+            for d in deltas
+        ):
+            raise ValueError("warm_start.torque_delta_nm must be a list of finite numbers")
+
+
+def _timings_requested(req: dict) -> bool:
+    debug = req.get("debug")
+    return isinstance(debug, dict) and debug.get("timings") is True
+
+
+def _requested_profile_mode(req: dict) -> str | None:
+    """Profile mode the request asks for in debug.profile (None: none or invalid)."""
+    from ecu.profiling import resolve_mode
+
+    debug = req.get("debug")
+    return resolve_mode(debug.get("profile")) if isinstance(debug, dict) else None
+
+
+def _sampled_profile_mode() -> str | None:
+    """ECU_PROFILE sampler's mode for the next payload; imports nothing when off."""
+    if _profiler is None and not os.environ.get("ECU_PROFILE"):
+        return None
+    return _get_profiler().select()
+
+
+def _elapsed_ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 3)
+
+
+def _vehicle_id(req: dict) -> str | None:
+    vehicle = req.get("vehicle")
+    vehicle_id = vehicle.get("vehicle_id") if isinstance(vehicle, dict) else None
+    return vehicle_id if isinstance(vehicle_id, str) else None
+
+
+def _resolve_warm_start(req: dict) -> dict:
+    """
+    Return req with warm_start in canonical form: {"torque_delta_nm": [...]}
+    or absent. "warm_start": true is replaced by the stored proposal for
+    vehicle.vehicle_id, so the cache key reflects the delta actually used.
+    """
+    warm_start = req.get("warm_start")
+    if isinstance(warm_start, dict):
+        return req
+    resolved = {k: v for k, v in req.items() if k != "warm_start"}
+    if warm_start is True:
+        vehicle_id = _vehicle_id(req)
+        stored = _get_proposal_store().get(vehicle_id) if vehicle_id is not None else None
+        if stored is not None:
+            resolved["warm_start"] = {"torque_delta_nm": stored}
+    return resolved
+
+
+def _prepare_constraints(
+    req: dict,
+    baseline_torque_nm: list[float],
+    prepared: dict[str, Any] | None = None,
+) -> tuple[Any, tuple[str, str | None]]:
+    """
+    Compile req's constraints and run the feasibility pre-check for its strategy.
+
+    Returns (compiled, (verdict, reason)). prepared, when given, memoizes both
+    across requests with the same baseline and constraints (process_batch), so
+    entries that differ only in seed or budget share them.
+    """
+    from ecu.constraints import compile_constraints
+    from ecu.feasibility import analyze_feasibility
+
+    strategy = req.get("strategy", "gaussian")
+    if prepared is None:
+        compiled = compile_constraints(req["constraints"], baseline_torque_nm)
+        return compiled, analyze_feasibility(compiled, strategy)
+
+    key = json.dumps([baseline_torque_nm, req["constraints"]], sort_keys=True)
+    entry = prepared.get(key)
+    if entry is None:
+        entry = prepared[key] = (compile_constraints(req["constraints"], baseline_torque_nm), {})
+    compiled, verdicts = entry
+    if strategy not in verdicts:
+        verdicts[strategy] = analyze_feasibility(compiled, strategy)
+    return compiled, verdicts[strategy]
+
 
 # ── Main processing ───────────────────────────────────────────────────────────
 
-def process_request(req: dict) -> dict[str, Any]:
+def process_request(req: dict, parse_ms: float | None = None) -> dict[str, Any]:
     """
     Core processing pipeline.
     Returns a fully-formed response dict.
+
+    parse_ms is the time the caller spent decoding the request JSON; it is
+    only reported in metrics.timings (request field debug.timings).
+
+    debug.profile profiles the request from schema validation onward, unless
+    the caller (handle_payload, for a sampled payload) already profiles it.
     """
     request_id: str = req.get("request_id", "unknown")
+    with _get_profiler().run(_requested_profile_mode(req), str(request_id)):
+        return _process_request(req, request_id, parse_ms)
+
+
+def _process_request(req: dict, request_id: str, parse_ms: float | None) -> dict[str, Any]:
+    """process_request without the profiling scope."""
     t_start = time.monotonic()
+    t_schema = time.perf_counter() if _timings_requested(req) else None
 
     # ── Schema validation ─────────────────────────────────────────────────────
     try:
@@ -163,36 +399,106 @@ def process_request(req: dict) -> dict[str, Any]:
         logger.warning("Request schema validation failed: %s", exc)
         return _error_response(request_id, "SCHEMA_ERROR", str(exc))
 
+    timings = None
+    if t_schema is not None:
+        timings = {"parse_ms": parse_ms, "schema_ms": _elapsed_ms(t_schema)}
+    return _process_validated(_resolve_warm_start(req), t_start, timings)
+
+
+def _process_validated(
+    req: dict,
+    t_start: float,
+    timings: dict[str, Any] | None = None,
+    prepared: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Optimize and self-validate a request that already passed schema validation.
+    t_start is the monotonic timestamp runtime_ms is measured from. timings,
+    when given, holds the stages measured so far and is completed and
+    returned as metrics.timings. prepared is passed to _prepare_constraints.
+    """
+    from ecu.cache import proposal_key
+    from ecu.feasibility import INFEASIBLE
+    from ecu.optimizer import run_optimization
+    from ecu.validator import ValidationError, validate_proposal
+
+    request_id: str = req["request_id"]
     seed: int = req["seed"]
     cycle_budget: int = req["cycle_budget"]
     baseline_curve: dict = req["baseline_curve"]
     rpm_bins: list[int] = baseline_curve["rpm_bins"]
     baseline_torque_nm: list[float] = [float(t) for t in baseline_curve["torque_nm"]]
-    constraints: dict = req["constraints"]
+    deadline_ms: float | None = req.get("deadline_ms")
+    deadline_mode: str = req.get("deadline_mode", "wallclock")
 
     logger.info(
         "Processing request_id=%s seed=%d cycle_budget=%d bins=%d",
         request_id, seed, cycle_budget, len(rpm_bins),
     )
 
-    # ── Run optimizer ─────────────────────────────────────────────────────────
+    t_optimize = time.perf_counter() if timings is not None else None
+    search_stats = None
+
+    # Compiled once; shared by the optimizer and the final self-validation.
+    # The feasibility pre-check (O(n)) rejects what no proposal can satisfy.
     try:
-        result = run_optimization(
-            baseline_torque_nm=baseline_torque_nm,
-            rpm_bins=rpm_bins,
-            constraints=constraints,
-            cycle_budget=cycle_budget,
-            seed=seed,
-        )
+        compiled, (verdict, reason) = _prepare_constraints(req, baseline_torque_nm, prepared)
     except Exception as exc:
-        logger.error("Optimizer raised an unexpected error: %s", exc, exc_info=True)
+        logger.error("Could not compile constraints: %s", exc, exc_info=True)
         return _error_response(request_id, "OPTIMIZER_ERROR", str(exc))
 
+    if verdict == INFEASIBLE:
+        logger.warning("Request %s is infeasible: %s", request_id, reason)
+        return _rejected_response(
+            request_id,
+            warnings=[reason],
+            notes=["Feasibility pre-check: no proposal can satisfy the constraints. Returning rejected."],
+        )
+
+    # ── Run optimizer (or reuse a cached result for identical inputs) ────────
+    result_cache = _get_result_cache()
+    cache_key = proposal_key(req)
+    result = result_cache.get(cache_key)
+    cache_hit = result is not None
+    if not cache_hit:
+        # The deadline covers the whole request, so hand the optimizer what is left.
+        remaining_ms = None
+        if deadline_ms is not None:
+            remaining_ms = max(0.0, deadline_ms - (time.monotonic() - t_start) * 1000)
+        try:
+            result = run_optimization(
+                baseline_torque_nm=baseline_torque_nm,
+                rpm_bins=rpm_bins,
+                constraints=compiled,
+                cycle_budget=cycle_budget,
+                seed=seed,
+                deadline_ms=remaining_ms,
+                deadline_mode=deadline_mode,
+                cycle_limit=req.get("cycle_limit"),
+                strategy=req.get("strategy", "gaussian"),
+                rng_mode=req.get("rng", "sequential"),
+                patience=req.get("patience"),
+                warm_start=req.get("warm_start", {}).get("torque_delta_nm"),
+                shards=req.get("shards"),
+                workers=_shard_workers,
+                collect_stats=timings is not None,
+            )
+        except Exception as exc:
+            logger.error("Optimizer raised an unexpected error: %s", exc, exc_info=True)
+            return _error_response(request_id, "OPTIMIZER_ERROR", str(exc))
+        # Diagnostics only; cache entries hold the proposal inputs' result.
+        search_stats = result.pop("search_stats", None)
+        # An early stop depends on wall time, not only on the inputs.
+        if not result["stopped_early"]:
+            result_cache.put(cache_key, result)
+
     torque_delta_nm: list[float] = result["torque_delta_nm"]
     calibration: dict[str, float] = result["calibration"]
     warnings: list[str] = result["warnings"]
     cycles_used: int = result["cycles_used"]
     best_score: float = result["best_score"]
+    optimize_ms = _elapsed_ms(t_optimize) if timings is not None else None
+    t_validate = time.perf_counter() if timings is not None else None
 
     # ── Final self-validation (mirrors Unity's checks) ────────────────────────
     try:
@@ -201,7 +507,7 @@ def process_request(req: dict) -> dict[str, Any]:
             calibration=calibration,
             baseline_torque_nm=baseline_torque_nm,
             rpm_bins=rpm_bins,
-            constraints=constraints,
+            constraints=compiled,
         )
         warnings = list(set(warnings + final_warnings))
     except ValidationError as exc:
@@ -236,12 +542,54 @@ def process_request(req: dict) -> dict[str, Any]:
         "cycles_used": cycles_used,
         "runtime_ms": runtime_ms,
         "best_score": best_score,
+        "strategy": result["strategy"],
+        "bound_gap": result["bound_gap"],
+        "warm_started": result["warm_started"],
+        "cache": {"hit": cache_hit, **result_cache.stats()},
     }
+    if timings is not None:
+        metrics["timings"] = {
+            **timings,
+            "optimize_ms": optimize_ms,
+            "final_validate_ms": _elapsed_ms(t_validate),
+            "serialize_ms": None,  # filled in by encode_response
+            "search": search_stats,
+        }
 
     notes = [
         f"ECU stub v{CONTRACT_VERSION}",
         f"Optimization completed in {cycles_used} cycles",
     ]
+    if cache_hit:
+        notes.append("Served from result cache")
+    if result["stopped_early"]:
+        note = (
+            f"Deadline of {deadline_ms} ms reached: stopped early after "
+            f"{cycles_used} of {cycle_budget} cycles"
+        )
+        if deadline_mode == "checkpoint":
+            note += f" (replay with cycle_limit={cycles_used})"
+        notes.append(note)
+    if result.get("shards", 1) > 1:
+        notes.append(f"Budget split across {result['shards']} shards")
+    if result["warm_started"]:
+        notes.append("Search warm-started from a previous proposal")
+    if result["early_exit"] == "pre_check":
+        notes.append(f"Feasibility pre-check: {result['pre_check']}. Skipped the search")
+    if result["early_exit"] == "bound":
+        notes.append(f"Reached the score upper bound after {cycles_used} cycles")
+    elif result["early_exit"] == "patience":
+        from ecu.optimizer import WARM_START_PATIENCE
+
+        patience = req.get("patience") or WARM_START_PATIENCE
+        notes.append(
+            f"No improvement for {patience} cycles: stopped after "
+            f"{cycles_used} of {cycle_budget} cycles"
+        )
+
+    vehicle_id = _vehicle_id(req)
+    if vehicle_id is not None:
+        _get_proposal_store().put(vehicle_id, torque_delta_nm)
 
     logger.info(
         "Request %s complete: status=ok runtime_ms=%.2f peak_gain=%.4f",
@@ -253,47 +601,217 @@ def process_request(req: dict) -> dict[str, Any]:
     return _ok_response(request_id, proposal, metrics, warnings, notes)
 
 
+# ── Batch processing ──────────────────────────────────────────────────────────
+
+def process_batch(requests: list) -> list[dict[str, Any]]:
+    """
+    Process many requests in one call.
+
+    Every request is schema-validated on its own. Requests whose proposal
+    inputs and deadline are identical (everything but request_id) are
+    optimized once and share the result; the deadline is part of the key
+    because a run it cut short must not answer a request without one.
+    Requests with the same baseline and constraints share the compiled
+    constraint set and feasibility pre-check, so only their search runs.
+    Responses are returned in input order, and each one is identical in its
+    proposal fields to a serial process_request call.
+    """
+    from ecu.cache import proposal_key
+
+    responses: list[dict[str, Any]] = []
+    computed: dict[tuple, dict[str, Any]] = {}
+    prepared: dict[str, Any] = {}
+
+    for req in requests:
+        if not isinstance(req, dict):
+            responses.append(_error_response(
+                "unknown", "INVALID_REQUEST_TYPE", "Batch entries must be JSON objects"
+            ))
+            continue
+
+        t_start = time.monotonic()
+        t_schema = time.perf_counter() if _timings_requested(req) else None
+        request_id = req.get("request_id", "unknown")
+        try:
+            _validate_request_schema(req)
+        except ValueError as exc:
+            logger.warning("Batch entry %s failed schema validation: %s", request_id, exc)
+            responses.append(_error_response(request_id, "SCHEMA_ERROR", str(exc)))
+            continue
+
+        timings = None
+        if t_schema is not None:
+            # The envelope is parsed once, so entries carry no parse time.
+            timings = {"parse_ms": None, "schema_ms": _elapsed_ms(t_schema)}
+        req = _resolve_warm_start(req)
+        key = (proposal_key(req), req.get("deadline_ms"), req.get("deadline_mode", "wallclock"))
+        shared = computed.get(key)
+        if shared is None:
+            try:
+                with _get_profiler().run(_requested_profile_mode(req), request_id):
+                    response = _process_validated(req, t_start, timings, prepared)
+            except Exception as exc:
+                logger.critical("Unhandled exception in batch entry %s: %s", request_id, exc, exc_info=True)
+                response = _error_response(request_id, "UNHANDLED_ERROR", str(exc))
+            computed[key] = response
+        else:
+            response = copy.deepcopy(shared)
+            response["request_id"] = request_id
+            if isinstance(response.get("metrics"), dict):
+                response["metrics"].pop("timings", None)
+                if timings is not None:
+                    response["metrics"]["timings"] = {
+                        **timings,
+                        "optimize_ms": None,
+                        "final_validate_ms": None,
+                        "serialize_ms": None,
+                        "search": None,
+                    }
+            response["debug"]["notes"].append(
+                f"Reused result of identical batch request {shared['request_id']}"
+            )
+        responses.append(response)
+
+    logger.info(
+        "Batch complete: %d request(s), %d distinct optimization(s), %d constraint set(s)",
+        len(responses), len(computed), len(prepared),
+    )
+    return responses
+
+
+def _batch_response(batch: list) -> dict[str, Any]:
+    return {
+        "contract_version": CONTRACT_VERSION,
+        "batch": process_batch(batch),
+    }
+
+
 # ── Entry point ───────────────────────────────────────────────────────────────
 
-def main() -> None:
-    logger.info("ECU runner started. Waiting for request on stdin.")
+def handle_payload(raw_input: str) -> tuple[dict[str, Any], int]:
+    """
+    Parse one raw JSON payload and run it through process_request.
+
+    Returns (response, exit_code). exit_code is non-zero only for input
+    errors that never reached process_request. A payload picked by the
+    ECU_PROFILE sampler is profiled as a whole, JSON parsing included.
+    """
+    mode = _sampled_profile_mode()
+    if mode is None:
+        return _handle_payload(raw_input)
+    with _get_profiler().run(mode, "unknown") as run:
+        response, exit_code = _handle_payload(raw_input)
+        run["label"] = str(response.get("request_id", "batch"))
+    return response, exit_code
 
-    try:
-        raw_input = sys.stdin.read()
-    except Exception as exc:
-        response = _error_response("unknown", "STDIN_READ_ERROR", str(exc))
-        print(json.dumps(response), flush=True)
-        sys.exit(1)
 
+def _handle_payload(raw_input: str) -> tuple[dict[str, Any], int]:
+    """handle_payload without the profiling scope."""
     if not raw_input.strip():
-        response = _error_response("unknown", "EMPTY_INPUT", "stdin was empty")
-        print(json.dumps(response), flush=True)
-        sys.exit(1)
+        return _error_response("unknown", "EMPTY_INPUT", "stdin was empty"), 1
 
+    # The only clock read made without debug.timings: the flag is inside the
+    # payload, so parsing has to be timed before it is known.
+    t_parse = time.perf_counter()
     try:
         request = json.loads(raw_input)
     except json.JSONDecodeError as exc:
         logger.error("Failed to parse JSON from stdin: %s", exc)
-        response = _error_response("unknown", "JSON_PARSE_ERROR", str(exc))
-        print(json.dumps(response), flush=True)
-        sys.exit(1)
+        return _error_response("unknown", "JSON_PARSE_ERROR", str(exc)), 1
 
     if not isinstance(request, dict):
-        response = _error_response(
+        return _error_response(
             "unknown", "INVALID_REQUEST_TYPE", "Request must be a JSON object"
-        )
-        print(json.dumps(response), flush=True)
-        sys.exit(1)
+        ), 1
+
+    if "batch" in request:
+        if not isinstance(request["batch"], list):
+            return _error_response(
+                "unknown", "INVALID_BATCH", "batch must be a JSON array of requests"
+            ), 1
+        return _batch_response(request["batch"]), 0
 
+    parse_ms = _elapsed_ms(t_parse) if _timings_requested(request) else None
     try:
-        response = process_request(request)
+        response = process_request(request, parse_ms=parse_ms)
     except Exception as exc:
         logger.critical("Unhandled exception in process_request: %s", exc, exc_info=True)
-        request_id = request.get("request_id", "unknown") if isinstance(request, dict) else "unknown"
+        request_id = request.get("request_id", "unknown")
         response = _error_response(request_id, "UNHANDLED_ERROR", str(exc))
 
+    return response, 0
+
+
+def encode_response(response: dict[str, Any]) -> str:
+    """
+    Serialize a response to JSON text for any transport.
+
+    If the response carries metrics.timings, the single encoding is timed and
+    its null serialize_ms is replaced in the text (and in the dict) with the
+    result.
+    """
+    metrics = response.get("metrics")
+    timings = metrics.get("timings") if isinstance(metrics, dict) else None
+    if timings is None:
+        return json.dumps(response)
+    t_serialize = time.perf_counter()
+    text = json.dumps(response)
+    timings["serialize_ms"] = _elapsed_ms(t_serialize)
+    # Only a dict key can appear unescaped like this; timings is the one dict
+    # with a serialize_ms key.
+    return text.replace(
+        '"serialize_ms": null', f'"serialize_ms": {json.dumps(timings["serialize_ms"])}', 1
+    )
+
+
+def run_session(stdin: TextIO, stdout: TextIO) -> int:
+    """
+    Serve newline-delimited JSON requests until stdin is closed.
+
+    Each non-blank line is one request; each request produces exactly one
+    response line on stdout, flushed immediately. Returns the number of
+    requests handled.
+    """
+    logger.info("ECU runner started in session mode. Reading NDJSON requests on stdin.")
+    handled = 0
+    for line in iter(stdin.readline, ""):
+        if not line.strip():
+            continue
+        response, _ = handle_payload(line)
+        stdout.write(encode_response(response) + "\n")
+        stdout.flush()
+        handled += 1
+    logger.info("Session closed after %d request(s).", handled)
+    return handled
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    if "--session" in args:
+        run_session(sys.stdin, sys.stdout)
+        return
+
+    logger.info("ECU runner started. Waiting for request on stdin.")
+
+    try:
+        raw_input = sys.stdin.read()
+    except Exception as exc:
+        response = _error_response("unknown", "STDIN_READ_ERROR", str(exc))
+        print(json.dumps(response), flush=True)
+        sys.exit(1)
+
+    response, exit_code = handle_payload(raw_input)
+
     # stdout must contain ONLY the JSON response
-    print(json.dumps(response), flush=True)
+    print(encode_response(response), flush=True)
+    if exit_code:
+        sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""
+tests/test_benchmarks.py
+
+Tests for the benchmark harness (benchmarks/harness.py) and the hot-path
+benchmark suite (benchmarks/bench_hotpaths.py).
+
+Coverage:
+  - Percentiles, summary statistics and the report round trip
+  - compare() flags only p50 regressions beyond the threshold
+  - Benchmark requests are valid for the Python runner
+  - benchmark marker: a small grid over both trees, and --compare exit status
+
+The marked tests time real code and are deselected by default
+(pytest.ini); run them with: python -m pytest -m benchmark
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import pytest
+
+import bench_hotpaths
+from harness import STAT_KEYS, compare, load_report, new_report, percentile, summarize, write_report
+from ecu_runner import process_request
+
+
+def _report(p50_by_case):
+    return new_report({
+        case: {**summarize([int(p50 * 1e6)]), "p50_ms": p50}
+        for case, p50 in p50_by_case.items()
+    })
+
+
+class TestHarness:
+    def test_percentile_nearest_rank(self):
+        data = list(range(1, 101))
+        assert percentile(data, 50) == 50
+        assert percentile(data, 95) == 95
+        assert percentile(data, 99) == 99
+        assert percentile(data, 100) == 100
+        assert percentile([7], 99) == 7
+
+    def test_summarize(self):
+        stats = summarize([2_000_000, 1_000_000, 3_000_000])
+        assert set(stats) == set(STAT_KEYS)
+        assert stats["n"] == 3
+        assert stats["p50_ms"] == 2.0
+        assert stats["min_ms"] == 1.0
+        assert stats["max_ms"] == 3.0
+        assert stats["ops_per_sec"] == 500.0
+
+    def test_report_round_trip(self, tmp_path):
+        report = _report({"a": 1.0})
+        path = str(tmp_path / "bench.json")
+        write_report(path, report)
+        assert load_report(path) == json.loads(json.dumps(report))
+
+    def test_compare_flags_regressions(self):
+        baseline = _report({"fast": 1.0, "slow": 1.0, "gone": 1.0})
+        current = _report({"fast": 1.05, "slow": 1.5, "new": 9.0})
+        regressions = compare(current, baseline, threshold=0.10)
+        assert [r["case"] for r in regressions] == ["slow"]
+        assert regressions[0]["ratio"] == 1.5
+        assert compare(current, baseline, threshold=0.60) == []
+
+
+class TestRequests:
+    @pytest.mark.parametrize("n_bins", bench_hotpaths.DEFAULT_BINS)
+    def test_request_is_valid(self, n_bins):
+        req = bench_hotpaths.make_request(n_bins, 10, 3)
+        rpm_bins = req["baseline_curve"]["rpm_bins"]
+        assert len(rpm_bins) == n_bins
+        assert all(b > a for a, b in zip(rpm_bins, rpm_bins[1:]))
+        assert process_request(req)["status"] == "ok"
+
+
+@pytest.mark.benchmark
+class TestBenchmarkSuite:
+    def test_python_tree(self):
+        results = bench_hotpaths.run_tree("python", [11], [10], min_time_s=0.0, min_samples=3)
+        assert set(results) == {
+            "python.run_optimization[bins=11,budget=10]",
+            "python.process_request[bins=11,budget=10]",
+            "python.validate_proposal[bins=11]",
+        }
+        for stats in results.values():
+            assert set(stats) == set(STAT_KEYS)
+            assert stats["n"] >= 3
+            assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+    def test_all_trees_and_compare(self, tmp_path, capsys):
+        path = str(tmp_path / "bench.json")
+        grid = ["--bins", "11", "--budgets", "10", "--min-time", "0", "--min-samples", "3"]
+        assert bench_hotpaths.main(grid + ["--output", path]) == 0
+        report = load_report(path)
+        assert "ecu.find_peaks[bins=11]" in report["results"]
+        assert "ecu.run[bins=11,budget=10]" in report["results"]
+        assert "python.process_request[bins=11,budget=10]" in report["results"]
+
+        # A baseline that is 100x faster makes every case a regression.
+        for stats in report["results"].values():
+            stats["p50_ms"] /= 100
+        write_report(path, report)
+        assert bench_hotpaths.main(grid + ["--tree", "python", "--compare", path]) == 1
+        assert "regression" in capsys.readouterr().out
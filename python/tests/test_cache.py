@@ -0,0 +1,152 @@
+"""
+tests/test_cache.py
+
+Tests for the deterministic optimizer result cache (ecu/cache.py) and its use
+in process_request.
+
+Coverage:
+  - Canonical keys ignore request_id, dict ordering and explicit defaults
+  - In-memory LRU eviction and hit/miss counters
+  - On-disk layer persistence, size-based eviction, and no scan per write
+  - Cache hits return identical proposal fields and report metrics.cache
+  - ProposalStore: per-vehicle LRU of the last proposal
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ecu import cache as cache_module
+from ecu.cache import ProposalStore, ResultCache, proposal_key
+from ecu_runner import _get_result_cache, process_request
+from test_ecu_runner import make_request
+
+
+class TestProposalKey:
+    def test_request_id_excluded(self):
+        assert proposal_key(make_request(request_id="a")) == proposal_key(make_request(request_id="b"))
+
+    def test_dict_order_irrelevant(self):
+        req = make_request()
+        reordered = dict(reversed(list(req.items())))
+        assert proposal_key(reordered) == proposal_key(req)
+
+    def test_inputs_change_key(self):
+        assert proposal_key(make_request(seed=1)) != proposal_key(make_request(seed=2))
+        assert proposal_key(make_request(cycle_budget=10)) != proposal_key(make_request(cycle_budget=11))
+
+    def test_explicit_defaults_match_absent_fields(self):
+        explicit = make_request()
+        explicit.update(strategy="gaussian", rng="sequential", shards=1)
+        assert proposal_key(explicit) == proposal_key(make_request())
+        explicit["rng"] = "counter"
+        assert proposal_key(explicit) != proposal_key(make_request())
+
+    def test_cache_version_changes_key(self, monkeypatch):
+        before = proposal_key(make_request())
+        monkeypatch.setattr(cache_module, "CACHE_VERSION", cache_module.CACHE_VERSION + 1)
+        assert proposal_key(make_request()) != before
+
+
+class TestResultCache:
+    def test_counters(self):
+        cache = ResultCache()
+        assert cache.get("k") is None
+        cache.put("k", {"v": 1})
+        assert cache.get("k") == {"v": 1}
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")
+        cache.put("c", {})
+        assert cache.get("b") is None
+        assert cache.get("a") == {}
+
+    def test_returned_values_are_copies(self):
+        cache = ResultCache()
+        cache.put("k", {"v": [1.0]})
+        cache.get("k")["v"].append(2.0)
+        assert cache.get("k") == {"v": [1.0]}
+
+    def test_disk_layer_persists_and_evicts(self, tmp_path):
+        cache = ResultCache(max_entries=0, disk_dir=str(tmp_path), max_disk_bytes=300)
+        for i in range(10):
+            cache.put(f"k{i}", {"payload": "x" * 50})
+
+        total = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+        assert total <= 300
+        assert ResultCache(disk_dir=str(tmp_path)).get("k9") == {"payload": "x" * 50}
+
+    def test_disk_writes_scan_only_past_the_limit(self, tmp_path, monkeypatch):
+        cache = ResultCache(max_entries=0, disk_dir=str(tmp_path), max_disk_bytes=5000)
+        scans = []
+        scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or scandir(path))
+
+        for i in range(50):
+            cache.put(f"k{i}", {"payload": "x" * 50})
+        assert len(scans) == 1  # the first write learns the directory size
+
+        for i in range(50, 300):
+            cache.put(f"k{i}", {"payload": "x" * 50})
+        total = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+        assert total <= 5000
+        assert len(scans) < 40
+
+
+class TestRunnerCache:
+    def test_hit_returns_identical_proposal(self):
+        _get_result_cache().clear()
+        first = process_request(make_request(seed=31337, request_id="c-1"))
+        second = process_request(make_request(seed=31337, request_id="c-2"))
+
+        assert first["metrics"]["cache"] == {"hit": False, "hits": 0, "misses": 1}
+        assert second["metrics"]["cache"] == {"hit": True, "hits": 1, "misses": 1}
+        assert second["request_id"] == "c-2"
+        assert first["proposal"] == second["proposal"]
+        assert "Served from result cache" in second["debug"]["notes"]
+
+    def test_cached_result_not_shared_by_reference(self):
+        _get_result_cache().clear()
+        first = process_request(make_request(seed=4242))
+        first["proposal"]["torque_delta_nm"][0] = 999.0
+        second = process_request(make_request(seed=4242))
+        assert second["proposal"]["torque_delta_nm"][0] != 999.0
+
+
+class TestProposalStore:
+    def test_put_get_copies(self):
+        store = ProposalStore()
+        delta = [1.0, 2.0]
+        store.put("car", delta)
+        delta.append(3.0)
+        got = store.get("car")
+        assert got == [1.0, 2.0]
+        got.append(4.0)
+        assert store.get("car") == [1.0, 2.0]
+        assert store.get("other") is None
+
+    def test_lru_eviction(self):
+        store = ProposalStore(max_entries=2)
+        store.put("a", [1.0])
+        store.put("b", [2.0])
+        store.get("a")
+        store.put("c", [3.0])
+        assert store.get("b") is None
+        assert store.get("a") == [1.0]
+        assert len(store) == 2
+
+    def test_disabled(self):
+        store = ProposalStore(max_entries=0)
+        store.put("a", [1.0])
+        assert store.get("a") is None
+
+    def test_disk_store_is_shared(self, tmp_path):
+        ProposalStore(disk_dir=str(tmp_path)).put("car", [1.0, 2.0])
+        other = ProposalStore(disk_dir=str(tmp_path))  # e.g. another worker
+        assert other.get("car") == [1.0, 2.0]
+        assert other.get("other") is None
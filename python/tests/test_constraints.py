@@ -0,0 +1,91 @@
+"""
+tests/test_constraints.py
+
+Tests for the compiled constraint set (ecu/constraints.py).
+
+Coverage:
+  - Precomputed limits, peak and calibration ranges
+  - validate_proposal gives identical results for a dict and a ConstraintSet
+  - A set compiled for another baseline is recompiled, not reused
+  - run_optimization accepts a ConstraintSet with unchanged output
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ecu.constraints import ConstraintSet, compile_constraints
+from ecu.optimizer import run_optimization
+from ecu.validator import validate_proposal, ValidationError
+from test_ecu_runner import make_request
+
+
+def _inputs():
+    req = make_request()
+    return req["baseline_curve"]["torque_nm"], req["baseline_curve"]["rpm_bins"], req["constraints"]
+
+
+class TestCompile:
+    def test_precomputed_fields(self):
+        torque, _, constraints = _inputs()
+        cs = ConstraintSet(constraints, torque)
+
+        assert cs.baseline_peak == max(torque)
+        assert cs.per_bin_limit == [min(8.0, b * 0.03) for b in torque]
+        assert cs.min_bin_limit == min(cs.per_bin_limit)
+        assert cs.max_second_derivative == 0.15
+        assert cs.calibration_sample_ranges["afr_target"] == (11.5, 14.7)
+        assert cs.baseline_valid
+        ceiling = max(torque) * 1.02
+        assert cs.score_upper_bound == pytest.approx(
+            sum(torque) + sum(min(lim, ceiling - b) for b, lim in zip(torque, cs.per_bin_limit))
+        )
+
+    def test_defaults_and_swapped_range(self):
+        cs = ConstraintSet({"calibration_ranges": {"ign_timing_deg": [6.0, 2.0]}}, [100.0, 120.0])
+        assert cs.max_bin_delta_nm == 8.0
+        assert cs.calibration_sample_ranges["ign_timing_deg"] == (2.0, 6.0)
+        assert cs.calibration_sample_ranges["boost_target_psi"] == (0.0, 14.0)
+
+    def test_slots(self):
+        torque, _, constraints = _inputs()
+        with pytest.raises(AttributeError):
+            ConstraintSet(constraints, torque).extra = 1
+
+    def test_reuse_only_for_same_baseline(self):
+        torque, _, constraints = _inputs()
+        cs = ConstraintSet(constraints, torque)
+        assert compile_constraints(cs, torque) is cs
+        assert compile_constraints(cs, list(torque)) is cs
+
+        other = [t * 2 for t in torque]
+        recompiled = compile_constraints(cs, other)
+        assert recompiled is not cs
+        assert recompiled.baseline_peak == max(other)
+
+
+class TestSharedUse:
+    @pytest.mark.parametrize("delta_scale", [0.0, 0.5, 1.0, 1.01, 3.0])
+    def test_validator_same_result_for_dict_and_set(self, delta_scale):
+        torque, rpm_bins, constraints = _inputs()
+        cs = ConstraintSet(constraints, torque)
+        delta = [min(8.0, b * 0.03) * delta_scale for b in torque]
+        calibration = {"afr_target": 12.5}
+
+        def outcome(c):
+            try:
+                return validate_proposal(delta, calibration, torque, rpm_bins, c)
+            except ValidationError as exc:
+                return str(exc)
+
+        assert outcome(cs) == outcome(constraints)
+
+    def test_run_optimization_accepts_set(self):
+        torque, rpm_bins, constraints = _inputs()
+        cs = ConstraintSet(constraints, torque)
+        assert run_optimization(torque, rpm_bins, cs, 60, 9) == run_optimization(
+            torque, rpm_bins, constraints, 60, 9
+        )
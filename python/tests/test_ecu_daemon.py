@@ -0,0 +1,120 @@
+"""
+tests/test_ecu_daemon.py
+
+End-to-end tests for the pre-forked ECU daemon (ecu_daemon.py).
+
+Coverage:
+  - Requests over the Unix socket return contract-compliant responses
+  - A connection can carry several requests (one response line each)
+  - Workers are recycled after max_requests and replaced
+  - SIGTERM drains workers and removes the socket file
+"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from test_ecu_runner import make_request
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"),
+    reason="ecu_daemon requires os.fork and AF_UNIX sockets",
+)
+
+PYTHON_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Start a daemon on a temporary socket; yield (process, socket_path)."""
+    socket_path = str(tmp_path / "ecu.sock")
+    procs = []
+
+    def start(workers: int = 2, max_requests: int = 100):
+        proc = subprocess.Popen(
+            [
+                sys.executable, "ecu_daemon.py",
+                "--socket", socket_path,
+                "--workers", str(workers),
+                "--max-requests", str(max_requests),
+            ],
+            cwd=PYTHON_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        procs.append(proc)
+        deadline = time.monotonic() + 10
+        while not os.path.exists(socket_path):
+            assert proc.poll() is None, proc.stderr.read()
+            assert time.monotonic() < deadline, "daemon did not create its socket"
+            time.sleep(0.05)
+        return proc, socket_path
+
+    yield start
+
+    for proc in procs:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+def _exchange(socket_path: str, requests: list[dict]) -> list[dict]:
+    """Send requests on one connection and read one response line per request."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(10)
+        conn.connect(socket_path)
+        conn.sendall("".join(json.dumps(r) + "\n" for r in requests).encode())
+        with conn.makefile("r") as stream:
+            return [json.loads(stream.readline()) for _ in requests]
+
+
+class TestDaemon:
+    def test_request_over_socket_returns_ok(self, daemon):
+        _, socket_path = daemon()
+        (resp,) = _exchange(socket_path, [make_request(seed=42, request_id="d-1")])
+        assert resp["status"] == "ok"
+        assert resp["request_id"] == "d-1"
+        assert resp["contract_version"] == "1.0"
+
+    def test_connection_carries_multiple_requests(self, daemon):
+        _, socket_path = daemon()
+        reqs = [make_request(seed=s, request_id=f"d-{s}") for s in (1, 2, 3)]
+        responses = _exchange(socket_path, reqs)
+        assert [r["request_id"] for r in responses] == ["d-1", "d-2", "d-3"]
+
+    def test_daemon_matches_in_process_output(self, daemon):
+        from ecu_runner import process_request
+
+        _, socket_path = daemon()
+        req = make_request(seed=777)
+        (resp,) = _exchange(socket_path, [req])
+        assert resp["proposal"] == process_request(req)["proposal"]
+
+    def test_workers_are_recycled(self, daemon):
+        proc, socket_path = daemon(workers=1, max_requests=2)
+        for i in range(5):
+            (resp,) = _exchange(socket_path, [make_request(seed=i)])
+            assert resp["status"] == "ok"
+
+        proc.send_signal(signal.SIGTERM)
+        _, stderr = proc.communicate(timeout=10)
+        assert stderr.count("exiting (recycling)") >= 2
+
+    def test_sigterm_drains_and_removes_socket(self, daemon):
+        proc, socket_path = daemon(workers=2)
+        _exchange(socket_path, [make_request(seed=1)])
+
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=10)
+
+        assert proc.returncode == 0
+        assert not os.path.exists(socket_path)
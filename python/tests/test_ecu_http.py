@@ -0,0 +1,235 @@
+"""
+tests/test_ecu_http.py
+
+Tests for the Phase 1 asyncio HTTP transport (ecu_http.py).
+
+Coverage:
+  - POST /ecu returns the same proposal as process_request
+  - Keep-alive: several requests reuse one connection
+  - Backpressure: requests beyond max_in_flight + max_queue get OVERLOADED
+  - HTTP-level errors return contract-shaped error bodies
+  - Framing: non-POST bodies are drained, over-long lines get 431, and the
+    keep-alive timeout covers the whole request
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ecu_http import EcuHttpServer
+from ecu_runner import handle_payload, process_request
+from test_ecu_runner import make_request
+
+
+async def _send(reader, writer, body: bytes, path: str = "/ecu", method: str = "POST",
+                connection: str | None = None) -> tuple[int, dict, dict]:
+    head = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(body)}"]
+    if connection:
+        head.append(f"Connection: {connection}")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode()
+        if line in ("\r\n", ""):
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    payload = json.loads(await reader.readexactly(int(headers["content-length"])))
+    return status, headers, payload
+
+
+def _run_with_server(server: EcuHttpServer, scenario):
+    async def main():
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.close()
+
+
+class TestHttpTransport:
+    def test_post_returns_contract_response(self):
+        req = make_request(seed=42, request_id="http-1")
+        server = EcuHttpServer(max_in_flight=2, max_queue=2, executor=ThreadPoolExecutor(2))
+
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            result = await _send(reader, writer, json.dumps(req).encode())
+            writer.close()
+            return result
+
+        status, _, resp = _run_with_server(server, scenario)
+        assert status == 200
+        assert resp["request_id"] == "http-1"
+        assert resp["proposal"] == process_request(req)["proposal"]
+
+    def test_process_pool_backend(self):
+        """Default executor is a process pool; the response must be identical."""
+        req = make_request(seed=5)
+        server = EcuHttpServer(max_in_flight=1, max_queue=1)
+
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            result = await _send(reader, writer, json.dumps(req).encode())
+            writer.close()
+            return result
+
+        status, _, resp = _run_with_server(server, scenario)
+        assert status == 200
+        assert resp["proposal"] == process_request(req)["proposal"]
+
+    def test_keep_alive_reuses_connection(self):
+        server = EcuHttpServer(max_in_flight=1, max_queue=1, executor=ThreadPoolExecutor(1))
+
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            results = []
+            for seed in (1, 2, 3):
+                body = json.dumps(make_request(seed=seed, request_id=f"ka-{seed}")).encode()
+                results.append(await _send(reader, writer, body))
+            writer.close()
+            return results
+
+        results = _run_with_server(server, scenario)
+        assert [r[2]["request_id"] for r in results] == ["ka-1", "ka-2", "ka-3"]
+        assert all(r[1]["connection"] == "keep-alive" for r in results)
+
+    def test_connection_close_is_honoured(self):
+        server = EcuHttpServer(max_in_flight=1, max_queue=0, executor=ThreadPoolExecutor(1))
+
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = json.dumps(make_request()).encode()
+            result = await _send(reader, writer, body, connection="close")
+            eof = await reader.read()
+            writer.close()
+            return result, eof
+
+        (status, headers, _), eof = _run_with_server(server, scenario)
+        assert status == 200
+        assert headers["connection"] == "close"
+        assert eof == b""
+
+    def test_overloaded_when_queue_full(self):
+        release = threading.Event()
+
+        def blocking_handler(raw: str):
+            release.wait(timeout=10)
+            return handle_payload(raw)
+
+        server = EcuHttpServer(
+            max_in_flight=1, max_queue=0,
+            executor=ThreadPoolExecutor(1), handler=blocking_handler,
+        )
+
+        async def scenario(port):
+            r1, w1 = await asyncio.open_connection("127.0.0.1", port)
+            first = asyncio.create_task(
+                _send(r1, w1, json.dumps(make_request(request_id="busy")).encode())
+            )
+            while server.pending < 1:
+                await asyncio.sleep(0.01)
+
+            r2, w2 = await asyncio.open_connection("127.0.0.1", port)
+            second = await _send(r2, w2, json.dumps(make_request(request_id="shed")).encode())
+            release.set()
+            first_result = await first
+            w1.close()
+            w2.close()
+            return first_result, second
+
+        (status1, _, resp1), (status2, headers2, resp2) = _run_with_server(server, scenario)
+        assert status1 == 200 and resp1["status"] == "ok"
+        assert status2 == 503
+        assert headers2["retry-after"] == "1"
+        assert resp2["status"] == "error"
+        assert resp2["error"]["code"] == "OVERLOADED"
+        assert resp2["request_id"] == "shed"
+
+    @pytest.mark.parametrize(
+        "method,path,expected_status,expected_code",
+        [
+            ("GET", "/ecu", 405, "HTTP_METHOD_NOT_ALLOWED"),
+            ("POST", "/nope", 404, "HTTP_NOT_FOUND"),
+        ],
+    )
+    def test_http_errors_are_contract_shaped(self, method, path, expected_status, expected_code):
+        server = EcuHttpServer(max_in_flight=1, max_queue=0, executor=ThreadPoolExecutor(1))
+
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            result = await _send(reader, writer, b"{}", path=path, method=method)
+            writer.close()
+            return result
+
+        status, _, resp = _run_with_server(server, scenario)
+        assert status == expected_status
+        assert resp["status"] == "error"
+        assert resp["error"]["code"] == expected_code
+        assert resp["contract_version"] == "1.0"
+
+    def test_non_post_body_is_drained(self):
+        req = make_request(seed=7, request_id="after-get")
+        server = EcuHttpServer(max_in_flight=1, max_queue=0, executor=ThreadPoolExecutor(1))
+
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            first = await _send(reader, writer, b'{"ignored": true}', method="GET")
+            second = await _send(reader, writer, json.dumps(req).encode())
+            writer.close()
+            return first, second
+
+        (status1, _, _), (status2, _, resp2) = _run_with_server(server, scenario)
+        assert status1 == 405
+        assert status2 == 200
+        assert resp2["request_id"] == "after-get"
+
+    def test_overlong_header_line_is_431(self):
+        server = EcuHttpServer(max_in_flight=1, max_queue=0, executor=ThreadPoolExecutor(1))
+
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /ecu HTTP/1.1\r\nX-Big: " + b"a" * 100_000 + b"\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+        response = _run_with_server(server, scenario)
+        assert response.startswith(b"HTTP/1.1 431 ")
+        assert b"HTTP_HEADER_TOO_LARGE" in response
+
+    def test_timeout_covers_headers_and_body(self):
+        server = EcuHttpServer(
+            max_in_flight=1, max_queue=0, executor=ThreadPoolExecutor(1),
+            keepalive_timeout_s=0.2,
+        )
+
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            # Request line on time, then a body that never arrives.
+            writer.write(b"POST /ecu HTTP/1.1\r\nContent-Length: 10\r\n\r\n{")
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return response
+
+        assert _run_with_server(server, scenario) == b""
@@ -10,6 +10,13 @@ Coverage:
   - Error handling: empty input, malformed JSON, non-finite baseline
   - Rejection path: proposal that violates constraints is rejected gracefully
   - Calibration ranges: values stay within allowed bounds
+  - Session mode: one warm process serving newline-delimited requests
+  - Batch: process_batch and the {"batch": [...]} envelope
+  - Deadlines: anytime early stop, checkpoint replay
+  - Strategies: optional NumPy engine and its fallback, exact LP solve
+  - Early exit: analytic score bound, patience window, bound_gap metric
+  - Warm start: explicit previous delta or per-vehicle store, re-validated
+  - check_proposal / validate_many: structured violation codes without exceptions
 """
 
 import json
@@ -22,9 +29,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 import pytest
 
-from ecu_runner import process_request, _error_response, _rejected_response
-from ecu.validator import validate_proposal, ValidationError
-from ecu.optimizer import run_optimization
+from ecu_runner import handle_payload, process_batch, process_request, run_session, _error_response, _rejected_response
+from ecu_runner import _get_proposal_store
+from ecu.validator import (
+    check_proposal, describe_violation, validate_many, validate_proposal, ValidationError,
+)
+from ecu.optimizer import WARM_START_PATIENCE, run_optimization
 
 
 # ── Fixtures ──────────────────────────────────────────────────────────────────
@@ -546,6 +556,482 @@ class TestSubprocess:
         assert resp["error"]["code"] == "EMPTY_INPUT"
 
 
+# ── Session mode tests ────────────────────────────────────────────────────────
+
+class TestSession:
+    """
+    --session keeps one process alive and answers newline-delimited requests,
+    one response line per request, in order.
+    """
+
+    def test_session_answers_each_line_in_order(self):
+        import io
+
+        lines = [
+            json.dumps(make_request(seed=1, request_id="s-1")),
+            "",
+            json.dumps(make_request(seed=2, request_id="s-2")),
+        ]
+        stdout = io.StringIO()
+        handled = run_session(io.StringIO("\n".join(lines) + "\n"), stdout)
+
+        assert handled == 2
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert [r["request_id"] for r in responses] == ["s-1", "s-2"]
+        assert all(r["status"] == "ok" for r in responses)
+
+    def test_session_bad_line_does_not_end_session(self):
+        import io
+
+        stdin = io.StringIO("not json\n" + json.dumps(make_request(seed=3)) + "\n")
+        stdout = io.StringIO()
+        run_session(stdin, stdout)
+
+        first, second = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert first["error"]["code"] == "JSON_PARSE_ERROR"
+        assert second["status"] == "ok"
+
+    def test_session_matches_single_shot_output(self):
+        """A warm session must return the same proposal as a one-shot call."""
+        import io
+
+        req = make_request(seed=2024)
+        stdout = io.StringIO()
+        run_session(io.StringIO(json.dumps(req) + "\n"), stdout)
+        resp = json.loads(stdout.getvalue())
+
+        assert resp["proposal"] == process_request(req)["proposal"]
+
+    def test_session_subprocess_stdout_is_ndjson(self):
+        """Via subprocess, stdout carries one JSON line per request and nothing else."""
+        import subprocess
+        import sys
+
+        payload = "".join(
+            json.dumps(make_request(seed=s, request_id=f"sub-{s}")) + "\n"
+            for s in (10, 11, 12)
+        )
+        result = subprocess.run(
+            [sys.executable, "ecu_runner.py", "--session"],
+            input=payload,
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=os.path.join(os.path.dirname(__file__), ".."),
+        )
+        assert result.returncode == 0
+        responses = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [r["request_id"] for r in responses] == ["sub-10", "sub-11", "sub-12"]
+        assert "session mode" in result.stderr
+
+
+# ── Batch tests ───────────────────────────────────────────────────────────────
+
+class TestBatch:
+    def test_batch_matches_serial_calls_in_order(self):
+        reqs = [make_request(seed=s, request_id=f"b-{s}") for s in (5, 6, 7)]
+        batch = process_batch(reqs)
+
+        assert [r["request_id"] for r in batch] == ["b-5", "b-6", "b-7"]
+        for req, resp in zip(reqs, batch):
+            assert resp["proposal"] == process_request(req)["proposal"]
+
+    def test_identical_inputs_share_one_optimization(self):
+        reqs = [make_request(seed=9, request_id=f"dup-{i}") for i in range(3)]
+        batch = process_batch(reqs)
+
+        assert [r["request_id"] for r in batch] == ["dup-0", "dup-1", "dup-2"]
+        assert batch[0]["proposal"] == batch[1]["proposal"] == batch[2]["proposal"]
+        assert any("Reused result" in n for n in batch[2]["debug"]["notes"])
+        # Shared responses must not alias each other
+        batch[1]["proposal"]["torque_delta_nm"][0] = -1.0
+        assert batch[2]["proposal"]["torque_delta_nm"][0] != -1.0
+
+    def test_same_constraints_compile_once(self, monkeypatch):
+        import ecu.constraints
+
+        calls = []
+        compile_constraints = ecu.constraints.compile_constraints
+
+        def spy(constraints, baseline_torque_nm):
+            calls.append(1)
+            return compile_constraints(constraints, baseline_torque_nm)
+
+        monkeypatch.setattr(ecu.constraints, "compile_constraints", spy)
+        reqs = [make_request(seed=s, request_id=f"c-{s}") for s in (21, 22, 23)]
+        batch = process_batch(reqs)
+
+        assert len(calls) == 1
+        monkeypatch.undo()
+        for req, resp in zip(reqs, batch):
+            assert resp["proposal"] == process_request(req)["proposal"]
+
+    def test_deadline_entry_is_not_shared_with_unbounded_entry(self):
+        bounded = make_request(seed=3, cycle_budget=2000, request_id="bounded")
+        bounded["deadline_ms"] = 0.001
+        unbounded = make_request(seed=3, cycle_budget=2000, request_id="unbounded")
+        batch = process_batch([bounded, unbounded])
+
+        assert any("stopped early" in n for n in batch[0]["debug"]["notes"])
+        notes = batch[1]["debug"]["notes"]
+        assert not any("stopped early" in n or "Reused result" in n for n in notes)
+        assert batch[1]["proposal"] == process_request(unbounded)["proposal"]
+        assert batch[1]["metrics"]["cycles_used"] > batch[0]["metrics"]["cycles_used"]
+
+    def test_invalid_entries_do_not_poison_batch(self):
+        bad = make_request(request_id="bad")
+        del bad["seed"]
+        batch = process_batch([bad, "not-an-object", make_request(request_id="good")])
+
+        assert batch[0]["error"]["code"] == "SCHEMA_ERROR"
+        assert batch[1]["error"]["code"] == "INVALID_REQUEST_TYPE"
+        assert batch[2]["status"] == "ok"
+
+    def test_batch_envelope(self):
+        payload = json.dumps({"batch": [make_request(seed=1), make_request(seed=2)]})
+        response, exit_code = handle_payload(payload)
+
+        assert exit_code == 0
+        assert response["contract_version"] == "1.0"
+        assert [r["status"] for r in response["batch"]] == ["ok", "ok"]
+
+    def test_batch_envelope_must_be_a_list(self):
+        response, exit_code = handle_payload(json.dumps({"batch": {"seed": 1}}))
+        assert exit_code == 1
+        assert response["error"]["code"] == "INVALID_BATCH"
+
+
+# ── Deadline tests ────────────────────────────────────────────────────────────
+
+class TestDeadline:
+    def test_deadline_returns_best_so_far(self):
+        req = make_request(seed=8, cycle_budget=5_000_000)
+        req["deadline_ms"] = 20
+        resp = process_request(req)
+
+        assert resp["status"] == "ok"
+        assert 0 <= resp["metrics"]["cycles_used"] < 5_000_000
+        assert any("stopped early" in n for n in resp["debug"]["notes"])
+
+    def test_early_stop_is_not_cached(self):
+        from ecu_runner import _get_result_cache
+
+        _get_result_cache().clear()
+        req = make_request(seed=8, cycle_budget=5_000_000)
+        req["deadline_ms"] = 5
+        process_request(req)
+        resp = process_request(req)
+        assert resp["metrics"]["cache"]["hit"] is False
+
+    def test_checkpoint_mode_replays_exactly(self):
+        baseline = make_request()["baseline_curve"]
+        constraints = make_request()["constraints"]
+        stopped = run_optimization(
+            baseline["torque_nm"], baseline["rpm_bins"], constraints,
+            cycle_budget=5_000_000, seed=21, deadline_ms=20, deadline_mode="checkpoint",
+        )
+        assert stopped["stopped_early"]
+        assert stopped["cycles_used"] % 32 == 0
+
+        replay = run_optimization(
+            baseline["torque_nm"], baseline["rpm_bins"], constraints,
+            cycle_budget=5_000_000, seed=21, cycle_limit=stopped["cycles_used"],
+        )
+        assert not replay["stopped_early"]
+        assert replay["torque_delta_nm"] == stopped["torque_delta_nm"]
+        assert replay["calibration"] == stopped["calibration"]
+
+    def test_cycle_limit_via_request(self):
+        req = make_request(seed=8, cycle_budget=400)
+        req["cycle_limit"] = 64
+        resp = process_request(req)
+        assert resp["status"] == "ok"
+        assert resp["metrics"]["cycles_used"] == 64
+
+    @pytest.mark.parametrize(
+        "field,value",
+        [("deadline_ms", 0), ("deadline_ms", "soon"), ("deadline_mode", "eventually"),
+         ("cycle_limit", 0), ("cycle_limit", 1.5)],
+    )
+    def test_invalid_deadline_fields(self, field, value):
+        req = make_request()
+        req[field] = value
+        resp = process_request(req)
+        assert resp["status"] == "error"
+        assert resp["error"]["code"] == "SCHEMA_ERROR"
+
+
+# ── Strategy tests ────────────────────────────────────────────────────────────
+
+class TestStrategy:
+    def test_numpy_strategy_matches_gaussian(self):
+        pytest.importorskip("numpy")
+        baseline = make_request()["baseline_curve"]
+        constraints = make_request()["constraints"]
+        args = (baseline["torque_nm"], baseline["rpm_bins"], constraints, 200, 17)
+
+        reference = run_optimization(*args)
+        vectorized = run_optimization(*args, strategy="gaussian_numpy")
+
+        assert vectorized["strategy"] == "gaussian_numpy"
+        assert vectorized["cycles_used"] == reference["cycles_used"]
+        assert vectorized["calibration"] == reference["calibration"]
+        assert vectorized["torque_delta_nm"] == pytest.approx(reference["torque_delta_nm"], abs=1e-9)
+        assert run_optimization(*args, strategy="gaussian_numpy") == vectorized
+
+    def test_numpy_strategy_via_request(self):
+        pytest.importorskip("numpy")
+        req = make_request(seed=5, cycle_budget=3000)
+        req["strategy"] = "gaussian_numpy"
+        resp = process_request(req)
+        assert resp["status"] == "ok"
+        assert resp["metrics"]["strategy"] == "gaussian_numpy"
+        assert resp["metrics"]["cycles_used"] == 3000
+
+    def test_missing_numpy_falls_back_to_gaussian(self, monkeypatch):
+        from ecu import vectorized
+
+        monkeypatch.setattr(vectorized, "NUMPY_AVAILABLE", False)
+        baseline = make_request()["baseline_curve"]
+        constraints = make_request()["constraints"]
+        args = (baseline["torque_nm"], baseline["rpm_bins"], constraints, 40, 3)
+
+        result = run_optimization(*args, strategy="gaussian_numpy")
+        reference = run_optimization(*args)
+
+        assert result["strategy"] == "gaussian"
+        assert result["torque_delta_nm"] == reference["torque_delta_nm"]
+        assert any("NumPy not installed" in w for w in result["warnings"])
+
+    def test_lp_strategy_is_optimal_and_valid(self):
+        req = make_request()
+        baseline = req["baseline_curve"]
+        args = (baseline["torque_nm"], baseline["rpm_bins"], req["constraints"], 40)
+
+        exact = run_optimization(*args, 3, strategy="lp")
+        validate_proposal(
+            exact["torque_delta_nm"], exact["calibration"],
+            baseline["torque_nm"], baseline["rpm_bins"], req["constraints"],
+        )
+        assert exact["cycles_used"] < 40
+        for seed in range(5):
+            sampled = run_optimization(*args, seed)
+            assert exact["best_score"] >= sampled["best_score"]
+        assert run_optimization(*args, 3, strategy="lp") == exact
+
+    def test_lp_strategy_is_anytime(self):
+        req = make_request()
+        baseline = req["baseline_curve"]
+        args = (baseline["torque_nm"], baseline["rpm_bins"], req["constraints"], 40, 3)
+
+        partial = run_optimization(*args, strategy="lp", cycle_limit=1)
+        full = run_optimization(*args, strategy="lp")
+        assert partial["cycles_used"] == 1
+        assert sum(req["baseline_curve"]["torque_nm"]) < partial["best_score"] < full["best_score"]
+
+    def test_lp_zero_peak_gain_raises_off_peak_bins(self):
+        req = make_request()
+        baseline = req["baseline_curve"]
+        constraints = {**req["constraints"], "max_peak_gain_ratio": 0.0}
+        result = run_optimization(
+            baseline["torque_nm"], baseline["rpm_bins"], constraints, 40, 3, strategy="lp"
+        )
+        deltas = result["torque_delta_nm"]
+        validate_proposal(
+            deltas, result["calibration"], baseline["torque_nm"], baseline["rpm_bins"], constraints,
+        )
+        assert deltas[baseline["torque_nm"].index(max(baseline["torque_nm"]))] == 0.0
+        assert result["best_score"] > sum(baseline["torque_nm"]) + 1.0
+
+    @pytest.mark.parametrize("max_peak_gain_ratio", [0.02, 0.0])
+    def test_lp_zero_smoothness_finds_affine_gain(self, max_peak_gain_ratio):
+        req = make_request()
+        baseline = req["baseline_curve"]
+        constraints = {
+            **req["constraints"],
+            "max_peak_gain_ratio": max_peak_gain_ratio,
+            "smoothness": {"max_second_derivative": 0.0},
+        }
+        result = run_optimization(
+            baseline["torque_nm"], baseline["rpm_bins"], constraints, 40, 3, strategy="lp"
+        )
+        deltas = result["torque_delta_nm"]
+        validate_proposal(
+            deltas, result["calibration"], baseline["torque_nm"], baseline["rpm_bins"], constraints,
+        )
+        assert all(a - 2 * b + c == 0.0 for a, b, c in zip(deltas, deltas[1:], deltas[2:]))
+        assert result["best_score"] > sum(baseline["torque_nm"]) + 1.0
+
+    def test_lp_strategy_via_request(self):
+        req = make_request(rpm_bins=list(range(1000, 7000, 20)), torque_nm=[
+            150 + 80 * math.sin(i / 100) for i in range(300)
+        ])
+        req["strategy"] = "lp"
+        resp = process_request(req)
+        assert resp["status"] == "ok"
+        assert resp["metrics"]["strategy"] == "lp"
+
+    def test_unknown_strategy_is_schema_error(self):
+        req = make_request()
+        req["strategy"] = "annealing"
+        resp = process_request(req)
+        assert resp["status"] == "error"
+        assert resp["error"]["code"] == "SCHEMA_ERROR"
+
+
+# ── Early exit ────────────────────────────────────────────────────────────────
+
+class TestEarlyExit:
+    def _args(self, constraints=None, budget=2000, seed=1):
+        req = make_request(constraints=constraints)
+        baseline = req["baseline_curve"]
+        return (baseline["torque_nm"], baseline["rpm_bins"], req["constraints"], budget, seed)
+
+    def test_patience_stops_deterministically(self):
+        result = run_optimization(*self._args(), patience=50)
+        assert result["early_exit"] == "patience"
+        assert 50 <= result["cycles_used"] < 2000
+        assert run_optimization(*self._args(), patience=50) == result
+
+    def test_patience_keeps_prefix_result(self):
+        """Stopping early returns exactly what a cycle_limit run of that length finds."""
+        stopped = run_optimization(*self._args(), patience=30)
+        replay = run_optimization(*self._args(), cycle_limit=stopped["cycles_used"])
+        assert stopped["torque_delta_nm"] == replay["torque_delta_nm"]
+        assert stopped["best_score"] == replay["best_score"]
+
+    def test_no_patience_runs_full_budget(self):
+        result = run_optimization(*self._args(budget=300))
+        assert result["early_exit"] is None
+        assert result["cycles_used"] == 300
+        assert result["bound_gap"] > 0
+
+    def test_bound_reached_stops_immediately(self):
+        constraints = make_request()["constraints"]
+        constraints["max_bin_delta_nm"] = 0.0
+        result = run_optimization(*self._args(constraints=constraints, budget=500))
+        assert result["early_exit"] == "bound"
+        assert result["cycles_used"] == 0
+        assert result["bound_gap"] == 0.0
+
+    def test_numpy_stops_at_same_cycle(self):
+        pytest.importorskip("numpy")
+        for patience in (1, 40, 700):
+            args = self._args(budget=3000, seed=patience)
+            reference = run_optimization(*args, patience=patience)
+            vectorized = run_optimization(*args, patience=patience, strategy="gaussian_numpy")
+            assert vectorized["cycles_used"] == reference["cycles_used"]
+            assert vectorized["early_exit"] == reference["early_exit"]
+
+    def test_via_request(self):
+        req = make_request(cycle_budget=5000)
+        req["patience"] = 25
+        resp = process_request(req)
+        assert resp["status"] == "ok"
+        assert resp["metrics"]["cycles_used"] < 5000
+        assert resp["metrics"]["bound_gap"] >= 0
+        assert any("No improvement for 25 cycles" in n for n in resp["debug"]["notes"])
+
+    @pytest.mark.parametrize("patience", [0, -3, 2.5, True])
+    def test_invalid_patience_is_schema_error(self, patience):
+        req = make_request()
+        req["patience"] = patience
+        resp = process_request(req)
+        assert resp["status"] == "error"
+        assert resp["error"]["code"] == "SCHEMA_ERROR"
+
+
+# ── Warm start ────────────────────────────────────────────────────────────────
+
+class TestWarmStart:
+    def _args(self, budget=40, seed=2):
+        req = make_request()
+        baseline = req["baseline_curve"]
+        return (baseline["torque_nm"], baseline["rpm_bins"], req["constraints"], budget, seed)
+
+    def test_valid_delta_seeds_incumbent(self):
+        previous = run_optimization(*self._args(budget=500, seed=1))
+        result = run_optimization(*self._args(), warm_start=previous["torque_delta_nm"])
+        assert result["warm_started"]
+        assert result["best_score"] >= previous["best_score"]
+
+    def test_never_worse_than_cold_run_from_same_seed(self):
+        previous = run_optimization(*self._args(budget=5, seed=9))
+        cold = run_optimization(*self._args(budget=200))
+        warm = run_optimization(*self._args(budget=200), warm_start=previous["torque_delta_nm"])
+        assert warm["best_score"] >= max(cold["best_score"], previous["best_score"])
+
+    def test_invalid_delta_is_revalidated_and_ignored(self):
+        bad = [50.0] * 11  # far above max_bin_delta_nm
+        result = run_optimization(*self._args(), warm_start=bad)
+        assert not result["warm_started"]
+        assert any(w.startswith("warm_start ignored") for w in result["warnings"])
+        assert result == {
+            **run_optimization(*self._args()),
+            "warnings": result["warnings"],
+        }
+
+    def test_length_mismatch_ignored(self):
+        result = run_optimization(*self._args(), warm_start=[0.5, 0.5])
+        assert not result["warm_started"]
+
+    def test_explicit_delta_via_request(self):
+        previous = process_request(make_request(seed=1, cycle_budget=500))
+        req = make_request(seed=2, cycle_budget=5)
+        req["warm_start"] = {"torque_delta_nm": previous["proposal"]["torque_delta_nm"]}
+        resp = process_request(req)
+        assert resp["status"] == "ok"
+        assert resp["metrics"]["warm_started"]
+        assert resp["metrics"]["best_score"] >= previous["metrics"]["best_score"]
+
+    def test_vehicle_store_via_request(self):
+        _get_proposal_store().clear()
+        first = make_request(seed=11, cycle_budget=300)
+        first["warm_start"] = True  # nothing stored yet: cold run
+        cold = process_request(first)
+        assert not cold["metrics"]["warm_started"]
+
+        repeat = make_request(seed=12, cycle_budget=300)
+        repeat["warm_start"] = True
+        repeat["patience"] = 10
+        warm = process_request(repeat)
+        assert warm["metrics"]["warm_started"]
+        assert warm["metrics"]["cycles_used"] < 300
+        assert warm["metrics"]["best_score"] >= cold["metrics"]["best_score"]
+
+    def test_warm_start_defaults_patience(self):
+        _get_proposal_store().clear()
+        cold = process_request(make_request(seed=11, cycle_budget=2000))
+        assert cold["metrics"]["cycles_used"] == 2000
+
+        repeat = make_request(seed=12, cycle_budget=2000)
+        repeat["warm_start"] = True
+        warm = process_request(repeat)
+        assert warm["metrics"]["warm_started"]
+        assert warm["metrics"]["cycles_used"] < cold["metrics"]["cycles_used"]
+        assert warm["metrics"]["best_score"] >= cold["metrics"]["best_score"]
+        notes = warm["debug"]["notes"]
+        assert any(f"No improvement for {WARM_START_PATIENCE} cycles" in n for n in notes)
+
+    def test_store_is_per_vehicle(self):
+        _get_proposal_store().clear()
+        process_request(make_request(seed=1, cycle_budget=200))
+        other = make_request(seed=1, cycle_budget=5)
+        other["vehicle"]["vehicle_id"] = "another-vehicle"
+        other["warm_start"] = True
+        assert not process_request(other)["metrics"]["warm_started"]
+
+    @pytest.mark.parametrize("warm_start", [
+        "yes", [1.0], {"torque_delta_nm": [float("nan")]}, {"deltas": []},
+    ])
+    def test_invalid_warm_start_is_schema_error(self, warm_start):
+        req = make_request()
+        req["warm_start"] = warm_start
+        resp = process_request(req)
+        assert resp["status"] == "error"
+        assert resp["error"]["code"] == "SCHEMA_ERROR"
+
+
 # ── Performance tests ─────────────────────────────────────────────────────────
 
 class TestPerformance:
@@ -713,6 +1199,74 @@ class TestSmoothnessRejection:
                 )
 
 
+# ── Non-raising validation tests ──────────────────────────────────────────────
+
+class TestCheckProposal:
+    BASELINE = [180.0, 195.0, 210.0, 220.0, 225.0]
+    RPM = [1000, 2000, 3000, 4000, 5000]
+    CONSTRAINTS = {
+        "max_bin_delta_nm": 8.0,
+        "max_bin_delta_ratio": 0.03,
+        "max_peak_gain_ratio": 0.02,
+        "smoothness": {"max_second_derivative": 0.15},
+        "calibration_ranges": {"afr_target": [11.5, 14.7]},
+    }
+
+    @pytest.mark.parametrize(
+        "delta,calibration,expected",
+        [
+            ([0.0] * 5, {"afr_target": 12.0}, None),
+            ([0.0] * 4, {}, ("LENGTH_MISMATCH", -1)),
+            ([0.0, float("nan"), 0.0, 0.0, 0.0], {}, ("NON_FINITE_DELTA", 1)),
+            ([0.0, 0.0, 9.0, 0.0, 0.0], {}, ("BIN_DELTA_NM", 2)),
+            ([5.5, 0.0, 0.0, 0.0, 0.0], {}, ("BIN_DELTA_RATIO", 0)),
+            ([0.0, 0.0, 0.0, 0.0, 0.5], {}, ("SMOOTHNESS", 3)),
+            ([0.0] * 5, {"ign_timing_deg": 2.0, "afr_target": 16.0}, ("CALIBRATION_RANGE", 1)),
+        ],
+    )
+    def test_codes(self, delta, calibration, expected):
+        assert check_proposal(delta, calibration, self.BASELINE, self.RPM, self.CONSTRAINTS) == expected
+
+    def test_validate_proposal_wraps_check(self):
+        delta = [0.0, 0.0, 0.0, 0.0, 0.5]
+        with pytest.raises(ValidationError) as excinfo:
+            validate_proposal(delta, {}, self.BASELINE, self.RPM, self.CONSTRAINTS)
+        assert excinfo.value.code == "SMOOTHNESS"
+        assert excinfo.value.index == 3
+        assert str(excinfo.value) == describe_violation(
+            ("SMOOTHNESS", 3), delta, {}, self.BASELINE, self.RPM, self.CONSTRAINTS
+        )
+        assert str(excinfo.value).startswith("smoothness violation at bin 3")
+
+    ROWS = [
+        [0.0] * 5,
+        [0.0, 0.0, 9.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0, 0.0, 0.5],
+        [0.0, float("inf"), 0.0, 0.0, 0.0],
+    ]
+
+    def _expected(self):
+        return [check_proposal(row, {}, self.BASELINE, self.RPM, self.CONSTRAINTS) for row in self.ROWS]
+
+    def test_validate_many_flat_array(self):
+        from array import array
+
+        flat = array("d", [x for row in self.ROWS for x in row])
+        feasible, violations = validate_many(flat, self.BASELINE, self.CONSTRAINTS)
+        assert feasible == [True, False, False, False]
+        assert violations == self._expected()
+
+    def test_validate_many_numpy(self):
+        np = pytest.importorskip("numpy")
+        feasible, violations = validate_many(np.array(self.ROWS), self.BASELINE, self.CONSTRAINTS)
+        assert feasible.tolist() == [True, False, False, False]
+        assert violations == self._expected()
+
+    def test_validate_many_rejects_ragged_block(self):
+        with pytest.raises(ValueError):
+            validate_many([0.0] * 7, self.BASELINE, self.CONSTRAINTS)
+
+
 # ── Edge case tests ───────────────────────────────────────────────────────────
 
 class TestEdgeCases:
@@ -0,0 +1,165 @@
+"""
+tests/test_feasibility.py
+
+Tests for the feasibility pre-check (ecu/feasibility.py).
+
+Coverage:
+  - Verdicts for inverted calibration ranges, negative limits, a zero
+    smoothness limit and zero / near-zero bin caps
+  - "lp" is never short-circuited; a met score bound is left to the search
+  - The short-circuit returns what the full search returns (exactly, or
+    within MIN_BIN_HEADROOM_NM for a near-zero bin cap)
+  - process_request: rejected with a note, or ok with zero delta and no cycles
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ecu import optimizer
+from ecu.constraints import compile_constraints
+from ecu.feasibility import (
+    FEASIBLE,
+    INFEASIBLE,
+    MIN_BIN_HEADROOM_NM,
+    ZERO_DELTA,
+    analyze_feasibility,
+)
+from ecu.optimizer import run_optimization
+from ecu_runner import process_request
+from test_ecu_runner import make_request
+
+
+def _request(first_bin_nm=None, **overrides):
+    req = make_request(cycle_budget=2000)
+    if first_bin_nm is not None:
+        req["baseline_curve"]["torque_nm"][0] = first_bin_nm
+    constraints = req["constraints"]
+    for key, value in overrides.items():
+        if key == "max_second_derivative":
+            constraints["smoothness"][key] = value
+        elif key in constraints["calibration_ranges"]:
+            constraints["calibration_ranges"][key] = value
+        else:
+            constraints[key] = value
+    return req
+
+
+def _verdict(strategy="gaussian", first_bin_nm=None, **overrides):
+    req = _request(first_bin_nm, **overrides)
+    cs = compile_constraints(req["constraints"], req["baseline_curve"]["torque_nm"])
+    return analyze_feasibility(cs, strategy)
+
+
+class TestVerdicts:
+    def test_default_constraints_feasible(self):
+        assert _verdict() == (FEASIBLE, None)
+
+    def test_inverted_calibration_range(self):
+        verdict, reason = _verdict(afr_target=[14.7, 11.5])
+        assert verdict == INFEASIBLE
+        assert "afr_target" in reason
+
+    def test_nan_calibration_bound(self):
+        assert _verdict(boost_target_psi=[0.0, float("nan")])[0] == INFEASIBLE
+
+    @pytest.mark.parametrize(
+        "limit",
+        ["max_bin_delta_nm", "max_bin_delta_ratio", "max_peak_gain_ratio", "max_second_derivative"],
+    )
+    def test_negative_limit(self, limit):
+        verdict, reason = _verdict(**{limit: -0.5})
+        assert verdict == INFEASIBLE
+        assert limit in reason
+
+    def test_zero_smoothness(self):
+        verdict, reason = _verdict(max_second_derivative=0.0)
+        assert verdict == ZERO_DELTA
+        assert "max_second_derivative" in reason
+
+    def test_near_zero_cap_on_low_torque_bin(self):
+        # 3% of 1e-5 Nm: every other bin still has headroom.
+        verdict, reason = _verdict(first_bin_nm=1e-5)
+        assert verdict == ZERO_DELTA
+        assert "bin 0" in reason
+
+    @pytest.mark.parametrize("strategy", ["gaussian", "gaussian_numpy", "halton"])
+    def test_sampling_strategies(self, strategy):
+        assert _verdict(strategy, max_second_derivative=0.0)[0] == ZERO_DELTA
+
+    def test_lp_always_searches(self):
+        assert _verdict("lp", max_second_derivative=0.0) == (FEASIBLE, None)
+        assert _verdict("lp", afr_target=[14.7, 11.5])[0] == INFEASIBLE
+
+
+class TestShortCircuit:
+    def _args(self, req):
+        baseline = req["baseline_curve"]
+        return (baseline["torque_nm"], baseline["rpm_bins"], req["constraints"], 600, 5)
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"max_second_derivative": 0.0},
+            {"afr_target": [14.7, 11.5]},
+            {"max_peak_gain_ratio": -0.1},
+        ],
+    )
+    @pytest.mark.parametrize("rng_mode", ["sequential", "counter"])
+    def test_matches_full_search(self, monkeypatch, overrides, rng_mode):
+        args = self._args(_request(**overrides))
+        short = run_optimization(*args, rng_mode=rng_mode)
+        assert short["early_exit"] == "pre_check"
+        assert short["cycles_used"] == 0
+        assert short["pre_check"]
+
+        monkeypatch.setattr(optimizer, "analyze_feasibility", lambda cs, strategy: (FEASIBLE, None))
+        full = run_optimization(*args, rng_mode=rng_mode)
+        assert full["cycles_used"] == 600
+        assert short["torque_delta_nm"] == full["torque_delta_nm"]
+        assert short["calibration"] == full["calibration"]
+
+    def test_near_zero_cap_within_headroom(self, monkeypatch):
+        args = self._args(_request(first_bin_nm=1e-5))
+        short = run_optimization(*args)
+        assert short["early_exit"] == "pre_check"
+
+        monkeypatch.setattr(optimizer, "analyze_feasibility", lambda cs, strategy: (FEASIBLE, None))
+        full = run_optimization(*args)
+        # The search may accept a candidate only MIN_BIN_HEADROOM_NM better
+        # (with its own calibration); the pre-check keeps the incumbent.
+        assert short["torque_delta_nm"] == pytest.approx(
+            full["torque_delta_nm"], abs=MIN_BIN_HEADROOM_NM
+        )
+
+    def test_warm_start_kept(self):
+        req = _request(max_second_derivative=0.0)
+        warm = [1.0] * len(req["baseline_curve"]["torque_nm"])
+        result = run_optimization(*self._args(req), warm_start=warm)
+        assert result["early_exit"] == "pre_check"
+        assert result["warm_started"]
+        assert result["torque_delta_nm"] == warm
+
+    def test_bound_exit_takes_precedence(self):
+        result = run_optimization(*self._args(_request(max_bin_delta_nm=0.0)))
+        assert result["early_exit"] == "bound"
+        assert result["pre_check"] is None
+
+
+class TestProcessRequest:
+    def test_infeasible_is_rejected(self):
+        resp = process_request(_request(afr_target=[14.7, 11.5]))
+        assert resp["status"] == "rejected"
+        assert resp["proposal"] is None
+        assert any("Feasibility pre-check" in note for note in resp["debug"]["notes"])
+        assert any("afr_target" in w for w in resp["debug"]["warnings"])
+
+    def test_zero_delta_ok_without_cycles(self):
+        resp = process_request(_request(max_second_derivative=0.0))
+        assert resp["status"] == "ok"
+        assert resp["metrics"]["cycles_used"] == 0
+        assert all(d == 0.0 for d in resp["proposal"]["torque_delta_nm"])
+        assert any("Feasibility pre-check" in note for note in resp["debug"]["notes"])
@@ -0,0 +1,85 @@
+"""
+tests/test_import_time.py
+
+Cold-start import budget for ecu_runner.py, measured with -X importtime.
+
+Every subprocess request pays for the runner's imports before stdin is read,
+so this test checks what the runner imports on top of a bare interpreter.
+
+Coverage:
+  - EMPTY_INPUT and JSON_PARSE_ERROR load no ecu module
+  - A valid request loads the optimizer (the lazy loader works)
+  - Self time of the runner's own imports stays under IMPORT_BUDGET_MS
+  - Schema validation works in a fresh interpreter (no hidden load order)
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from test_ecu_runner import make_request
+
+PYTHON_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# Generous, so a slow CI machine does not fail it; a regression that pulls the
+# optimizer back into the error path costs far more than the headroom.
+IMPORT_BUDGET_MS = {"error": 60.0, "request": 250.0}
+
+RUNS = 3
+
+
+def _importtime(args, stdin_text=""):
+    """{module: self time in us} imported by one run of python -X importtime args."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        input=stdin_text, capture_output=True, text=True, cwd=PYTHON_DIR, timeout=60,
+        check=False,  # input errors exit non-zero by design
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def _runner_imports(stdin_text):
+    """Best of RUNS: modules the runner adds to a bare interpreter, with self times."""
+    baseline = set(_importtime(["-c", "pass"]))
+    runs = [_importtime(["ecu_runner.py"], stdin_text) for _ in range(RUNS)]
+    best = min(runs, key=lambda m: sum(m.values()))
+    return {name: us for name, us in best.items() if name not in baseline}
+
+
+@pytest.mark.parametrize("stdin_text", ["", "{not json"])
+def test_error_path_skips_pipeline(stdin_text):
+    added = _runner_imports(stdin_text)
+    assert not [name for name in added if name == "ecu" or name.startswith("ecu.")]
+    assert sum(added.values()) / 1000 < IMPORT_BUDGET_MS["error"]
+
+
+def test_request_loads_pipeline():
+    added = _runner_imports(json.dumps(make_request()))
+    assert "ecu.optimizer" in added
+    assert "ecu.validator" in added
+    assert sum(added.values()) / 1000 < IMPORT_BUDGET_MS["request"]
+
+
+def test_schema_validation_in_fresh_interpreter():
+    # Module-internal lookups must not depend on an earlier request having run.
+    code = (
+        "import json, sys; import ecu_runner; "
+        "ecu_runner._validate_request_schema(json.loads(sys.stdin.read()))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        input=json.dumps(make_request()), capture_output=True, text=True,
+        cwd=PYTHON_DIR, timeout=60, check=False,
+    )
+    assert proc.returncode == 0, proc.stderr
@@ -0,0 +1,91 @@
+"""
+tests/test_latency_harness.py
+
+Tests for the subprocess latency harness (benchmarks/latency_harness.py).
+
+Coverage:
+  - Outcome classification: applied, rejected, invalid (crash, bad JSON,
+    failed validation) and --no-validate
+  - Corpus loading from files and directories
+  - A real spawn of the Python runner, and a timeout counted as a fallback
+  - benchmark marker: both runners over the synthetic corpus
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import pytest
+
+import latency_harness
+from ecu_runner import process_request
+from test_ecu_runner import make_request
+
+
+def _request_text():
+    return json.dumps(make_request())
+
+
+class TestClassify:
+    def test_applied(self):
+        text = _request_text()
+        response = process_request(json.loads(text))
+        assert latency_harness.classify(text, 0, json.dumps(response)) == ("applied", "")
+
+    def test_rejected(self):
+        stdout = json.dumps({"status": "error", "error": {"code": "SCHEMA_ERROR"}})
+        assert latency_harness.classify(_request_text(), 0, stdout) == ("rejected", "SCHEMA_ERROR")
+
+    def test_crash_and_garbage(self):
+        assert latency_harness.classify(_request_text(), 1, "")[0] == "invalid"
+        assert latency_harness.classify(_request_text(), 0, "log line\n{}")[0] == "invalid"
+
+    def test_failed_validation(self):
+        text = _request_text()
+        response = process_request(json.loads(text))
+        response["proposal"]["torque_delta_nm"][3] = 500.0
+        outcome, detail = latency_harness.classify(text, 0, json.dumps(response))
+        assert outcome == "invalid"
+        assert "BIN_DELTA" in detail
+        assert latency_harness.classify(text, 0, json.dumps(response), validate=False)[0] == "applied"
+
+
+class TestCorpus:
+    def test_files_and_dirs(self, tmp_path):
+        (tmp_path / "b.json").write_text("{}")
+        (tmp_path / "a.json").write_text("[]")
+        (tmp_path / "notes.txt").write_text("x")
+        single = tmp_path / "single.req"
+        single.write_text("1")
+        corpus = latency_harness.load_corpus([str(tmp_path), str(single)])
+        assert corpus == [("a.json", "[]"), ("b.json", "{}"), ("single.req", "1")]
+
+
+class TestRuns:
+    def test_python_runner(self):
+        result = latency_harness.run_corpus("python", [("r", _request_text())], timeout_s=30)
+        assert result["outcomes"]["applied"] == 1
+        assert result["timeout_rate"] == 0.0
+        assert result["fallback_rate"] == 0.0
+        assert result["latency"]["p50_ms"] > 0
+
+    def test_timeout_is_fallback(self):
+        run = latency_harness.run_once("python", _request_text(), timeout_s=0.001)
+        assert run["outcome"] == "timeout"
+
+
+@pytest.mark.benchmark
+class TestBothRunners:
+    def test_synthetic_corpus(self, tmp_path, capsys):
+        path = str(tmp_path / "latency.json")
+        assert latency_harness.main(["--concurrency", "4", "--timeout", "30", "--output", path]) == 0
+        with open(path) as fh:
+            results = json.load(fh)["results"]
+        assert set(results) == {"python", "ecu"}
+        assert results["python"]["fallback_rate"] == 0.0
+        for result in results.values():
+            assert result["timeout_rate"] == 0.0
+            assert sum(result["outcomes"].values()) == result["runs"] == 9
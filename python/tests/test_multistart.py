@@ -0,0 +1,147 @@
+"""
+tests/test_multistart.py
+
+Tests for the sharded multi-start search (ecu/multistart.py).
+
+Coverage:
+  - Child seeds and budget split are deterministic
+  - Results are bit-identical for any worker count, including a process pool
+  - Merge rule: best shard wins, ties go to the lowest index
+  - shards=1 is the plain search; invalid combinations are rejected
+  - deadline_ms bounds the whole sharded search, not each shard
+  - The "shards" request field through process_request
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ecu import multistart
+from ecu.multistart import child_seed, run_sharded, shard_budgets
+from ecu.optimizer import run_optimization
+from ecu_runner import process_request
+from test_ecu_runner import make_request
+
+
+def _args(budget=400, seed=7):
+    req = make_request()
+    baseline = req["baseline_curve"]
+    return (baseline["torque_nm"], baseline["rpm_bins"], req["constraints"], budget, seed)
+
+
+class TestDecomposition:
+    def test_child_seed_stable(self):
+        assert child_seed(7, 0) == child_seed(7, 0)
+        assert len({child_seed(7, i) for i in range(16)}) == 16
+        assert child_seed(7, 1) != child_seed(8, 1)
+        assert 0 <= child_seed(2**40, 3) < 2**63
+
+    def test_shard_budgets(self):
+        assert shard_budgets(10, 3) == [4, 3, 3]
+        assert sum(shard_budgets(4999, 16)) == 4999
+        assert shard_budgets(3, 8) == [1, 1, 1]
+
+
+class TestShardedSearch:
+    def test_identical_for_any_worker_count(self):
+        serial = run_optimization(*_args(), shards=4, workers=1)
+        pooled = run_optimization(*_args(), shards=4, workers=3)
+        assert pooled == serial
+        assert serial["shards"] == 4
+        assert serial["cycles_used"] == 400
+
+    def test_pool_is_reused_across_calls(self):
+        first = run_optimization(*_args(), shards=2, workers=2)
+        pool = multistart._pool
+        assert pool is not None
+        assert run_optimization(*_args(), shards=2, workers=2) == first
+        assert multistart._pool is pool
+        multistart.shutdown_pool()
+        assert multistart._pool is None
+
+    def test_deterministic_and_valid(self):
+        from ecu.validator import validate_proposal
+
+        result = run_optimization(*_args(), shards=3, strategy="halton")
+        assert run_optimization(*_args(), shards=3, strategy="halton") == result
+        req = make_request()
+        validate_proposal(
+            result["torque_delta_nm"], result["calibration"],
+            req["baseline_curve"]["torque_nm"], req["baseline_curve"]["rpm_bins"],
+            req["constraints"],
+        )
+
+    def test_tie_goes_to_lowest_shard(self, monkeypatch):
+        def fake_shard(job):
+            return {
+                "torque_delta_nm": [0.0] * 11,
+                "cycles_used": job["cycle_budget"],
+                "stopped_early": False,
+                "seed": job["seed"],
+            }
+
+        monkeypatch.setattr(multistart, "_run_shard", fake_shard)
+        merged = run_sharded(*_args(), shards=4)
+        assert merged["seed"] == child_seed(7, 0)
+        assert merged["cycles_used"] == 400
+
+    def test_one_shard_is_plain_search(self):
+        assert run_optimization(*_args(), shards=1) == run_optimization(*_args())
+
+    def test_lp_ignores_shards(self):
+        assert run_optimization(*_args(), shards=4, strategy="lp") == run_optimization(
+            *_args(), strategy="lp"
+        )
+
+    def test_rejects_cycle_limit(self):
+        with pytest.raises(ValueError, match="shards"):
+            run_optimization(*_args(), shards=2, cycle_limit=10)
+
+
+class TestShardDeadline:
+    def test_serial_shards_share_deadline(self):
+        t0 = time.monotonic()
+        result = run_optimization(*_args(budget=10_000_000), shards=4, workers=1, deadline_ms=200)
+        elapsed_ms = (time.monotonic() - t0) * 1000
+        assert result["stopped_early"]
+        # Slack covers the last cycle in flight and the merge, not a second shard.
+        assert elapsed_ms < 200 + 50
+
+    def test_expired_deadline_leaves_later_shards_no_time(self, monkeypatch):
+        seen = []
+        real = multistart._run_shard
+
+        def spy(kwargs):
+            result = real(kwargs)
+            seen.append(result["cycles_used"])
+            return result
+
+        monkeypatch.setattr(multistart, "_run_shard", spy)
+        run_optimization(*_args(budget=10_000_000), shards=3, workers=1, deadline_ms=50)
+        assert seen[0] > 0
+        assert seen[1:] == [0, 0]
+
+
+class TestShardsRequest:
+    def test_via_request(self):
+        req = make_request(cycle_budget=200)
+        req["shards"] = 4
+        resp = process_request(req)
+        assert resp["status"] == "ok"
+        assert resp["metrics"]["cycles_used"] == 200
+        assert any("4 shards" in n for n in resp["debug"]["notes"])
+
+    @pytest.mark.parametrize("extra", [
+        {"shards": 0}, {"shards": "4"}, {"shards": 2, "cycle_limit": 5},
+        {"shards": 2, "deadline_mode": "checkpoint", "deadline_ms": 100},
+    ])
+    def test_invalid_is_schema_error(self, extra):
+        req = make_request()
+        req.update(extra)
+        resp = process_request(req)
+        assert resp["status"] == "error"
+        assert resp["error"]["code"] == "SCHEMA_ERROR"
@@ -0,0 +1,140 @@
+"""
+tests/test_profiling.py
+
+Tests for the on-demand request profiler (ecu/profiling.py).
+
+Coverage:
+  - 1-in-N sampling; an explicit request mode always wins
+  - cpu / memory reports to a stream, and pstats / allocation files to a dir
+  - debug.profile validation; a profiled request's stdout is only the response
+  - Sampled payloads are profiled from JSON parsing on; runs do not nest
+"""
+
+import io
+import json
+import os
+import pstats
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+import ecu_runner
+from ecu.profiling import Profiler, resolve_mode
+from ecu_runner import process_request
+from test_ecu_runner import make_request
+
+RUNNER = os.path.join(os.path.dirname(__file__), "..", "ecu_runner.py")
+
+
+def _work():
+    return sorted(str(i) for i in range(2000))
+
+
+class TestSampling:
+    def test_one_in_n(self):
+        profiler = Profiler(mode="cpu", every=3)
+        picks = [profiler.select() for _ in range(7)]
+        assert picks == ["cpu", None, None, "cpu", None, None, "cpu"]
+
+    def test_request_mode_wins(self):
+        profiler = Profiler(mode=None, every=3)
+        assert profiler.select() is None
+        assert profiler.select("memory") == "memory"
+
+    def test_resolve_mode(self):
+        assert resolve_mode(True) == "cpu"
+        assert resolve_mode("all") == "all"
+        assert resolve_mode(False) is None
+        assert resolve_mode(None) is None
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            Profiler(mode="wall")
+        with pytest.raises(ValueError):
+            Profiler(every=0)
+
+
+class TestReports:
+    def test_stream_report(self):
+        stream = io.StringIO()
+        profiler = Profiler(stream=stream)
+        with profiler.run("all", "req-1"):
+            _work()
+        text = stream.getvalue()
+        assert "=== ECU profile: req-1 ===" in text
+        assert "cumulative" in text
+        assert "Peak traced memory" in text
+
+    def test_none_is_noop(self):
+        stream = io.StringIO()
+        with Profiler(stream=stream).run(None, "req-1"):
+            _work()
+        assert stream.getvalue() == ""
+
+    def test_nested_run_is_noop(self):
+        stream = io.StringIO()
+        profiler = Profiler(stream=stream)
+        with profiler.run("cpu", "outer") as run:
+            with profiler.run("memory", "inner"):
+                _work()
+            run["label"] = "renamed"
+        text = stream.getvalue()
+        assert text.count("=== ECU profile:") == 1
+        assert "=== ECU profile: renamed ===" in text
+        assert "Peak traced memory" not in text
+
+    def test_dir_report(self, tmp_path):
+        profiler = Profiler(out_dir=str(tmp_path))
+        with profiler.run("all", "a/b c"):
+            _work()
+        names = sorted(os.listdir(tmp_path))
+        assert len(names) == 2
+        prof = next(n for n in names if n.endswith(".prof"))
+        assert "a_b_c" in prof
+        assert pstats.Stats(str(tmp_path / prof)).total_calls > 0
+        assert any(n.endswith(".alloc.txt") for n in names)
+
+
+class TestRunner:
+    def test_invalid_profile_flag(self):
+        req = make_request()
+        req["debug"] = {"profile": "wall"}
+        resp = process_request(req)
+        assert resp["error"]["code"] == "SCHEMA_ERROR"
+
+    def test_profiled_request_unchanged(self, monkeypatch):
+        stream = io.StringIO()
+        monkeypatch.setattr(ecu_runner, "_profiler", Profiler(stream=stream))
+        ecu_runner._get_result_cache().clear()
+        plain = process_request(make_request(seed=123))
+        ecu_runner._get_result_cache().clear()
+        req = make_request(seed=123)
+        req["debug"] = {"profile": True}
+        profiled = process_request(req)
+        assert profiled["proposal"] == plain["proposal"]
+        assert "=== ECU profile: test-001 ===" in stream.getvalue()
+
+    def test_sampled_payload_covers_parse_and_schema(self, monkeypatch, tmp_path):
+        profiler = Profiler(mode="cpu", out_dir=str(tmp_path))
+        monkeypatch.setattr(ecu_runner, "_profiler", profiler)
+        req = make_request(seed=321)
+        req["debug"] = {"profile": True}  # nested scope: still one report
+        resp, _ = ecu_runner.handle_payload(json.dumps(req))
+        assert resp["status"] == "ok"
+        (name,) = os.listdir(tmp_path)
+        assert name.endswith("-test-001.prof")
+        functions = {func for _, _, func in pstats.Stats(str(tmp_path / name)).stats}
+        assert {"loads", "_validate_request_schema", "_process_validated"} <= functions
+
+    def test_env_profile_keeps_stdout_clean(self, tmp_path):
+        env = {**os.environ, "ECU_PROFILE": "all", "ECU_PROFILE_DIR": str(tmp_path)}
+        proc = subprocess.run(
+            [sys.executable, RUNNER],
+            input=json.dumps(make_request()),
+            capture_output=True, text=True, env=env, timeout=30,
+        )
+        assert json.loads(proc.stdout)["status"] == "ok"
+        assert len(os.listdir(tmp_path)) == 2
@@ -0,0 +1,134 @@
+"""
+tests/test_rng.py
+
+Tests for the counter-based RNG (ecu/rng.py) and rng_mode="counter".
+
+Coverage:
+  - Draws are pure functions of (seed, counter, index) in [0, 1)
+  - Streams read the same values as random access
+  - random_array matches random bit for bit (NumPy only)
+  - Counter-mode searches are deterministic and valid, and gaussian_numpy
+    draws the same candidates as gaussian (NumPy only)
+  - The "rng" request field through process_request
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ecu.optimizer import run_optimization
+from ecu.rng import CounterRNG, splitmix64
+from ecu.vectorized import NUMPY_AVAILABLE
+from ecu.validator import validate_proposal
+from ecu_runner import process_request
+from test_ecu_runner import make_request
+
+needs_numpy = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+
+
+def _args(budget=300, seed=11):
+    req = make_request()
+    baseline = req["baseline_curve"]
+    return (baseline["torque_nm"], baseline["rpm_bins"], req["constraints"], budget, seed)
+
+
+class TestCounterRNG:
+    def test_splitmix64_known_value(self):
+        # First output of the reference SplitMix64 generator seeded with 0.
+        assert splitmix64(0) == 0xE220A8397B1DCDAF
+
+    def test_random_access_is_pure(self):
+        rng = CounterRNG(42)
+        first = [rng.random(c, j) for c in range(5) for j in range(4)]
+        second = [rng.random(c, j) for c in reversed(range(5)) for j in reversed(range(4))]
+        assert first == list(reversed(second))
+        assert first == [CounterRNG(42).random(c, j) for c in range(5) for j in range(4)]
+
+    def test_values_in_unit_interval(self):
+        rng = CounterRNG(3)
+        values = [rng.random(c, j) for c in range(200) for j in range(3)]
+        assert all(0.0 <= v < 1.0 for v in values)
+        assert len(set(values)) == len(values)
+
+    def test_seeds_and_counters_differ(self):
+        assert CounterRNG(1).random(0, 0) != CounterRNG(2).random(0, 0)
+        assert CounterRNG(1).random(0, 0) != CounterRNG(1).random(1, 0)
+        assert CounterRNG(1).random(0, 0) != CounterRNG(1).random(0, 1)
+
+    def test_stream_matches_random_access(self):
+        rng = CounterRNG(9)
+        stream = rng.stream(5, start=2)
+        assert [stream.random() for _ in range(4)] == [rng.random(5, j) for j in range(2, 6)]
+        stream = rng.stream(6)
+        assert stream.uniform(10.0, 20.0) == 10.0 + 10.0 * rng.random(6, 0)
+
+    @needs_numpy
+    def test_random_array_matches_scalar(self):
+        import numpy as np
+
+        rng = CounterRNG(2**70 + 5)
+        counters = np.array([0, 1, 2, 1000, 2**40, 2**63 - 1], dtype=np.uint64)
+        for index in (0, 1, 9):
+            expected = [rng.random(int(c), index) for c in counters]
+            assert rng.random_array(counters, index).tolist() == expected
+
+
+class TestCounterSearch:
+    def test_deterministic_and_valid(self):
+        a = run_optimization(*_args(), rng_mode="counter")
+        b = run_optimization(*_args(), rng_mode="counter")
+        assert a == b
+        req = make_request()
+        validate_proposal(
+            torque_delta_nm=a["torque_delta_nm"],
+            calibration=a["calibration"],
+            baseline_torque_nm=req["baseline_curve"]["torque_nm"],
+            rpm_bins=req["baseline_curve"]["rpm_bins"],
+            constraints=req["constraints"],
+        )
+
+    def test_differs_from_sequential(self):
+        a = run_optimization(*_args(), rng_mode="counter")
+        b = run_optimization(*_args())
+        assert a["calibration"] != b["calibration"]
+
+    def test_halton_uses_counter_for_calibration(self):
+        a = run_optimization(*_args(), strategy="halton", rng_mode="counter")
+        assert a == run_optimization(*_args(), strategy="halton", rng_mode="counter")
+
+    @needs_numpy
+    @pytest.mark.parametrize("seed", [0, 1, 7, 123])
+    def test_numpy_matches_gaussian(self, seed):
+        a = run_optimization(*_args(budget=1500, seed=seed), rng_mode="counter")
+        b = run_optimization(
+            *_args(budget=1500, seed=seed), strategy="gaussian_numpy", rng_mode="counter"
+        )
+        assert b["calibration"] == a["calibration"]
+        assert b["cycles_used"] == a["cycles_used"]
+        assert b["torque_delta_nm"] == pytest.approx(a["torque_delta_nm"], abs=1e-9)
+
+    def test_invalid_mode_rejected(self):
+        with pytest.raises(ValueError):
+            run_optimization(*_args(), rng_mode="philox")
+
+
+class TestRequestField:
+    def test_counter_request(self):
+        req = make_request()
+        req["rng"] = "counter"
+        resp = process_request(req)
+        assert resp["status"] == "ok"
+        expected = run_optimization(
+            *_args(budget=req["cycle_budget"], seed=req["seed"]), rng_mode="counter"
+        )
+        assert resp["proposal"]["calibration"] == expected["calibration"]
+
+    def test_invalid_rng_is_error(self):
+        req = make_request()
+        req["rng"] = "mersenne"
+        resp = process_request(req)
+        assert resp["status"] == "error"
+        assert "rng" in resp["error"]["message"]
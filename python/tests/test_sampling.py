@@ -0,0 +1,85 @@
+"""
+tests/test_sampling.py
+
+Tests for the scrambled Halton sampler (ecu/sampling.py) and strategy "halton".
+
+Coverage:
+  - Points are deterministic per seed, in [0, 1), and differ across seeds
+  - Stratification: the first b^k points put one point in each 1/b^k cell
+  - PointSource maps coordinates through uniform(lo, hi) in order
+  - run_optimization(strategy="halton") is deterministic, valid and
+    reports its strategy
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ecu.optimizer import run_optimization
+from ecu.sampling import PointSource, ScrambledHalton
+from ecu.validator import validate_proposal
+from ecu_runner import process_request
+from test_ecu_runner import make_request
+
+
+class TestScrambledHalton:
+    def test_deterministic_per_seed(self):
+        a = ScrambledHalton(3, 7)
+        b = ScrambledHalton(3, 7)
+        assert [a.point(k) for k in range(50)] == [b.point(k) for k in range(50)]
+        assert ScrambledHalton(3, 8).point(1) != a.point(1)
+
+    def test_unit_cube(self):
+        h = ScrambledHalton(3, 1)
+        for k in range(500):
+            assert all(0.0 <= u < 1.0 for u in h.point(k))
+
+    @pytest.mark.parametrize("dim, base", [(0, 2), (1, 3), (2, 5)])
+    def test_stratified(self, dim, base):
+        h = ScrambledHalton(3, 11)
+        count = base ** 3
+        cells = {int(h.point(k)[dim] * count) for k in range(count)}
+        assert len(cells) == count
+
+    def test_invalid_dims(self):
+        with pytest.raises(ValueError):
+            ScrambledHalton(0, 1)
+
+    def test_point_source(self):
+        source = PointSource([0.25, 0.5])
+        assert source.uniform(0.0, 4.0) == 1.0
+        assert source.uniform(10.0, 20.0) == 15.0
+
+
+class TestHaltonStrategy:
+    def test_deterministic_and_valid(self):
+        req = make_request()
+        baseline = req["baseline_curve"]
+        args = (baseline["torque_nm"], baseline["rpm_bins"], req["constraints"], 60, 4)
+
+        result = run_optimization(*args, strategy="halton")
+        assert result["strategy"] == "halton"
+        assert result["cycles_used"] == 60
+        assert run_optimization(*args, strategy="halton") == result
+        validate_proposal(
+            result["torque_delta_nm"], result["calibration"],
+            baseline["torque_nm"], baseline["rpm_bins"], req["constraints"],
+        )
+
+    def test_profiles_differ_from_gaussian(self):
+        req = make_request()
+        baseline = req["baseline_curve"]
+        args = (baseline["torque_nm"], baseline["rpm_bins"], req["constraints"], 1, 9)
+        halton = run_optimization(*args, strategy="halton")
+        gaussian = run_optimization(*args)
+        assert halton["torque_delta_nm"] != gaussian["torque_delta_nm"]
+
+    def test_via_request(self):
+        req = make_request(seed=5, cycle_budget=30)
+        req["strategy"] = "halton"
+        resp = process_request(req)
+        assert resp["status"] == "ok"
+        assert resp["metrics"]["strategy"] == "halton"
@@ -0,0 +1,161 @@
+"""
+tests/test_timings.py
+
+Tests for the opt-in stage timings (request debug.timings -> metrics.timings).
+
+Coverage:
+  - metrics.timings is absent unless requested; debug must be an object
+  - Proposal fields are identical with and without timings
+  - Search counters: candidates, rejections by reason, improvements
+  - Counters are None on a cache hit; shards are summed
+  - encode_response fills serialize_ms; handle_payload fills parse_ms
+  - One encoding per response, and no clock reads without debug.timings
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+import ecu_runner
+from ecu.optimizer import run_optimization
+from ecu_runner import _get_result_cache, encode_response, handle_payload, process_request
+from test_ecu_runner import make_request
+
+STAGES = ("parse_ms", "schema_ms", "optimize_ms", "final_validate_ms", "serialize_ms")
+
+
+def _timed_request(seed=42, cycle_budget=200):
+    req = make_request(seed=seed, cycle_budget=cycle_budget)
+    req["debug"] = {"timings": True}
+    return req
+
+
+class TestSchema:
+    def test_absent_by_default(self):
+        _get_result_cache().clear()
+        resp = process_request(make_request())
+        assert "timings" not in resp["metrics"]
+
+    def test_false_is_off(self):
+        req = make_request()
+        req["debug"] = {"timings": False}
+        assert "timings" not in process_request(req)["metrics"]
+
+    @pytest.mark.parametrize("debug", [True, [], {"timings": "yes"}])
+    def test_invalid_debug_is_schema_error(self, debug):
+        req = make_request()
+        req["debug"] = debug
+        resp = process_request(req)
+        assert resp["status"] == "error"
+        assert resp["error"]["code"] == "SCHEMA_ERROR"
+
+
+class TestTimings:
+    def test_stages_and_counters(self):
+        _get_result_cache().clear()
+        resp = process_request(_timed_request(cycle_budget=200))
+        assert resp["status"] == "ok"
+        timings = resp["metrics"]["timings"]
+        assert set(timings) == set(STAGES) | {"search"}
+        for stage in ("schema_ms", "optimize_ms", "final_validate_ms"):
+            assert timings[stage] >= 0
+        assert timings["parse_ms"] is None
+        assert timings["serialize_ms"] is None
+
+        search = timings["search"]
+        assert search["candidates"] == resp["metrics"]["cycles_used"]
+        assert sum(search["rejected"].values()) <= search["candidates"]
+        assert 0 <= search["improvements"] <= search["candidates"]
+
+    def test_proposal_unchanged(self):
+        _get_result_cache().clear()
+        plain = process_request(make_request(seed=77, cycle_budget=200))
+        _get_result_cache().clear()
+        timed = process_request(_timed_request(seed=77, cycle_budget=200))
+        assert timed["proposal"] == plain["proposal"]
+        assert timed["metrics"]["best_score"] == plain["metrics"]["best_score"]
+
+    def test_cache_hit_has_no_counters(self):
+        _get_result_cache().clear()
+        process_request(make_request(seed=99))
+        resp = process_request(_timed_request(seed=99, cycle_budget=40))
+        assert resp["metrics"]["cache"]["hit"]
+        assert resp["metrics"]["timings"]["search"] is None
+
+    def test_shard_counters_are_summed(self):
+        req = make_request(cycle_budget=200)
+        result = run_optimization(
+            req["baseline_curve"]["torque_nm"], req["baseline_curve"]["rpm_bins"],
+            req["constraints"], 200, 42, shards=4, collect_stats=True,
+        )
+        assert result["search_stats"]["candidates"] == result["cycles_used"]
+
+    def test_stats_only_when_collected(self):
+        req = make_request()
+        result = run_optimization(
+            req["baseline_curve"]["torque_nm"], req["baseline_curve"]["rpm_bins"],
+            req["constraints"], 40, 42,
+        )
+        assert "search_stats" not in result
+
+
+class TestEncoding:
+    def test_encode_response_fills_serialize_ms(self):
+        _get_result_cache().clear()
+        resp = process_request(_timed_request())
+        decoded = json.loads(encode_response(resp))
+        assert decoded["metrics"]["timings"]["serialize_ms"] >= 0
+
+    def test_encode_serializes_once(self, monkeypatch):
+        _get_result_cache().clear()
+        resp = process_request(_timed_request())
+        calls = []
+        real_dumps = json.dumps
+
+        def counting_dumps(obj, *args, **kwargs):
+            calls.append(obj)
+            return real_dumps(obj, *args, **kwargs)
+
+        monkeypatch.setattr(ecu_runner.json, "dumps", counting_dumps)
+        text = encode_response(resp)
+        assert [c for c in calls if c is resp] == [resp]
+        assert real_dumps(resp) == text  # dict and text agree on serialize_ms
+
+    def test_no_clock_reads_without_timings(self, monkeypatch):
+        req = make_request(seed=7, cycle_budget=40)
+        reads = []
+        real_perf_counter = ecu_runner.time.perf_counter
+
+        def counting_perf_counter():
+            reads.append(1)
+            return real_perf_counter()
+
+        monkeypatch.setattr(ecu_runner.time, "perf_counter", counting_perf_counter)
+        assert process_request(req)["status"] == "ok"
+        encode_response(process_request(req))
+        assert reads == []
+
+    def test_encode_plain_response_is_json_dumps(self):
+        resp = process_request(make_request())
+        assert encode_response(resp) == json.dumps(resp)
+
+    def test_handle_payload_fills_parse_ms(self):
+        _get_result_cache().clear()
+        resp, code = handle_payload(json.dumps(_timed_request()))
+        assert code == 0
+        assert resp["metrics"]["timings"]["parse_ms"] >= 0
+
+    def test_batch_entries(self):
+        _get_result_cache().clear()
+        plain = make_request(seed=5, cycle_budget=100)
+        timed = _timed_request(seed=5, cycle_budget=100)
+        resp, _ = handle_payload(json.dumps({"batch": [plain, timed, timed]}))
+        first, second, third = resp["batch"]
+        assert "timings" not in first["metrics"]
+        assert second["metrics"]["timings"]["search"] is None
+        assert third["metrics"]["timings"]["optimize_ms"] is None
+        assert first["proposal"] == second["proposal"] == third["proposal"]